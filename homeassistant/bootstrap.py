@@ -19,7 +19,12 @@ from homeassistant import config as conf_util, config_entries, core, loader
 from homeassistant.components import http
 from homeassistant.const import REQUIRED_NEXT_PYTHON_DATE, REQUIRED_NEXT_PYTHON_VER
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import area_registry, device_registry, entity_registry
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity_registry,
+    template,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
@@ -236,6 +241,9 @@ async def async_from_config_dict(
         )
         return None
 
+    if hass.config.template_bytecode_cache:
+        await template.async_load_bytecode_cache(hass)
+
     await _async_set_up_integrations(hass, config)
 
     stop = monotonic()
@@ -227,7 +227,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            payload = ",".join(state.as_json for state in states)
+        except (ValueError, TypeError):
+            # Let json log the bad data and fail the request
+            return self.json(states)
+        return self.json_serialized(f"[{payload}]".encode())
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -244,9 +249,12 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         state = request.app["hass"].states.get(entity_id)
-        if state:
+        if not state:
+            return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        try:
+            return self.json_serialized(state.as_json.encode())
+        except (ValueError, TypeError):
             return self.json(state)
-        return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
         """Update state of entity."""
@@ -45,6 +45,12 @@ from homeassistant.helpers import condition, extract_domain_configs, template
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import (
+    REFERENCE_AREA,
+    REFERENCE_DEVICE,
+    REFERENCE_ENTITY,
+    ReferenceIndex,
+)
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.script import (
     ATTR_CUR,
@@ -80,6 +86,7 @@ from .const import (
     CONF_TRACE,
     CONF_TRIGGER,
     CONF_TRIGGER_VARIABLES,
+    DATA_REFERENCE_INDEX,
     DEFAULT_INITIAL_STATE,
     DOMAIN,
     LOGGER,
@@ -122,16 +129,11 @@ def is_on(hass, entity_id):
 @callback
 def automations_with_entity(hass: HomeAssistant, entity_id: str) -> list[str]:
     """Return all automations that reference the entity."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if entity_id in automation_entity.referenced_entities
-    ]
+    return index.async_referrers(REFERENCE_ENTITY, entity_id)
 
 
 @callback
@@ -153,16 +155,11 @@ def entities_in_automation(hass: HomeAssistant, entity_id: str) -> list[str]:
 @callback
 def automations_with_device(hass: HomeAssistant, device_id: str) -> list[str]:
     """Return all automations that reference the device."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if device_id in automation_entity.referenced_devices
-    ]
+    return index.async_referrers(REFERENCE_DEVICE, device_id)
 
 
 @callback
@@ -184,16 +181,11 @@ def devices_in_automation(hass: HomeAssistant, entity_id: str) -> list[str]:
 @callback
 def automations_with_area(hass: HomeAssistant, area_id: str) -> list[str]:
     """Return all automations that reference the area."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if area_id in automation_entity.referenced_areas
-    ]
+    return index.async_referrers(REFERENCE_AREA, area_id)
 
 
 @callback
@@ -215,6 +207,7 @@ def areas_in_automation(hass: HomeAssistant, entity_id: str) -> list[str]:
 async def async_setup(hass, config):
     """Set up all automations."""
     # Local import to avoid circular import
+    hass.data[DATA_REFERENCE_INDEX] = ReferenceIndex()
     hass.data[DOMAIN] = component = EntityComponent(LOGGER, DOMAIN, hass)
 
     # To register the automation blueprints
@@ -248,8 +241,8 @@ async def async_setup(hass, config):
     )
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Replace the automations whose config changed with new ones."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         async_get_blueprints(hass).async_reset_cache()
@@ -326,6 +319,16 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         """Return True if entity is on."""
         return self._async_detach_triggers is not None or self._is_enabled
 
+    @property
+    def raw_config(self) -> dict[str, Any] | None:
+        """Return the configuration the automation was created from."""
+        return self._raw_config
+
+    @property
+    def raw_blueprint_inputs(self) -> dict[str, Any] | None:
+        """Return the blueprint inputs the automation was created from."""
+        return self._blueprint_inputs
+
     @property
     def referenced_areas(self):
         """Return a set of referenced areas."""
@@ -379,6 +382,13 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         )
         self.action_script.update_logger(self._logger)
 
+        self.hass.data[DATA_REFERENCE_INDEX].async_add(
+            self.entity_id,
+            areas=self.referenced_areas,
+            devices=self.referenced_devices,
+            entities=self.referenced_entities,
+        )
+
         state = await self.async_get_last_state()
         if state:
             enable_automation = state.state == STATE_ON
@@ -518,6 +528,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
     async def async_will_remove_from_hass(self):
         """Remove listeners when removing automation from Home Assistant."""
         await super().async_will_remove_from_hass()
+        self.hass.data[DATA_REFERENCE_INDEX].async_remove(self.entity_id)
         await self.async_disable()
 
     async def async_enable(self):
@@ -609,11 +620,19 @@ async def _async_process_config(
 ) -> bool:
     """Process config and add automations.
 
+    Automations of the component whose name and configuration did not change
+    are kept running, all others are removed and replaced by new ones.
+
     Returns if blueprints were used.
     """
     entities = []
     blueprints_used = False
 
+    existing: dict[str, list[AutomationEntity]] = {}
+    for automation in component.entities:
+        existing.setdefault(automation.name, []).append(automation)
+    kept: set[str] = set()
+
     for config_key in extract_domain_configs(config, DOMAIN):
         conf: list[dict[str, Any] | blueprint.BlueprintInputs] = config[config_key]
 
@@ -645,6 +664,21 @@ async def _async_process_config(
             automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
 
+            unchanged = next(
+                (
+                    automation
+                    for automation in existing.get(name, [])
+                    if automation.entity_id not in kept
+                    and _automation_matches_config(
+                        automation, raw_config, raw_blueprint_inputs
+                    )
+                ),
+                None,
+            )
+            if unchanged is not None:
+                kept.add(unchanged.entity_id)
+                continue
+
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
             action_script = Script(
@@ -698,12 +732,29 @@ async def _async_process_config(
 
             entities.append(entity)
 
+    for automation in list(component.entities):
+        if automation.entity_id not in kept:
+            await component.async_remove_entity(automation.entity_id)
+
     if entities:
         await component.async_add_entities(entities)
 
     return blueprints_used
 
 
+def _automation_matches_config(
+    automation: AutomationEntity,
+    raw_config: dict[str, Any] | None,
+    raw_blueprint_inputs: dict[str, Any] | None,
+) -> bool:
+    """Return if an automation was created from the given configuration."""
+    return (
+        raw_config is not None
+        and automation.raw_config == raw_config
+        and automation.raw_blueprint_inputs == raw_blueprint_inputs
+    )
+
+
 async def _async_process_if(hass, name, config, p_config):
     """Process if checks."""
     if_configs = p_config[CONF_CONDITION]
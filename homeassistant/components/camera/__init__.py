@@ -40,7 +40,7 @@ from homeassistant.const import (
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import Event, ExecutorPool, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import (  # noqa: F401
@@ -393,7 +393,9 @@ class Camera(Entity):
 
     async def async_camera_image(self) -> bytes | None:
         """Return bytes of camera image."""
-        return await self.hass.async_add_executor_job(self.camera_image)
+        return await self.hass.async_add_pool_executor_job(
+            ExecutorPool.IO, self.camera_image
+        )
 
     async def handle_async_still_stream(
         self, request: web.Request, interval: float
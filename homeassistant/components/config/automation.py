@@ -19,7 +19,7 @@ async def async_setup(hass):
 
     async def hook(action, config_key):
         """post_write_hook for Config View that reloads automations."""
-        await hass.services.async_call(DOMAIN, SERVICE_RELOAD)
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
 
         if action != ACTION_DELETE:
             return
@@ -1,6 +1,7 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 from datetime import datetime as dt, timedelta
 import logging
@@ -8,6 +9,7 @@ import time
 from typing import cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
@@ -15,24 +17,28 @@ from homeassistant.components import websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import history, models as history_models
 from homeassistant.components.recorder.statistics import (
+    STATISTICS_TIERS,
     list_statistic_ids,
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import ExecutorPool, HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -42,6 +48,8 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+DATA_HISTORY_FILTERS = "history_filters"
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -101,6 +109,7 @@ async def async_setup(hass, config):
 
     use_include_order = conf.get(CONF_ORDER)
 
+    hass.data[DATA_HISTORY_FILTERS] = filters
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
@@ -109,6 +118,7 @@ async def async_setup(hass, config):
         ws_get_statistics_during_period
     )
     hass.components.websocket_api.async_register_command(ws_get_list_statistic_ids)
+    hass.components.websocket_api.async_register_command(ws_stream_history)
 
     return True
 
@@ -124,6 +134,7 @@ class LazyState(history_models.LazyState):
         vol.Required("start_time"): str,
         vol.Optional("end_time"): str,
         vol.Optional("statistic_ids"): [str],
+        vol.Optional("period", default="hour"): vol.In(STATISTICS_TIERS),
     }
 )
 @websocket_api.async_response
@@ -151,16 +162,103 @@ async def ws_get_statistics_during_period(
     else:
         end_time = None
 
-    statistics = await hass.async_add_executor_job(
+    statistics = await hass.async_add_pool_executor_job(
+        ExecutorPool.DB_READ,
         statistics_during_period,
         hass,
         start_time,
         end_time,
         msg.get("statistic_ids"),
+        msg["period"],
     )
     connection.send_result(msg["id"], statistics)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Stream history in chunks of states.
+
+    The command is acknowledged with a result, followed by an event for each
+    chunk of states and an event with done set once all states are sent.
+    With compact set, each event holds all states of an entity in the
+    compact format.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time:
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str := msg.get("end_time"):
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time:
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    connection.send_result(msg["id"])
+
+    def send_message(message: dict) -> bool:
+        """Serialize a message, send it and wait for the client to keep up.
+
+        Returns False if the connection is closed.
+        """
+        run_callback_threadsafe(
+            hass.loop, connection.send_message, JSON_DUMP(message)
+        ).result()
+        return asyncio.run_coroutine_threadsafe(
+            connection.async_drain(), hass.loop
+        ).result()
+
+    stream_states = (
+        history.stream_compact_states
+        if msg["compact"]
+        else history.stream_significant_states
+    )
+
+    def stream_history() -> None:
+        """Send the states in chunks."""
+        with session_scope(hass=hass) as session:
+            for entity_id, states in stream_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                msg.get("entity_ids"),
+                hass.data[DATA_HISTORY_FILTERS],
+                msg["include_start_time_state"],
+                msg["significant_changes_only"],
+                msg["minimal_response"],
+            ):
+                if not send_message(
+                    websocket_api.event_message(
+                        msg["id"], {"entity_id": entity_id, "states": states}
+                    )
+                ):
+                    return
+
+    await hass.async_add_pool_executor_job(ExecutorPool.DB_READ, stream_history)
+    connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/list_statistic_ids",
@@ -173,7 +271,8 @@ async def ws_get_list_statistic_ids(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Fetch a list of available statistic_id."""
-    statistic_ids = await hass.async_add_executor_job(
+    statistic_ids = await hass.async_add_pool_executor_job(
+        ExecutorPool.DB_READ,
         list_statistic_ids,
         hass,
         msg.get("statistic_type"),
@@ -213,7 +312,7 @@ class HistoryPeriodView(HomeAssistantView):
             start_time = now - one_day
 
         if start_time > now:
-            return self.json([])
+            return self.json({} if "compact" in request.query else [])
 
         end_time_str = request.query.get("end_time")
         if end_time_str:
@@ -234,6 +333,7 @@ class HistoryPeriodView(HomeAssistantView):
         )
 
         minimal_response = "minimal_response" in request.query
+        compact = "compact" in request.query
 
         hass = request.app["hass"]
 
@@ -242,11 +342,41 @@ class HistoryPeriodView(HomeAssistantView):
             and entity_ids
             and not _entities_may_have_state_changes_after(hass, entity_ids, start_time)
         ):
-            return self.json([])
+            return self.json({} if compact else [])
+
+        if compact and "stream" not in request.query:
+            return cast(
+                web.Response,
+                await hass.async_add_pool_executor_job(
+                    ExecutorPool.DB_READ,
+                    self._compact_states_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                ),
+            )
+
+        if "stream" in request.query:
+            return await self._async_stream_significant_states(
+                request,
+                hass,
+                compact,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
 
         return cast(
             web.Response,
-            await hass.async_add_executor_job(
+            await hass.async_add_pool_executor_job(
+                ExecutorPool.DB_READ,
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -306,6 +436,143 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    def _compact_states_json(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Fetch significant states from the database in the compact format."""
+        timer_start = time.perf_counter()
+
+        with session_scope(hass=hass) as session:
+            result = dict(
+                history.stream_compact_states(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                )
+            )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Extracted %d entities in %fs", len(result), elapsed)
+
+        return self.json(result)
+
+    async def _async_stream_significant_states(
+        self, request: web.Request, hass: HomeAssistant, compact: bool, *args
+    ) -> web.StreamResponse:
+        """Stream significant states as json."""
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        await response.prepare(request)
+
+        def write(data: str) -> None:
+            """Write to the response and wait for it to be sent."""
+            asyncio.run_coroutine_threadsafe(
+                response.write(data.encode("UTF-8")), hass.loop
+            ).result()
+
+        await hass.async_add_pool_executor_job(
+            ExecutorPool.DB_READ,
+            self._stream_compact_states_json
+            if compact
+            else self._stream_significant_states_json,
+            hass,
+            write,
+            *args,
+        )
+        await response.write_eof()
+        return response
+
+    def _stream_significant_states_json(
+        self,
+        hass,
+        write,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Stream significant states from the database as json.
+
+        Streamed responses list every entity once.
+        """
+        timer_start = time.perf_counter()
+        count = 0
+        current_entity_id = None
+
+        with session_scope(hass=hass) as session:
+            for entity_id, states in history.stream_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            ):
+                data = JSON_DUMP(states)[1:-1]
+                if current_entity_id is None:
+                    write(f"[[{data}")
+                elif entity_id != current_entity_id:
+                    write(f"],[{data}")
+                else:
+                    write(f",{data}")
+                current_entity_id = entity_id
+                count += len(states)
+
+        write("]]" if current_entity_id is not None else "[]")
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", count, elapsed)
+
+    def _stream_compact_states_json(
+        self,
+        hass,
+        write,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Stream significant states from the database in the compact format."""
+        separator = "{"
+
+        with session_scope(hass=hass) as session:
+            for entity_id, compact_states in history.stream_compact_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            ):
+                write(f"{separator}{JSON_DUMP(entity_id)}:{JSON_DUMP(compact_states)}")
+                separator = ","
+
+        write("{}" if separator == "{" else "}")
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Awaitable, Callable
-import json
 import logging
 from typing import Any
 
@@ -20,7 +19,7 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_bytes
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
@@ -53,12 +52,21 @@ class HomeAssistantView:
     ) -> web.Response:
         """Return a JSON response."""
         try:
-            msg = json.dumps(result, cls=JSONEncoder, allow_nan=False).encode("UTF-8")
+            msg = json_bytes(result)
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_serialized(msg, status_code, headers)
+
+    @staticmethod
+    def json_serialized(
+        payload: bytes,
+        status_code: int = HTTP_OK,
+        headers: LooseHeaders | None = None,
+    ) -> web.Response:
+        """Return a JSON response from an already serialized payload."""
         response = web.Response(
-            body=msg,
+            body=payload,
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
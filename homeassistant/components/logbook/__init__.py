@@ -1,20 +1,26 @@
 """Event parser and human readable log generator."""
+import asyncio
+from collections import OrderedDict
 from contextlib import suppress
 from datetime import timedelta
-from itertools import groupby
-import json
+from itertools import groupby, islice
 import re
 
+from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -27,6 +33,8 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONTENT_TYPE_JSON,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -34,7 +42,12 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, callback, split_entity_id
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    ExecutorPool,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
@@ -45,10 +58,11 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import json_dumps, json_loads
 from homeassistant.loader import bind_hass
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
-ENTITY_ID_JSON_TEMPLATE = '"entity_id": ?"{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": ?"([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": ?"([^"]+)"')
 ICON_JSON_EXTRACT = re.compile('"icon": ?"([^"]+)"')
@@ -57,9 +71,22 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+DATA_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
+# How long the first event of a context is kept in memory while streaming
+CONTEXT_LOOKUP_WINDOW = timedelta(hours=1)
+# How many contexts looked up in the database are cached
+CONTEXT_LOOKUP_DB_CACHE_SIZE = 1000
+# How many ids of contexts evicted from memory are remembered
+CONTEXT_LOOKUP_EVICTED_SIZE = 10000
+
+# How many entries are sent at once when streaming
+STREAM_CHUNK_SIZE = 100
+# How long the event stream waits for the recorder to commit recent events
+RECORDER_COMMIT_TIMEOUT = 10  # seconds
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -159,7 +186,10 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    hass.components.websocket_api.async_register_command(ws_stream_events)
+    hass.components.websocket_api.async_register_command(ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -238,6 +268,17 @@ class LogbookView(HomeAssistantView):
                 "Can't combine entity with context_id", HTTP_BAD_REQUEST
             )
 
+        if "stream" in request.query:
+            return await self._async_stream_events(
+                request,
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                entity_matches_only,
+                context_id,
+            )
+
         def json_events():
             """Fetch events and generate JSON."""
             return self.json(
@@ -253,7 +294,267 @@ class LogbookView(HomeAssistantView):
                 )
             )
 
-        return await hass.async_add_executor_job(json_events)
+        return await hass.async_add_pool_executor_job(ExecutorPool.DB_READ, json_events)
+
+    async def _async_stream_events(
+        self,
+        request,
+        hass,
+        start_day,
+        end_day,
+        entity_ids,
+        entity_matches_only,
+        context_id,
+    ):
+        """Stream logbook entries as json while they are read."""
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        await response.prepare(request)
+
+        def write(data):
+            """Write to the response and wait for it to be sent."""
+            asyncio.run_coroutine_threadsafe(
+                response.write(data.encode("UTF-8")), hass.loop
+            ).result()
+
+        def stream_events():
+            """Write the entries in chunks."""
+            separator = "["
+            for entries in _chunk_entries(
+                _stream_events(
+                    hass,
+                    start_day,
+                    end_day,
+                    entity_ids,
+                    self.filters,
+                    self.entities_filter,
+                    entity_matches_only,
+                    context_id,
+                )
+            ):
+                write(f"{separator}{json_dumps(entries)[1:-1]}")
+                separator = ","
+            write("[]" if separator == "[" else "]")
+
+        await hass.async_add_pool_executor_job(ExecutorPool.DB_READ, stream_events)
+        await response.write_eof()
+        return response
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+        vol.Optional("entity_matches_only", default=False): bool,
+        vol.Optional("context_id"): str,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_events(hass, connection, msg):
+    """Stream logbook entries in chunks.
+
+    The command is acknowledged with a result, followed by an event for each
+    chunk of entries and an event with done set once all entries are sent.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time:
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str := msg.get("end_time"):
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time:
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    entity_ids = msg.get("entity_ids")
+    context_id = msg.get("context_id")
+    if entity_ids and context_id:
+        connection.send_error(
+            msg["id"], "invalid_format", "Can't combine entity_ids with context_id"
+        )
+        return
+
+    connection.send_result(msg["id"])
+    filters, entities_filter = hass.data[DATA_FILTERS]
+
+    def stream_events():
+        """Send the entries in chunks."""
+        for entries in _chunk_entries(
+            _stream_events(
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                filters,
+                entities_filter,
+                msg["entity_matches_only"],
+                context_id,
+            )
+        ):
+            run_callback_threadsafe(
+                hass.loop,
+                connection.send_message,
+                websocket_api.event_message(msg["id"], {"events": entries}),
+            ).result()
+
+    await hass.async_add_pool_executor_job(ExecutorPool.DB_READ, stream_events)
+    connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(hass, connection, msg):
+    """Send logbook entries since start_time and then entries as they happen.
+
+    The command is acknowledged with a result. The entries in the database
+    are sent in chunks of events like logbook/stream, followed by an event
+    with live set. From then on, entries of the events fired after
+    subscribing are sent as they happen until the subscription is cancelled.
+    The entries in the database are read once the recorder has committed the
+    events fired before subscribing, or after RECORDER_COMMIT_TIMEOUT.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time:
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    msg_id = msg["id"]
+    entity_ids = msg.get("entity_ids")
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    subscribe_time = dt_util.utcnow()
+    live_entities_filter = (
+        entities_filter
+        if entity_ids is None
+        else generate_filter([], entity_ids, [], [])
+    )
+    entity_attr_cache = EntityAttributeCache(hass)
+    context_lookup = ContextLookup(None, subscribe_time)
+    # Events fired while the entries in the database are sent
+    pending_events = []
+
+    @callback
+    def _async_send_live_event(event):
+        """Send the entry of an event."""
+        if entries := _humanify_live_event(
+            hass, event, live_entities_filter, entity_attr_cache, context_lookup
+        ):
+            connection.send_message(
+                websocket_api.event_message(msg_id, {"events": entries})
+            )
+
+    @callback
+    def _async_forward_event(event):
+        """Send the entry of an event once the entries in the database are sent."""
+        if pending_events is None:
+            _async_send_live_event(event)
+        else:
+            pending_events.append(event)
+
+    event_types = {
+        EVENT_STATE_CHANGED,
+        *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
+        *hass.data[DOMAIN],
+    }
+    unsubs = [
+        hass.bus.async_listen(event_type, _async_forward_event)
+        for event_type in event_types
+    ]
+
+    @callback
+    def _async_unsubscribe():
+        """Stop sending entries."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+    with suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            hass.data[DATA_INSTANCE].async_block_till_done(), RECORDER_COMMIT_TIMEOUT
+        )
+    if msg_id not in connection.subscriptions:
+        return
+
+    def stream_events():
+        """Send the entries in the database in chunks."""
+        for entries in _chunk_entries(
+            _stream_events(
+                hass,
+                start_time,
+                subscribe_time,
+                entity_ids,
+                filters,
+                entities_filter,
+            )
+        ):
+            run_callback_threadsafe(
+                hass.loop,
+                connection.send_message,
+                websocket_api.event_message(msg_id, {"events": entries}),
+            ).result()
+
+    await hass.async_add_pool_executor_job(ExecutorPool.DB_READ, stream_events)
+    if msg_id not in connection.subscriptions:
+        return
+
+    connection.send_message(websocket_api.event_message(msg_id, {"live": True}))
+    events, pending_events = pending_events, None
+    for event in events:
+        _async_send_live_event(event)
+
+
+def _humanify_live_event(
+    hass, event, entities_filter, entity_attr_cache, context_lookup
+):
+    """Return the entries of an event fired on the event bus."""
+    live_event = LiveEventPartialState(event)
+    context_lookup.add(live_event)
+    if event.event_type == EVENT_CALL_SERVICE:
+        return []
+    if event.event_type == EVENT_STATE_CHANGED:
+        if not _keep_state_change(event, entities_filter):
+            return []
+    elif not _keep_event(hass, live_event, entities_filter):
+        return []
+    return list(humanify(hass, (live_event,), entity_attr_cache, context_lookup))
+
+
+def _keep_state_change(event, entities_filter):
+    """Filter state changes the way the database query does."""
+    new_state = event.data.get("new_state")
+    old_state = event.data.get("old_state")
+    if new_state is None or old_state is None or new_state.state == old_state.state:
+        return False
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return False
+    return entities_filter is None or entities_filter(new_state.entity_id)
+
+
+def _chunk_entries(entries):
+    """Split entries into lists of up to STREAM_CHUNK_SIZE entries."""
+    entries = iter(entries)
+    while chunk := list(islice(entries, STREAM_CHUNK_SIZE)):
+        yield chunk
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -409,6 +710,10 @@ def humanify(hass, events, entity_attr_cache, context_lookup):
 
                 yield data
 
+        # Callers that keep every context pass a dict
+        if isinstance(context_lookup, ContextLookup):
+            context_lookup.evict(events_batch[-1].time_fired)
+
 
 def _get_events(
     hass,
@@ -421,18 +726,42 @@ def _get_events(
     context_id=None,
 ):
     """Get events for a period of time."""
+    return list(
+        _stream_events(
+            hass,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_id,
+        )
+    )
+
+
+def _stream_events(
+    hass,
+    start_day,
+    end_day,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+    context_id=None,
+):
+    """Yield the humanified events of a period of time as they are read."""
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
     entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
 
-    def yield_events(query):
+    def yield_events(query, context_lookup):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(1000):
             event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
+            context_lookup.add(event)
             if event.event_type == EVENT_CALL_SERVICE:
                 continue
             if event.event_type == EVENT_STATE_CHANGED or _keep_event(
@@ -443,7 +772,10 @@ def _get_events(
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass) as session, session_scope(
+        hass=hass
+    ) as context_session:
+        context_lookup = ContextLookup(context_session, start_day)
         old_state = aliased(States, name="old_state")
 
         if entity_ids is not None:
@@ -481,8 +813,11 @@ def _get_events(
 
         query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        yield from humanify(
+            hass,
+            yield_events(query, context_lookup),
+            entity_attr_cache,
+            context_lookup,
         )
 
 
@@ -492,7 +827,9 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        sqlalchemy.func.coalesce(StateAttributes.shared_attrs, States.attributes).label(
+            "attributes"
+        ),
     )
 
 
@@ -511,6 +848,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -525,6 +865,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -552,8 +895,14 @@ def _continuous_entity_matcher():
     # Prefilter out continuous domains that have
     # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
     #
+    # The attributes are either shared or stored inline
+    # for rows written before the shared attributes table.
+    #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
+        sqlalchemy.not_(
+            StateAttributes.shared_attrs.contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
         sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
@@ -571,14 +920,7 @@ def _apply_event_types_filter(hass, query, event_types):
 
 
 def _apply_event_entity_id_matchers(events_query, entity_ids):
-    return events_query.filter(
-        sqlalchemy.or_(
-            *(
-                Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
-                for entity_id in entity_ids
-            )
-        )
-    )
+    return events_query.filter(Events.entity_id.in_(entity_ids))
 
 
 def _keep_event(hass, event, entities_filter):
@@ -675,6 +1017,99 @@ def _entity_name_from_event(entity_id, event, entity_attr_cache):
     ) or split_entity_id(entity_id)[1].replace("_", " ")
 
 
+class ContextLookup:
+    """A time windowed lookup of the first event of every context.
+
+    The first event of a context is kept while it was fired less than
+    CONTEXT_LOOKUP_WINDOW before the newest event humanified, so the memory
+    used depends on the events in the window instead of the rows of the
+    logbook. The ids of the contexts evicted most recently or seen again
+    after their eviction are remembered, up to CONTEXT_LOOKUP_EVICTED_SIZE,
+    so later events of a context that runs longer than the window are not
+    taken for its first event. Contexts that started before the window are
+    looked up in the database and a bounded number of them is cached.
+    """
+
+    def __init__(self, session, start_time):
+        """Init the lookup.
+
+        Without a session, contexts are only looked up in memory.
+        """
+        self._session = session
+        self._start_time = start_time
+        # Set to the newest time fired evicted from memory
+        self._horizon = None
+        self._events = OrderedDict()
+        self._evicted = OrderedDict()
+        self._db_events = OrderedDict()
+
+    def add(self, event):
+        """Add an event if it is the first of its context."""
+        context_id = event.context_id
+        if context_id in self._events:
+            return
+        if context_id in self._evicted:
+            # The context is still running, keep remembering it
+            self._evicted.move_to_end(context_id)
+            return
+        self._events[context_id] = event
+
+    def evict(self, time_fired):
+        """Evict the contexts that started more than the window before time_fired.
+
+        Must only be called once the entries of the events fired up to
+        time_fired have been made.
+        """
+        oldest_kept = time_fired - CONTEXT_LOOKUP_WINDOW
+        events = self._events
+        while events:
+            context_id, oldest = next(iter(events.items()))
+            if oldest.time_fired >= oldest_kept:
+                break
+            del events[context_id]
+            if self._session is not None:
+                self._evicted[context_id] = None
+                if len(self._evicted) > CONTEXT_LOOKUP_EVICTED_SIZE:
+                    self._evicted.popitem(last=False)
+            self._horizon = oldest.time_fired
+
+    def get(self, context_id):
+        """Return the first event of a context."""
+        if context_id is None:
+            return None
+        if (event := self._events.get(context_id)) is not None:
+            return event
+        if context_id in self._db_events:
+            self._db_events.move_to_end(context_id)
+            return self._db_events[context_id]
+
+        event = self._db_events[context_id] = self._lookup(context_id)
+        if len(self._db_events) > CONTEXT_LOOKUP_DB_CACHE_SIZE:
+            self._db_events.popitem(last=False)
+        return event
+
+    def _lookup(self, context_id):
+        """Look up the first event of a context that started before the window."""
+        if self._session is None:
+            return None
+        row = (
+            _generate_events_query(self._session)
+            .outerjoin(States, (Events.event_id == States.event_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
+            .filter(Events.context_id == context_id)
+            .filter(
+                Events.time_fired
+                <= (self._start_time if self._horizon is None else self._horizon)
+            )
+            .order_by(Events.time_fired)
+            .first()
+        )
+        return LazyEventPartialState(row) if row is not None else None
+
+
 class LazyEventPartialState:
     """A lazy version of core Event with limited State joined in."""
 
@@ -690,6 +1125,7 @@ class LazyEventPartialState:
         "context_id",
         "context_user_id",
         "context_parent_id",
+        "time_fired",
         "time_fired_minute",
     ]
 
@@ -706,6 +1142,7 @@ class LazyEventPartialState:
         self.context_id = self._row.context_id
         self.context_user_id = self._row.context_user_id
         self.context_parent_id = self._row.context_parent_id
+        self.time_fired = self._row.time_fired
         self.time_fired_minute = self._row.time_fired.minute
 
     @property
@@ -745,7 +1182,7 @@ class LazyEventPartialState:
             ):
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json_loads(self._row.attributes)
         return self._attributes
 
     @property
@@ -755,7 +1192,7 @@ class LazyEventPartialState:
             if self._row.event_data == EMPTY_JSON_OBJECT:
                 self._event_data = {}
             else:
-                self._event_data = json.loads(self._row.event_data)
+                self._event_data = json_loads(self._row.event_data)
         return self._event_data
 
     @property
@@ -769,6 +1206,67 @@ class LazyEventPartialState:
         return self._time_fired_isoformat
 
 
+class LiveEventPartialState:
+    """An Event fired on the event bus with the interface of LazyEventPartialState."""
+
+    __slots__ = [
+        "event_type",
+        "data",
+        "entity_id",
+        "state",
+        "domain",
+        "attributes",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "time_fired",
+        "time_fired_minute",
+    ]
+
+    def __init__(self, event):
+        """Init the live event."""
+        self.event_type = event.event_type
+        self.data = event.data
+        if (
+            event.event_type == EVENT_STATE_CHANGED
+            and (new_state := event.data.get("new_state")) is not None
+        ):
+            self.entity_id = new_state.entity_id
+            self.state = new_state.state
+            self.domain = new_state.domain
+            self.attributes = new_state.attributes
+        else:
+            self.entity_id = None
+            self.state = None
+            self.domain = None
+            self.attributes = {}
+        self.context_id = event.context.id
+        self.context_user_id = event.context.user_id
+        self.context_parent_id = event.context.parent_id
+        self.time_fired = event.time_fired
+        self.time_fired_minute = event.time_fired.minute
+
+    @property
+    def attributes_icon(self):
+        """Icon of the state."""
+        return self.attributes.get(ATTR_ICON)
+
+    @property
+    def data_entity_id(self):
+        """Entity id of the event data."""
+        return self.data.get(ATTR_ENTITY_ID)
+
+    @property
+    def data_domain(self):
+        """Domain of the event data."""
+        return self.data.get(ATTR_DOMAIN)
+
+    @property
+    def time_fired_isoformat(self):
+        """Time event was fired in utc isoformat."""
+        return process_timestamp_to_utc_isoformat(self.time_fired)
+
+
 class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
@@ -30,6 +30,7 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_JOB_METRICS = "job_metrics"
 
 
 SERVICES = (
@@ -40,11 +41,13 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_JOB_METRICS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 CONF_SECONDS = "seconds"
+CONF_LIMIT = "limit"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -64,6 +67,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         async with lock:
             await _async_generate_memory_profile(hass, call)
 
+    async def _async_run_job_metrics(call: ServiceCall):
+        async with lock:
+            await _async_log_job_metrics(hass, call)
+
     async def _async_start_log_objects(call: ServiceCall):
         if LOG_INTERVAL_SUB in domain_data:
             domain_data[LOG_INTERVAL_SUB]()
@@ -148,6 +155,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_JOB_METRICS,
+        _async_run_job_metrics,
+        schema=vol.Schema(
+            {
+                vol.Optional(CONF_SECONDS, default=60.0): vol.Coerce(float),
+                vol.Optional(CONF_LIMIT, default=20): cv.positive_int,
+            }
+        ),
+    )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -249,6 +269,48 @@ async def _async_generate_memory_profile(hass: HomeAssistant, call: ServiceCall)
     )
 
 
+async def _async_log_job_metrics(hass: HomeAssistant, call: ServiceCall):
+    start_time = int(time.time() * 1000000)
+    hass.components.persistent_notification.async_create(
+        "Job metrics recording has started. This notification will be updated when it is complete.",
+        title="Job Metrics Started",
+        notification_id=f"job_metrics_{start_time}",
+    )
+    # Keep metrics running that were enabled by someone else
+    enabled = hass.job_metrics is None
+    metrics = hass.async_enable_job_metrics()
+    try:
+        await asyncio.sleep(float(call.data[CONF_SECONDS]))
+        result = metrics.as_dict(call.data[CONF_LIMIT])
+    finally:
+        if enabled:
+            hass.async_disable_job_metrics()
+
+    for name, timings in result["targets"].items():
+        _LOGGER.critical(
+            "Job %s (%s): %s runs, max %.3fs, total %.3fs",
+            name,
+            timings["job_type"],
+            timings["count"],
+            timings["max"],
+            timings["total"],
+        )
+    _LOGGER.critical(
+        "Event loop lag max %.3fs, executor queue depth max %s",
+        result["loop_lag"]["max"],
+        result["executor_queue_depth"]["max"],
+    )
+    for pool, queue_depth in result["pool_queue_depth"].items():
+        _LOGGER.critical(
+            "Executor pool %s queue depth max %s", pool, queue_depth["max"]
+        )
+    hass.components.persistent_notification.async_create(
+        "Job metrics have been logged. See [the logs](/config/logs) for the jobs that ran the longest.",
+        title="Job Metrics Complete",
+        notification_id=f"job_metrics_{start_time}",
+    )
+
+
 def _write_profile(profiler, cprofile_path, callgrind_path):
     profiler.create_stats()
     profiler.dump_stats(cprofile_path)
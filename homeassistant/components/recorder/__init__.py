@@ -28,7 +28,8 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
+from homeassistant.helpers import discovery
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -46,11 +47,20 @@ from homeassistant.helpers.integration_platform import (
 from homeassistant.helpers.service import async_extract_entity_ids
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from . import history, migration, purge, statistics
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .bulk import BulkWriter, bulk_insert_supported
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    EVENT_RECORDER_PURGE_PROGRESS,
+    PURGE_TIME_SLICE,
+    SQLITE_URL_PREFIX,
+)
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .pool import RecorderPool
 from .util import (
     dburl_to_path,
@@ -103,12 +113,19 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BULK_INSERT = False
+DEFAULT_COALESCE_STATE_CHANGES = False
+DEFAULT_METRIC_SENSORS = False
 KEEPALIVE_TIME = 30
 
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of shared state attributes ids
+# to keep in memory to avoid database lookups
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -117,6 +134,11 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_MAX_QUEUE_BACKLOG = "max_queue_backlog"
+CONF_COALESCE_STATE_CHANGES = "coalesce_state_changes"
+CONF_METRIC_SENSORS = "metric_sensors"
+CONF_STATISTICS_KEEP_DAYS = "statistics_keep_days"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -145,6 +167,26 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_MAX_QUEUE_BACKLOG): cv.positive_int,
+                    vol.Optional(
+                        CONF_COALESCE_STATE_CHANGES,
+                        default=DEFAULT_COALESCE_STATE_CHANGES,
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_METRIC_SENSORS, default=DEFAULT_METRIC_SENSORS
+                    ): cv.boolean,
+                    vol.Optional(CONF_STATISTICS_KEEP_DAYS, default={}): {
+                        vol.Optional(tier): vol.All(
+                            vol.Coerce(int),
+                            vol.Range(
+                                min=statistics.STATISTICS_MIN_KEEP_DAYS.get(tier, 1)
+                            ),
+                        )
+                        for tier in statistics.STATISTICS_TIERS
+                    },
+                    vol.Optional(
+                        CONF_BULK_INSERT, default=DEFAULT_BULK_INSERT
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -222,6 +264,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    max_queue_backlog = conf.get(CONF_MAX_QUEUE_BACKLOG, MAX_QUEUE_BACKLOG)
+    coalesce_state_changes = conf[CONF_COALESCE_STATE_CHANGES]
+    statistics_keep_days = conf[CONF_STATISTICS_KEEP_DAYS]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
@@ -239,10 +285,18 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        bulk_insert=bulk_insert,
+        max_queue_backlog=max_queue_backlog,
+        coalesce_state_changes=coalesce_state_changes,
+        statistics_keep_days=statistics_keep_days,
     )
     instance.async_initialize()
     instance.start()
     _async_register_services(hass, instance)
+    if conf[CONF_METRIC_SENSORS]:
+        hass.async_create_task(
+            discovery.async_load_platform(hass, "sensor", DOMAIN, {}, config)
+        )
     history.async_setup(hass)
     statistics.async_setup(hass)
     await async_process_integration_platforms(hass, DOMAIN, _process_recorder_platform)
@@ -303,12 +357,30 @@ def _async_register_services(hass, instance):
     )
 
 
+def _is_attribute_only_update(event: Event) -> bool:
+    """Return if a state changed event only changed the attributes.
+
+    Entities with force_update set always get a new last_changed, so their
+    state changes are never considered attribute only updates.
+    """
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    return (
+        old_state is not None
+        and new_state is not None
+        and new_state.state == old_state.state
+        and new_state.last_changed == old_state.last_changed
+    )
+
+
 class PurgeTask(NamedTuple):
     """Object to store information about purge task."""
 
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    auto_repack: bool = False
+    progress: purge.PurgeProgress | None = None
 
 
 class PurgeEntitiesTask(NamedTuple):
@@ -327,10 +399,31 @@ class StatisticsTask(NamedTuple):
     start: datetime
 
 
+class UpdateStatisticIdTask(NamedTuple):
+    """An object to insert into the recorder queue to rename a statistic."""
+
+    old_statistic_id: str
+    new_statistic_id: str
+
+
+class SynchronizeTask(NamedTuple):
+    """An object to insert into the recorder queue to commit and set an asyncio event."""
+
+    event: asyncio.Event
+
+
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask:
+    """An object to insert into the recorder queue to commit the event session."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to keep the connection alive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -345,6 +438,10 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        bulk_insert: bool = DEFAULT_BULK_INSERT,
+        max_queue_backlog: int = MAX_QUEUE_BACKLOG,
+        coalesce_state_changes: bool = DEFAULT_COALESCE_STATE_CHANGES,
+        statistics_keep_days: dict[str, int] | None = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -366,12 +463,29 @@ class Recorder(threading.Thread):
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
+        self.bulk_insert = bulk_insert
+        self._bulk_writer: BulkWriter | None = None
+        self.max_queue_backlog = max_queue_backlog
+        # Coalescing needs a commit window to coalesce in
+        self.coalesce_state_changes = coalesce_state_changes and bool(commit_interval)
+        self._coalesced_events: dict[str, Event] = {}
+        self.coalesced_state_changes = 0
+
+        # Metrics exposed by the recorder sensors
+        self.metrics_entity_ids: set[str] = set()
+        self.commit_latency = 0.0
+        self.rows_per_commit = 0
+        self._pending_rows = 0
+        self._oldest_pending_time_fired: datetime | None = None
 
-        self._timechanges_seen = 0
         self._commits_without_expire = 0
-        self._keepalive_count = 0
         self._old_states: dict[str, States] = {}
+        self._state_attributes_ids: dict[str, int] = {}
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_expunge: list[States] = []
+        self.statistics_meta_ids: dict[str, int] = {}
+        self.statistics_keep_days = statistics_keep_days or {}
+        self.purge_progress: purge.PurgeProgress | None = None
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -379,6 +493,8 @@ class Recorder(threading.Thread):
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self._queue_watcher = None
+        self._commit_timer = None
+        self._keepalive_timer = None
 
         self.enabled = True
 
@@ -395,6 +511,27 @@ class Recorder(threading.Thread):
         self._queue_watcher = async_track_time_interval(
             self.hass, self._async_check_queue, timedelta(minutes=10)
         )
+        if self.commit_interval:
+            self._commit_timer = async_track_time_interval(
+                self.hass,
+                self._async_commit_tick,
+                timedelta(seconds=self.commit_interval),
+            )
+        self._keepalive_timer = async_track_time_interval(
+            self.hass, self._async_keepalive_tick, timedelta(seconds=KEEPALIVE_TIME)
+        )
+
+    @callback
+    def _async_commit_tick(self, *_):
+        """Queue a commit of the events received in this commit window."""
+        if self._coalesced_events:
+            self._async_flush_coalesced_events()
+        self.queue.put(CommitTask())
+
+    @callback
+    def _async_keepalive_tick(self, *_):
+        """Queue a keep alive of the database connection."""
+        self.queue.put(KeepAliveTask())
 
     @callback
     def _async_check_queue(self, *_):
@@ -404,11 +541,11 @@ class Recorder(threading.Thread):
         """
         size = self.queue.qsize()
         _LOGGER.debug("Recorder queue size is: %s", size)
-        if self.queue.qsize() <= MAX_QUEUE_BACKLOG:
+        if self.queue.qsize() <= self.max_queue_backlog:
             return
         _LOGGER.error(
             "The recorder queue reached the maximum size of %s; Events are no longer being recorded",
-            MAX_QUEUE_BACKLOG,
+            self.max_queue_backlog,
         )
         self._async_stop_queue_watcher_and_event_listener()
 
@@ -418,6 +555,12 @@ class Recorder(threading.Thread):
         if self._queue_watcher:
             self._queue_watcher()
             self._queue_watcher = None
+        if self._commit_timer:
+            self._commit_timer()
+            self._commit_timer = None
+        if self._keepalive_timer:
+            self._keepalive_timer()
+            self._keepalive_timer = None
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
@@ -427,6 +570,8 @@ class Recorder(threading.Thread):
         """Filter events."""
         if event.event_type in self.exclude_t:
             return False
+        if event.event_type in (EVENT_RECORDER_PURGE_PROGRESS, EVENT_TIME_CHANGED):
+            return False
 
         entity_id = event.data.get(ATTR_ENTITY_ID)
 
@@ -434,6 +579,8 @@ class Recorder(threading.Thread):
             return True
 
         if isinstance(entity_id, str):
+            if entity_id in self.metrics_entity_ids:
+                return False
             return self.entity_filter(entity_id)
 
         if isinstance(entity_id, list):
@@ -466,6 +613,11 @@ class Recorder(threading.Thread):
             start = statistics.get_start_time()
         self.queue.put(StatisticsTask(start))
 
+    @callback
+    def async_update_statistic_id(self, old_statistic_id, new_statistic_id):
+        """Rename a statistic on the recorder thread."""
+        self.queue.put(UpdateStatisticIdTask(old_statistic_id, new_statistic_id))
+
     @callback
     def async_register(self, shutdown_task, hass_started):
         """Post connection initialize."""
@@ -493,6 +645,9 @@ class Recorder(threading.Thread):
             """Shut down the Recorder."""
             if not hass_started.done():
                 hass_started.set_result(shutdown_task)
+            run_callback_threadsafe(
+                self.hass.loop, self._async_flush_coalesced_events
+            ).result()
             self.queue.put(None)
             self.hass.add_job(self._async_stop_queue_watcher_and_event_listener)
             self.join()
@@ -540,7 +695,11 @@ class Recorder(threading.Thread):
             # after it completes to ensure it does not happen
             # until after the database is vacuumed
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
-            self.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+            self.queue.put(
+                PurgeTask(
+                    purge_before, repack=False, apply_filter=False, auto_repack=True
+                )
+            )
         else:
             self.queue.put(PerodicCleanupTask())
 
@@ -698,24 +857,62 @@ class Recorder(threading.Thread):
             self.migration_in_progress = False
             persistent_notification.dismiss(self.hass, "recorder_database_migration")
 
-    def _run_purge(self, purge_before, repack, apply_filter):
-        """Purge the database."""
-        if purge.purge_old_data(self, purge_before, repack, apply_filter):
+    def _run_purge(self, purge_before, repack, apply_filter, auto_repack, progress):
+        """Purge the database in batches for up to one time slice."""
+        self._commit_pending_before_purge()
+        if progress is None:
+            progress = purge.PurgeProgress()
+        # Each purge task carries its own progress, the purge functions count
+        # the deleted rows on the progress of the purge that is running
+        self.purge_progress = progress
+        slice_start = time.monotonic()
+        try:
+            while not (
+                finished := purge.purge_old_data(
+                    self, purge_before, repack, apply_filter, auto_repack
+                )
+            ):
+                # Yield to the event queue when events are waiting
+                # or the time slice is used up
+                if (
+                    not self.queue.empty()
+                    or time.monotonic() - slice_start >= PURGE_TIME_SLICE
+                ):
+                    break
+        finally:
+            self.purge_progress = None
+
+        self.hass.bus.fire(
+            EVENT_RECORDER_PURGE_PROGRESS, progress.as_event_data(finished)
+        )
+        if finished:
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
             perodic_db_cleanups(self)
             return
         # Schedule a new purge task if this one didn't finish
-        self.queue.put(PurgeTask(purge_before, repack, apply_filter))
+        self.queue.put(
+            PurgeTask(purge_before, repack, apply_filter, auto_repack, progress)
+        )
 
     def _run_purge_entities(self, entity_filter):
         """Purge entities from the database."""
+        self._commit_pending_before_purge()
         if purge.purge_entity_data(self, entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
         self.queue.put(PurgeEntitiesTask(entity_filter))
 
+    def _commit_pending_before_purge(self):
+        """Commit the pending states before purging in another session.
+
+        Pending states may use cached ids of shared attributes which are not
+        referenced by any committed state, the purge would delete them.
+        """
+        if self.event_session is not None:
+            self._commit_event_session_or_retry()
+
     def _run_statistics(self, start):
         """Run statistics task."""
         if statistics.compile_statistics(self, start):
@@ -726,7 +923,13 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event):
         """Process one event."""
         if isinstance(event, PurgeTask):
-            self._run_purge(event.purge_before, event.repack, event.apply_filter)
+            self._run_purge(
+                event.purge_before,
+                event.repack,
+                event.apply_filter,
+                event.auto_repack,
+                event.progress,
+            )
             return
         if isinstance(event, PurgeEntitiesTask):
             self._run_purge_entities(event.entity_filter)
@@ -737,24 +940,52 @@ class Recorder(threading.Thread):
         if isinstance(event, StatisticsTask):
             self._run_statistics(event.start)
             return
+        if isinstance(event, UpdateStatisticIdTask):
+            statistics.update_statistic_id(
+                self, event.old_statistic_id, event.new_statistic_id
+            )
+            return
+        if isinstance(event, SynchronizeTask):
+            try:
+                # Commit so the events queued before are visible to other sessions
+                self._commit_event_session_or_retry()
+            finally:
+                self.hass.loop.call_soon_threadsafe(event.event.set)
+            return
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
-        if event.event_type == EVENT_TIME_CHANGED:
-            self._keepalive_count += 1
-            if self._keepalive_count >= KEEPALIVE_TIME:
-                self._keepalive_count = 0
-                self._send_keep_alive()
-            if self.commit_interval:
-                self._timechanges_seen += 1
-                if self._timechanges_seen >= self.commit_interval:
-                    self._timechanges_seen = 0
-                    self._commit_event_session_or_retry()
+        if isinstance(event, CommitTask):
+            self._commit_event_session_or_retry()
+            return
+        if isinstance(event, KeepAliveTask):
+            self._send_keep_alive()
             return
 
         if not self.enabled:
             return
 
+        if self._oldest_pending_time_fired is None:
+            self._oldest_pending_time_fired = event.time_fired
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            statistics.process_state_changed(self.hass, event)
+            self._pending_rows += 2
+        else:
+            self._pending_rows += 1
+
+        if self._bulk_writer is not None:
+            self._process_one_event_bulk(event)
+        else:
+            self._process_one_event_orm(event)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _process_one_event_orm(self, event):
+        """Add an event and its state to the session as ORM objects."""
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
@@ -778,6 +1009,7 @@ class Recorder(threading.Thread):
                         dbstate.old_state = old_state
                 if not has_new_state:
                     dbstate.state = None
+                self._set_state_attributes(dbstate, event)
                 dbstate.event = dbevent
                 dbstate.created = event.time_fired
                 self.event_session.add(dbstate)
@@ -790,10 +1022,93 @@ class Recorder(threading.Thread):
                     event.data.get("new_state"),
                 )
 
-        # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
-            self._commit_event_session_or_retry()
+    def _process_one_event_bulk(self, event):
+        """Buffer an event and its state for the next bulk insert."""
+        bulk_writer = self._bulk_writer
+        try:
+            shared_attrs = None
+            if event.event_type == EVENT_STATE_CHANGED:
+                # Serialize before buffering so an unserializable
+                # state does not leave its event behind
+                try:
+                    shared_attrs = StateAttributes.shared_attrs_from_event(event)
+                except (TypeError, ValueError):
+                    _LOGGER.warning(
+                        "State is not JSON serializable: %s",
+                        event.data.get("new_state"),
+                    )
+            event_id = bulk_writer.add_event(self.event_session, event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+
+        if shared_attrs is not None:
+            bulk_writer.add_state(
+                event, event_id, self._get_state_attributes_id(shared_attrs)
+            )
+
+    def _get_state_attributes_id(self, shared_attrs):
+        """Return the id of the shared attributes row, buffering it if needed."""
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            return attributes_id
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        attributes = (
+            self.event_session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.hash == attr_hash)
+            .filter(StateAttributes.shared_attrs == shared_attrs)
+            .first()
+        )
+        if attributes:
+            attributes_id = attributes[0]
+        else:
+            attributes_id = self._bulk_writer.add_state_attributes(
+                shared_attrs, attr_hash
+            )
+        self._cache_state_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def _set_state_attributes(self, dbstate, event):
+        """Link a state to the shared attributes row, creating it if needed."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            dbstate.attributes_id = attributes_id
+            return
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        with self.event_session.no_autoflush:
+            attributes = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            )
+        if attributes:
+            dbstate.attributes_id = attributes[0]
+            self._cache_state_attributes_id(shared_attrs, attributes[0])
+            return
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of a shared attributes row."""
+        if len(self._state_attributes_ids) >= STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            # Evict the oldest entry
+            del self._state_attributes_ids[next(iter(self._state_attributes_ids))]
+        self._state_attributes_ids[shared_attrs] = attributes_id
+
+    def _evict_purged_state_attributes_ids(self, attributes_ids):
+        """Forget the ids of shared attributes rows that have been purged."""
+        self._state_attributes_ids = {
+            shared_attrs: attributes_id
+            for shared_attrs, attributes_id in self._state_attributes_ids.items()
+            if attributes_id not in attributes_ids
+        }
 
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
@@ -807,12 +1122,21 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not (self._bulk_writer and self._bulk_writer.pending)
+        ):
             return
         tries = 1
+        start = time.monotonic()
         while tries <= self.db_max_retries:
             try:
                 self._commit_event_session()
+                self.commit_latency = time.monotonic() - start
+                self.rows_per_commit = self._pending_rows
+                self._pending_rows = 0
+                self._oldest_pending_time_fired = None
                 return
             except (exc.InternalError, exc.OperationalError) as err:
                 _LOGGER.error(
@@ -830,6 +1154,16 @@ class Recorder(threading.Thread):
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
+        if self._bulk_writer and self._bulk_writer.pending:
+            try:
+                self._bulk_writer.write(self.event_session)
+                self.event_session.commit()
+            except SQLAlchemyError:
+                # Rollback so the buffered rows can be written again on retry
+                self.event_session.rollback()
+                raise
+            self._bulk_writer.clear()
+
         if self._pending_expunge:
             self.event_session.flush()
             for dbstate in self._pending_expunge:
@@ -840,6 +1174,13 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        # The shared attributes have their ids after the commit
+        for shared_attrs, dbstate_attributes in self._pending_state_attributes.items():
+            self._cache_state_attributes_id(
+                shared_attrs, dbstate_attributes.attributes_id
+            )
+        self._pending_state_attributes = {}
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -858,6 +1199,10 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._state_attributes_ids = {}
+        self._pending_state_attributes = {}
+        if self._bulk_writer:
+            self._bulk_writer.reset()
 
         if not self.event_session:
             return
@@ -879,17 +1224,58 @@ class Recorder(threading.Thread):
         """Open the event session."""
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self.bulk_insert and bulk_insert_supported(self.engine.dialect.name):
+            self._bulk_writer = BulkWriter()
+        else:
+            self._bulk_writer = None
 
     def _send_keep_alive(self):
         """Send a keep alive to keep the db connection open."""
         _LOGGER.debug("Sending keepalive")
         self.event_session.connection().scalar(select([1]))
 
+    @property
+    def oldest_pending_event_age(self) -> float:
+        """Return the age in seconds of the oldest event not yet committed."""
+        if (time_fired := self._oldest_pending_time_fired) is None:
+            return 0.0
+        return max((dt_util.utcnow() - time_fired).total_seconds(), 0.0)
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
+        if self.coalesce_state_changes and event.event_type == EVENT_STATE_CHANGED:
+            entity_id = event.data["entity_id"]
+            if _is_attribute_only_update(event):
+                if entity_id in self._coalesced_events:
+                    self.coalesced_state_changes += 1
+                self._coalesced_events[entity_id] = event
+                return
+            # Keep the order of the state changes of the entity
+            if coalesced_event := self._coalesced_events.pop(entity_id, None):
+                self.queue.put(coalesced_event)
         self.queue.put(event)
 
+    @callback
+    def _async_flush_coalesced_events(self):
+        """Queue the state changes held back for coalescing."""
+        for event in self._coalesced_events.values():
+            self.queue.put(event)
+        self._coalesced_events = {}
+
+    async def async_block_till_done(self):
+        """Wait until the events received so far are committed to the database.
+
+        Returns right away when the recorder is not processing its queue.
+        """
+        if not self.async_recorder_ready.is_set() or not self.is_alive():
+            return
+        if self._coalesced_events:
+            self._async_flush_coalesced_events()
+        event = asyncio.Event()
+        self.queue.put(SynchronizeTask(event))
+        await event.wait()
+
     def block_till_done(self):
         """Block till all events processed.
 
@@ -952,6 +1338,7 @@ class Recorder(threading.Thread):
         self.engine.dispose()
         self.engine = None
         self.get_session = None
+        self.statistics_meta_ids = {}
 
     def _setup_run(self):
         """Log the start of the current run."""
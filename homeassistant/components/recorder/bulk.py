@@ -0,0 +1,138 @@
+"""Bulk write helper for the recorder."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+from .models import Events, StateAttributes, States
+
+_LOGGER = logging.getLogger(__name__)
+
+# Dialects where explicitly assigned primary keys keep the
+# auto increment counter in sync. Sequence backed identity
+# columns (PostgreSQL, MSSQL, Oracle) would get out of sync.
+BULK_INSERT_DIALECTS = ("sqlite", "mysql")
+
+
+def bulk_insert_supported(dialect_name: str) -> bool:
+    """Return if the dialect supports the bulk insert path."""
+    return dialect_name in BULK_INSERT_DIALECTS
+
+
+class BulkWriter:
+    """Buffer events and states between commits and write them with executemany.
+
+    Primary keys are assigned in memory so states can be linked to their
+    event, shared attributes and previous state without a round trip to
+    the database. This is only safe when the recorder is the only writer.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk writer."""
+        self._events: list[dict[str, Any]] = []
+        self._state_attributes: list[dict[str, Any]] = []
+        self._states: list[dict[str, Any]] = []
+        self._next_event_id: int | None = None
+        self._next_state_id: int | None = None
+        self._next_attributes_id: int | None = None
+        self.old_state_ids: dict[str, int] = {}
+
+    @property
+    def pending(self) -> bool:
+        """Return if there are rows waiting to be written."""
+        return bool(self._events)
+
+    def reset(self) -> None:
+        """Drop the buffered rows and the assigned ids."""
+        self._events = []
+        self._state_attributes = []
+        self._states = []
+        self._next_event_id = None
+        self._next_state_id = None
+        self._next_attributes_id = None
+        self.old_state_ids = {}
+
+    def _reserve_ids(self, session: Session) -> None:
+        """Find the next free primary keys."""
+        self._next_event_id = (
+            session.query(func.max(Events.event_id)).scalar() or 0
+        ) + 1
+        self._next_state_id = (
+            session.query(func.max(States.state_id)).scalar() or 0
+        ) + 1
+        self._next_attributes_id = (
+            session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+        ) + 1
+
+    def add_event(self, session: Session, event: Event) -> int:
+        """Buffer an event row and return its event_id."""
+        if self._next_event_id is None:
+            self._reserve_ids(session)
+        assert self._next_event_id is not None
+        if event.event_type == EVENT_STATE_CHANGED:
+            row = Events.row_from_event(event, event_data="{}")
+        else:
+            row = Events.row_from_event(event)
+        row["event_id"] = event_id = self._next_event_id
+        row["created"] = event.time_fired
+        self._next_event_id += 1
+        self._events.append(row)
+        return event_id
+
+    def add_state_attributes(self, shared_attrs: str, attr_hash: int) -> int:
+        """Buffer a shared attributes row and return its attributes_id."""
+        assert self._next_attributes_id is not None
+        attributes_id = self._next_attributes_id
+        self._next_attributes_id += 1
+        self._state_attributes.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": attr_hash,
+                "shared_attrs": shared_attrs,
+            }
+        )
+        return attributes_id
+
+    def add_state(self, event: Event, event_id: int, attributes_id: int) -> None:
+        """Buffer a state row linked to its event and the previous state."""
+        assert self._next_state_id is not None
+        row = States.row_from_event(event)
+        entity_id = row["entity_id"]
+        row["state_id"] = state_id = self._next_state_id
+        row["event_id"] = event_id
+        row["attributes_id"] = attributes_id
+        row["created"] = event.time_fired
+        row["old_state_id"] = self.old_state_ids.pop(entity_id, None)
+        self._next_state_id += 1
+        if event.data.get("new_state"):
+            self.old_state_ids[entity_id] = state_id
+        else:
+            row["state"] = None
+        self._states.append(row)
+
+    def write(self, session: Session) -> None:
+        """Write the buffered rows in one executemany per table."""
+        if self._events:
+            session.execute(Events.__table__.insert(), self._events)
+        if self._state_attributes:
+            session.execute(StateAttributes.__table__.insert(), self._state_attributes)
+        if self._states:
+            session.execute(States.__table__.insert(), self._states)
+        _LOGGER.debug(
+            "Bulk inserted %s events, %s states and %s state attributes",
+            len(self._events),
+            len(self._states),
+            len(self._state_attributes),
+        )
+
+    def clear(self) -> None:
+        """Drop the buffered rows after they are committed."""
+        self._events = []
+        self._state_attributes = []
+        self._states = []
@@ -6,6 +6,12 @@ DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
+EVENT_RECORDER_PURGE_PROGRESS = "recorder_purge_progress"
+
+# The maximum number of seconds a purge task keeps the recorder thread
+# busy before it yields back to the event queue
+PURGE_TIME_SLICE = 1
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
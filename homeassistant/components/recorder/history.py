@@ -11,11 +11,15 @@ from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.models import (
+    EMPTY_JSON_OBJECT,
+    StateAttributes,
     States,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.core import split_entity_id
+from homeassistant.helpers.json import json_loads
 import homeassistant.util.dt as dt_util
 
 from .models import LazyState
@@ -27,6 +31,11 @@ _LOGGER = logging.getLogger(__name__)
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+COMPACT_STATES_KEY = "states"
+COMPACT_LAST_CHANGED_KEY = "last_changed"
+COMPACT_LAST_UPDATED_KEY = "last_updated"
+COMPACT_ATTRIBUTES_KEY = "attributes"
+
 SIGNIFICANT_DOMAINS = (
     "climate",
     "device_tracker",
@@ -48,12 +57,18 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Number of rows fetched from the database cursor at a time when streaming
+STREAM_YIELD_PER = 1000
+# Maximum number of states in each chunk when streaming
+STREAM_CHUNK_SIZE = 1000
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -86,8 +101,139 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
+    baked_query = _significant_states_baked_query(
+        hass, entity_ids, filters, end_time, significant_changes_only
+    )
+
+    states = execute(
+        baked_query(session).params(
+            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def stream_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield significant states during UTC period start_time - end_time.
+
+    This returns the same states as _get_significant_states, but iterates
+    the database cursor instead of loading the whole result. States are
+    yielded as (entity_id, states) chunks of at most STREAM_CHUNK_SIZE
+    states, grouped by entity_id as described in _group_by_entity_id.
+    Chunks of the same entity_id are consecutive.
+    """
+    baked_query = _significant_states_baked_query(
+        hass, entity_ids, filters, end_time, significant_changes_only
+    )
+    baked_query += lambda q: q.yield_per(STREAM_YIELD_PER)
+
+    start_time_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_time_states[state.entity_id] = state
+
+    rows = baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
+    )
+    for ent_id, start_time_state, group in _group_by_entity_id(rows, start_time_states):
+        yield from _chunk_states(
+            ent_id,
+            _entity_states(ent_id, start_time_state, group, minimal_response),
+        )
+
+
+def stream_compact_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield significant states in the compact format.
+
+    States are yielded as (entity_id, compact_states) tuples, one for every
+    entity in the order of _group_by_entity_id. See _compact_entity_states
+    for the format.
+    """
+    baked_query = _significant_states_baked_query(
+        hass, entity_ids, filters, end_time, significant_changes_only
+    )
+    baked_query += lambda q: q.yield_per(STREAM_YIELD_PER)
+
+    start_time_rows = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for row in _get_rows_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            start_time_rows[row.entity_id] = row
+
+    rows = baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
+    )
+    for ent_id, start_time_row, group in _group_by_entity_id(rows, start_time_rows):
+        yield ent_id, _compact_entity_states(
+            ent_id, start_time, start_time_row, group, minimal_response
+        )
+
+
+def _group_by_entity_id(rows, start_time_states):
+    """Group rows sorted by entity_id together with the state at the start time.
+
+    Yields (entity_id, start_time_state, rows) tuples in the order of the
+    rows, followed by the entities which only have a state at the start time
+    ordered by entity_id. The start time states are paired by entity_id, as
+    the database may sort entity_ids in another order than Python.
+    """
+    for ent_id, group in groupby(rows, lambda state: state.entity_id):
+        yield ent_id, start_time_states.pop(ent_id, None), group
+
+    # Entities which only have a state at the start time
+    for pending_id in sorted(start_time_states):
+        yield pending_id, start_time_states[pending_id], iter(())
+
+
+def _significant_states_baked_query(
+    hass, entity_ids, filters, end_time, significant_changes_only
+):
+    """Bake the query for significant states."""
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: session.query(*QUERY_STATES).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
     )
 
     if significant_changes_only:
@@ -115,33 +261,17 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
-    )
+    return baked_query
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: session.query(*QUERY_STATES).outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
         )
 
         baked_query += lambda q: q.filter(
@@ -155,7 +285,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -177,12 +309,17 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: session.query(*QUERY_STATES).outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
         )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -228,8 +365,20 @@ def _get_states_with_session(
     hass, session, utc_point_in_time, entity_ids=None, run=None, filters=None
 ):
     """Return the states at a specific point in time."""
+    return [
+        LazyState(row)
+        for row in _get_rows_with_session(
+            hass, session, utc_point_in_time, entity_ids, run, filters
+        )
+    ]
+
+
+def _get_rows_with_session(
+    hass, session, utc_point_in_time, entity_ids=None, run=None, filters=None
+):
+    """Return the database rows of the states at a specific point in time."""
     if entity_ids and len(entity_ids) == 1:
-        return _get_single_entity_states_with_session(
+        return _get_single_entity_rows_with_session(
             hass, session, utc_point_in_time, entity_ids[0]
         )
 
@@ -243,7 +392,9 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -285,14 +436,16 @@ def _get_states_with_session(
         if filters:
             query = filters.apply(query)
 
-    return [LazyState(row) for row in execute(query)]
+    return execute(query)
 
 
-def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
+def _get_single_entity_rows_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: session.query(*QUERY_STATES).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
     )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
@@ -305,7 +458,7 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
         utc_point_in_time=utc_point_in_time, entity_id=entity_id
     )
 
-    return [LazyState(row) for row in execute(query)]
+    return execute(query)
 
 
 def _sorted_states_to_dict(
@@ -350,51 +503,146 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
         ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
+        start_time_state = ent_results.pop() if ent_results else None
+        ent_results.extend(
+            _entity_states(ent_id, start_time_state, group, minimal_response)
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
 
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
+def _entity_states(ent_id, start_time_state, group, minimal_response):
+    """Yield the states of an entity, starting with its state at the start time."""
+    if start_time_state is not None:
+        yield start_time_state
 
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
         for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+            yield LazyState(db_state)
+        return
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if start_time_state is not None:
+        prev_state = start_time_state
+    else:
+        prev_state = next(group)
+        yield LazyState(prev_state)
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    # The last minimal state is held back, since it is
+    # replaced with a full state if it turns out to be the last
+    minimal_state = None
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        if minimal_state is not None:
+            yield minimal_state
+        minimal_state = {
+            STATE_KEY: db_state.state,
+            LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                db_state.last_changed
+            ),
+        }
+        prev_state = db_state
+
+    if minimal_state is not None:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        yield LazyState(prev_state)
+
+
+def _compact_entity_states(ent_id, start_time, start_time_row, rows, minimal_response):
+    """Return the states of an entity in the compact columnar format.
+
+    The states are returned as parallel lists. last_changed holds epoch
+    seconds as deltas from the previous last_changed, the first one being
+    absolute, and last_updated holds the offset from last_changed.
+    Attributes are only included for the states where they changed, as
+    [index, attributes] pairs.
+
+    With minimal response attributes are left out and repeated states
+    are filtered out, except for domains which need their attributes.
+    """
+    domain = split_entity_id(ent_id)[0]
+    with_attributes = not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS
+    states = []
+    last_changed = []
+    last_updated = []
+    attributes = []
+    prev_changed = 0.0
+    prev_state = prev_attributes = None
+
+    def _add(row, changed, updated):
+        nonlocal prev_changed, prev_state, prev_attributes
+        state = row.state or ""
+        if not with_attributes and state == prev_state:
+            return
+        delta = round(changed - prev_changed, 6)
+        prev_changed += delta
+        states.append(state)
+        last_changed.append(delta)
+        last_updated.append(round(updated - changed, 6))
+        prev_state = state
+
+        if not with_attributes:
+            return
+        shared_attrs = row.shared_attrs or row.attributes or EMPTY_JSON_OBJECT
+        if shared_attrs == prev_attributes:
+            return
+        try:
+            attributes.append([len(states) - 1, json_loads(shared_attrs)])
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to state: %s", row)
+            attributes.append([len(states) - 1, {}])
+        prev_attributes = shared_attrs
+
+    if start_time_row is not None:
+        start = start_time.timestamp()
+        _add(start_time_row, start, start)
+
+    for row in rows:
+        _add(
+            row,
+            process_timestamp(row.last_changed).timestamp(),
+            process_timestamp(row.last_updated).timestamp(),
+        )
+
+    compact = {
+        COMPACT_STATES_KEY: states,
+        COMPACT_LAST_CHANGED_KEY: last_changed,
+        COMPACT_LAST_UPDATED_KEY: last_updated,
+    }
+    if with_attributes:
+        compact[COMPACT_ATTRIBUTES_KEY] = attributes
+    return compact
+
+
+def _chunk_states(ent_id, states):
+    """Split the states of an entity in chunks of STREAM_CHUNK_SIZE states."""
+    chunk = []
+    for state in states:
+        chunk.append(state)
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield ent_id, chunk
+            chunk = []
+    if chunk:
+        yield ent_id, chunk
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
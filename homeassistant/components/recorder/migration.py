@@ -1,8 +1,9 @@
 """Schema migration helpers."""
+import json
 import logging
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, text
+from sqlalchemy import ForeignKeyConstraint, MetaData, Table, bindparam, text
 from sqlalchemy.exc import (
     InternalError,
     OperationalError,
@@ -15,14 +16,22 @@ from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
     SchemaChanges,
+    StateAttributes,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
+    event_entity_id,
 )
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# How many events are read at once when backfilling the entity_id column
+BACKFILL_BATCH_SIZE = 10000
+
 
 def raise_if_exception_missing_str(ex, match_substrs):
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -347,9 +356,8 @@ def _drop_foreign_key_constraints(connection, engine, table, columns):
             )
 
 
-def _apply_update(engine, session, new_version, old_version):
-    """Perform operations to bring schema up to date."""
-    connection = session.connection()
+def _apply_early_update(engine, session, connection, new_version, old_version):
+    """Perform the operations of the schema versions up to 13."""
     if new_version == 1:
         _create_index(connection, "events", "ix_events_time_fired")
     elif new_version == 2:
@@ -448,6 +456,13 @@ def _apply_update(engine, session, new_version, old_version):
                     "created DATETIME(6)",
                 ],
             )
+
+
+def _apply_update(engine, session, new_version, old_version):
+    """Perform operations to bring schema up to date."""
+    connection = session.connection()
+    if 1 <= new_version <= 13:
+        _apply_early_update(engine, session, connection, new_version, old_version)
     elif new_version == 14:
         _modify_columns(connection, engine, "events", ["event_type VARCHAR(64)"])
     elif new_version == 15:
@@ -475,10 +490,67 @@ def _apply_update(engine, session, new_version, old_version):
 
         StatisticsMeta.__table__.create(engine)
         Statistics.__table__.create(engine)
+    elif new_version == 19:
+        # Attributes are moved to a table shared between states with
+        # identical attributes, existing rows keep their inline attributes.
+        if not sqlalchemy.inspect(engine).has_table(StateAttributes.__tablename__):
+            StateAttributes.__table__.create(engine)
+        _add_columns(connection, "states", ["attributes_id INTEGER"])
+        _create_index(connection, "states", "ix_states_attributes_id")
+    elif new_version == 20:
+        # The rollup tiers are built going forward from the hourly statistics
+        for table in (StatisticsDaily.__table__, StatisticsMonthly.__table__):
+            if not sqlalchemy.inspect(engine).has_table(table.name):
+                table.create(engine)
+    elif new_version == 21:
+        # The entity_id is extracted from the event data of new events,
+        # and is extracted from the events recorded before here
+        _add_columns(connection, "events", ["entity_id VARCHAR(255)"])
+        _create_index(connection, "events", "ix_events_entity_id_time_fired")
+        _backfill_events_entity_id(connection)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _backfill_events_entity_id(connection):
+    """Set the entity_id of the events recorded before the column existed."""
+    _LOGGER.warning(
+        "Setting the entity_id of existing events. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    select_events = (
+        sqlalchemy.select(Events.event_id, Events.event_type, Events.event_data)
+        .where(Events.event_id > bindparam("last_event_id"))
+        # Any JSON formatting, the event data is parsed below
+        .where(Events.event_data.contains('"entity_id"'))
+        .order_by(Events.event_id)
+        .limit(BACKFILL_BATCH_SIZE)
+    )
+    update_events = (
+        sqlalchemy.update(Events.__table__)
+        .where(Events.__table__.c.event_id == bindparam("b_event_id"))
+        .values(entity_id=bindparam("b_entity_id"))
+    )
+    last_event_id = 0
+    while rows := connection.execute(
+        select_events, {"last_event_id": last_event_id}
+    ).fetchall():
+        last_event_id = rows[-1].event_id
+        updates = []
+        for row in rows:
+            try:
+                event_data = json.loads(row.event_data)
+            except ValueError:
+                continue
+            if isinstance(event_data, dict) and (
+                entity_id := event_entity_id(row.event_type, event_data)
+            ):
+                updates.append({"b_event_id": row.event_id, "b_entity_id": entity_id})
+        if updates:
+            connection.execute(update_events, updates)
+
+
 def _inspect_schema_version(engine, session):
     """Determine the schema version by inspecting the db structure.
 
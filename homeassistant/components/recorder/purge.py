@@ -1,16 +1,18 @@
 """Purge old data helper."""
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING, Callable
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States
-from .repack import repack_database
+from .models import Events, RecorderRuns, StateAttributes, States
+from .repack import repack_database, repack_worthwhile
 from .util import retryable_database_job, session_scope
 
 if TYPE_CHECKING:
@@ -19,13 +21,40 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class PurgeProgress:
+    """Rows deleted by a purge which is spread over several batches."""
+
+    started: float = field(default_factory=time.monotonic)
+    states: int = 0
+    events: int = 0
+
+    def as_event_data(self, done: bool) -> dict[str, Any]:
+        """Return the data of a purge progress event."""
+        elapsed = time.monotonic() - self.started
+        rows = self.states + self.events
+        return {
+            "states": self.states,
+            "events": self.events,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else 0,
+            "done": done,
+        }
+
+
 @retryable_database_job("purge")
 def purge_old_data(
-    instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool = False,
+    auto_repack: bool = False,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+    When auto_repack is set, the database is only repacked once the purge
+    is done if enough space was freed to make it worthwhile.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
@@ -37,9 +66,9 @@ def purge_old_data(
         event_ids = _select_event_ids_to_purge(session, purge_before)
         state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
         if state_ids:
-            _purge_state_ids(session, state_ids)
+            _purge_state_ids(instance, session, state_ids)
         if event_ids:
-            _purge_event_ids(session, event_ids)
+            _purge_event_ids(instance, session, event_ids)
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
@@ -48,7 +77,7 @@ def purge_old_data(
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
             return False
         _purge_old_recorder_runs(instance, session, purge_before)
-    if repack:
+    if repack or (auto_repack and repack_worthwhile(instance)):
         repack_database(instance)
     return True
 
@@ -81,8 +110,17 @@ def _select_state_ids_to_purge(
     return [state.state_id for state in states]
 
 
-def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
+def _purge_state_ids(
+    instance: Recorder, session: Session, state_ids: list[int]
+) -> None:
     """Disconnect states and delete by state id."""
+    attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id))
+        .filter(States.state_id.in_(state_ids))
+        .filter(States.attributes_id.isnot(None))
+        .all()
+    }
 
     # Update old_state_id to NULL before deleting to ensure
     # the delete does not fail due to a foreign key constraint
@@ -101,9 +139,40 @@ def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s states", deleted_rows)
+    if instance.purge_progress is not None:
+        instance.purge_progress.states += deleted_rows
+
+    if attributes_ids:
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
 
 
-def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
+def _purge_unused_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete shared attributes that are no longer referenced by any state."""
+    still_used_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id))
+        .filter(States.attributes_id.in_(attributes_ids))
+        .all()
+    }
+    unused_ids = attributes_ids - still_used_ids
+    if not unused_ids:
+        return
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(unused_ids))
+        .delete(synchronize_session=False)
+    )
+    instance._evict_purged_state_attributes_ids(  # pylint: disable=protected-access
+        unused_ids
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+
+def _purge_event_ids(
+    instance: Recorder, session: Session, event_ids: list[int]
+) -> None:
     """Delete by event id."""
     deleted_rows = (
         session.query(Events)
@@ -111,6 +180,8 @@ def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    if instance.purge_progress is not None:
+        instance.purge_progress.events += deleted_rows
 
 
 def _purge_old_recorder_runs(
@@ -138,7 +209,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if not instance.entity_filter(entity_id)
     ]
     if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(session, excluded_entity_ids)
+        _purge_filtered_states(instance, session, excluded_entity_ids)
         return False
 
     # Check if excluded event_types are in database
@@ -148,13 +219,15 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if event_type in instance.exclude_t
     ]
     if len(excluded_event_types) > 0:
-        _purge_filtered_events(session, excluded_event_types)
+        _purge_filtered_events(instance, session, excluded_event_types)
         return False
 
     return True
 
 
-def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) -> None:
+def _purge_filtered_states(
+    instance: Recorder, session: Session, excluded_entity_ids: list[str]
+) -> None:
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
@@ -170,11 +243,13 @@ def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) ->
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
-    _purge_state_ids(session, state_ids)
-    _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    _purge_state_ids(instance, session, state_ids)
+    _purge_event_ids(instance, session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
 
 
-def _purge_filtered_events(session: Session, excluded_event_types: list[str]) -> None:
+def _purge_filtered_events(
+    instance: Recorder, session: Session, excluded_event_types: list[str]
+) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
         session.query(Events.event_id)
@@ -190,8 +265,8 @@ def _purge_filtered_events(session: Session, excluded_event_types: list[str]) ->
         session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
     )
     state_ids: list[int] = [state.state_id for state in states]
-    _purge_state_ids(session, state_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_state_ids(instance, session, state_ids)
+    _purge_event_ids(instance, session, event_ids)
 
 
 @retryable_database_job("purge")
@@ -206,7 +281,7 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
         if len(selected_entity_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(session, selected_entity_ids)
+            _purge_filtered_states(instance, session, selected_entity_ids)
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
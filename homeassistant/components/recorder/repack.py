@@ -9,6 +9,32 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only repack automatically when at least this share of the database is free
+AUTO_REPACK_MIN_FREE_RATIO = 0.2
+
+
+def repack_worthwhile(instance: Recorder) -> bool:
+    """Return if enough space is free to make repacking worthwhile."""
+    if instance.engine.dialect.name == "sqlite":
+        free = instance.engine.execute("PRAGMA freelist_count").scalar()
+        total = instance.engine.execute("PRAGMA page_count").scalar()
+    elif instance.engine.dialect.name == "mysql":
+        free, total = instance.engine.execute(
+            "SELECT SUM(data_free), SUM(data_length + index_length + data_free) "
+            "FROM information_schema.tables WHERE table_schema = DATABASE() "
+            "AND table_name IN "
+            "('states', 'state_attributes', 'events', 'recorder_runs')"
+        ).first()
+    else:
+        # PostgreSQL autovacuum already makes the space of dead rows reusable
+        return False
+
+    if not total:
+        return False
+    ratio = float(free or 0) / float(total)
+    _LOGGER.debug("Free space ratio of the database is %.2f", ratio)
+    return ratio >= AUTO_REPACK_MIN_FREE_RATIO
+
 
 def repack_database(instance: Recorder) -> None:
     """Repack based on engine type."""
@@ -31,5 +57,7 @@ def repack_database(instance: Recorder) -> None:
     # Optimize mysql / mariadb tables to free up space on disk
     if instance.engine.dialect.name == "mysql":
         _LOGGER.debug("Optimizing SQL DB to free space")
-        instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+        instance.engine.execute(
+            "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+        )
         return
@@ -0,0 +1,110 @@
+"""Sensors exposing the health of the recorder queue."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.const import TIME_MILLISECONDS, TIME_SECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+from .const import DATA_INSTANCE
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass
+class RecorderRequiredKeysMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[Recorder], Any]
+
+
+@dataclass
+class RecorderSensorEntityDescription(
+    SensorEntityDescription, RecorderRequiredKeysMixin
+):
+    """Describes a recorder metric sensor entity."""
+
+
+SENSORS: tuple[RecorderSensorEntityDescription, ...] = (
+    RecorderSensorEntityDescription(
+        key="queue_depth",
+        name="Recorder Queue Depth",
+        icon="mdi:tray-full",
+        unit_of_measurement="events",
+        value_fn=lambda instance: instance.queue.qsize(),
+    ),
+    RecorderSensorEntityDescription(
+        key="commit_latency",
+        name="Recorder Commit Latency",
+        icon="mdi:timer-outline",
+        unit_of_measurement=TIME_MILLISECONDS,
+        value_fn=lambda instance: round(instance.commit_latency * 1000, 1),
+    ),
+    RecorderSensorEntityDescription(
+        key="rows_per_commit",
+        name="Recorder Rows Per Commit",
+        icon="mdi:table-row-plus-after",
+        unit_of_measurement="rows",
+        value_fn=lambda instance: instance.rows_per_commit,
+    ),
+    RecorderSensorEntityDescription(
+        key="oldest_event_age",
+        name="Recorder Oldest Event Age",
+        icon="mdi:clock-alert-outline",
+        unit_of_measurement=TIME_SECONDS,
+        value_fn=lambda instance: round(instance.oldest_pending_event_age, 1),
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the recorder metric sensors."""
+    if discovery_info is None:
+        return
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    async_add_entities(
+        [RecorderMetricSensor(instance, description) for description in SENSORS],
+        True,
+    )
+
+
+class RecorderMetricSensor(SensorEntity):
+    """A sensor reporting one recorder metric.
+
+    The states of these sensors are not recorded, as every update would
+    add to the load the sensors are there to measure.
+    """
+
+    entity_description: RecorderSensorEntityDescription
+
+    def __init__(
+        self, instance: Recorder, description: RecorderSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        self._instance = instance
+        self.entity_description = description
+
+    async def async_added_to_hass(self) -> None:
+        """Exclude the sensor from recording."""
+        self._instance.metrics_entity_ids.add(self.entity_id)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop excluding the sensor from recording."""
+        self._instance.metrics_entity_ids.discard(self.entity_id)
+
+    async def async_update(self) -> None:
+        """Read the metric from the recorder."""
+        self._attr_state = self.entity_description.value_fn(self._instance)
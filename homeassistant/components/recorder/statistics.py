@@ -7,7 +7,7 @@ from itertools import groupby
 import logging
 from typing import TYPE_CHECKING, Any, Callable
 
-from sqlalchemy import bindparam
+from sqlalchemy import and_, bindparam, func
 from sqlalchemy.ext import baked
 from sqlalchemy.orm.scoping import scoped_session
 
@@ -19,11 +19,15 @@ import homeassistant.util.pressure as pressure_util
 import homeassistant.util.temperature as temperature_util
 from homeassistant.util.unit_system import UnitSystem
 
-from .const import DOMAIN
+from .const import DATA_INSTANCE, DOMAIN
 from .models import (
     StatisticMetaData,
     Statistics,
+    StatisticsBase,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from .util import execute, retryable_database_job, session_scope
@@ -31,16 +35,38 @@ from .util import execute, retryable_database_job, session_scope
 if TYPE_CHECKING:
     from . import Recorder
 
-QUERY_STATISTICS = [
-    Statistics.metadata_id,
-    Statistics.start,
-    Statistics.mean,
-    Statistics.min,
-    Statistics.max,
-    Statistics.last_reset,
-    Statistics.state,
-    Statistics.sum,
-]
+
+def _statistics_columns(table: type[StatisticsBase]) -> list:
+    """Return the columns to query from a statistics table."""
+    return [
+        table.metadata_id,
+        table.start,
+        table.mean,
+        table.min,
+        table.max,
+        table.last_reset,
+        table.state,
+        table.sum,
+    ]
+
+
+QUERY_STATISTICS = _statistics_columns(Statistics)
+
+# Statistics are compiled per hour, each coarser tier is rolled up
+# from the tier before it. Ordered from the finest to the coarsest tier.
+STATISTICS_TIERS: dict[str, type[StatisticsBase]] = {
+    "hour": Statistics,
+    "day": StatisticsDaily,
+    "month": StatisticsMonthly,
+}
+
+# The rows of the current day and month are rebuilt from the tier before
+# them, so a tier must be kept for at least the longest period of the next
+# tier, including a daylight saving time transition.
+STATISTICS_MIN_KEEP_DAYS = {
+    "hour": 2,
+    "day": 32,
+}
 
 QUERY_STATISTIC_META = [
     StatisticsMeta.id,
@@ -74,15 +100,12 @@ def async_setup(hass: HomeAssistant) -> None:
     hass.data[STATISTICS_BAKERY] = baked.bakery()
     hass.data[STATISTICS_META_BAKERY] = baked.bakery()
 
+    @callback
     def entity_id_changed(event: Event) -> None:
         """Handle entity_id changed."""
-        old_entity_id = event.data["old_entity_id"]
-        entity_id = event.data["entity_id"]
-        with session_scope(hass=hass) as session:
-            session.query(StatisticsMeta).filter(
-                StatisticsMeta.statistic_id == old_entity_id
-                and StatisticsMeta.source == DOMAIN
-            ).update({StatisticsMeta.statistic_id: entity_id})
+        hass.data[DATA_INSTANCE].async_update_statistic_id(
+            event.data["old_entity_id"], event.data["entity_id"]
+        )
 
     @callback
     def entity_registry_changed_filter(event: Event) -> bool:
@@ -107,9 +130,29 @@ def get_start_time() -> datetime:
     return start
 
 
+def _tier_period(tier: str, time: datetime) -> tuple[datetime, datetime]:
+    """Return the UTC start and end of the period of a tier which time belongs to.
+
+    Days and months follow the configured time zone.
+    """
+    if tier == "hour":
+        start = time.replace(minute=0, second=0, microsecond=0)
+        return start, start + timedelta(hours=1)
+    date = dt_util.as_local(time).date()
+    if tier == "day":
+        start_date, end_date = date, date + timedelta(days=1)
+    else:
+        start_date = date.replace(day=1)
+        end_date = (start_date + timedelta(days=31)).replace(day=1)
+    return (
+        dt_util.as_utc(dt_util.start_of_local_day(start_date)),
+        dt_util.as_utc(dt_util.start_of_local_day(end_date)),
+    )
+
+
 def _get_metadata_ids(
     hass: HomeAssistant, session: scoped_session, statistic_ids: list[str]
-) -> list[str]:
+) -> dict[str, int]:
     """Resolve metadata_id for a list of statistic_ids."""
     baked_query = hass.data[STATISTICS_META_BAKERY](
         lambda session: session.query(*QUERY_STATISTIC_META)
@@ -119,26 +162,73 @@ def _get_metadata_ids(
     )
     result = execute(baked_query(session).params(statistic_ids=statistic_ids))
 
-    return [id for id, _, _ in result] if result else []
+    return {statistic_id: id for id, statistic_id, _ in result} if result else {}
 
 
-def _get_or_add_metadata_id(
+def _get_or_add_metadata_ids(
     hass: HomeAssistant,
     session: scoped_session,
-    statistic_id: str,
-    metadata: StatisticMetaData,
-) -> str:
-    """Get metadata_id for a statistic_id, add if it doesn't exist."""
-    metadata_id = _get_metadata_ids(hass, session, [statistic_id])
-    if not metadata_id:
-        unit = metadata["unit_of_measurement"]
-        has_mean = metadata["has_mean"]
-        has_sum = metadata["has_sum"]
-        session.add(
-            StatisticsMeta.from_meta(DOMAIN, statistic_id, unit, has_mean, has_sum)
+    metadata: dict[str, StatisticMetaData],
+    cached_ids: dict[str, int],
+) -> dict[str, int]:
+    """Get metadata_id for statistic_ids, add the ones which don't exist."""
+    metadata_ids = {
+        statistic_id: cached_ids[statistic_id]
+        for statistic_id in metadata
+        if statistic_id in cached_ids
+    }
+    if missing := [
+        statistic_id for statistic_id in metadata if statistic_id not in metadata_ids
+    ]:
+        metadata_ids.update(_get_metadata_ids(hass, session, missing))
+
+    new_metadata = {}
+    for statistic_id, meta in metadata.items():
+        if statistic_id in metadata_ids:
+            continue
+        unit = meta["unit_of_measurement"]
+        has_mean = meta["has_mean"]
+        has_sum = meta["has_sum"]
+        new_metadata[statistic_id] = StatisticsMeta.from_meta(
+            DOMAIN, statistic_id, unit, has_mean, has_sum
         )
-        metadata_id = _get_metadata_ids(hass, session, [statistic_id])
-    return metadata_id[0]
+    if new_metadata:
+        session.add_all(new_metadata.values())
+        session.flush()
+        for statistic_id, statistics_meta in new_metadata.items():
+            metadata_ids[statistic_id] = statistics_meta.id
+
+    return metadata_ids
+
+
+def process_state_changed(hass: HomeAssistant, event: Event) -> None:
+    """Feed a recorded state_changed event to platforms aggregating statistics.
+
+    Note: This is called from the recorder thread
+    """
+    for domain, platform in list(hass.data[DOMAIN].items()):
+        if not hasattr(platform, "record_state_changed"):
+            continue
+        try:
+            platform.record_state_changed(hass, event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error aggregating statistics for %s", domain)
+
+
+def update_statistic_id(
+    instance: Recorder, old_statistic_id: str, new_statistic_id: str
+) -> None:
+    """Rename a statistic and drop the cached metadata ids of both ids.
+
+    This runs on the recorder thread, which also fills the cache.
+    """
+    with session_scope(session=instance.get_session()) as session:  # type: ignore
+        session.query(StatisticsMeta).filter(
+            StatisticsMeta.statistic_id == old_statistic_id
+            and StatisticsMeta.source == DOMAIN
+        ).update({StatisticsMeta.statistic_id: new_statistic_id})
+    instance.statistics_meta_ids.pop(old_statistic_id, None)
+    instance.statistics_meta_ids.pop(new_statistic_id, None)
 
 
 @retryable_database_job("statistics")
@@ -156,17 +246,99 @@ def compile_statistics(instance: Recorder, start: datetime) -> bool:
             "Statistics for %s during %s-%s: %s", domain, start, end, platform_stats[-1]
         )
 
+    metadata = {
+        entity_id: stat["meta"]
+        for stats in platform_stats
+        for entity_id, stat in stats.items()
+    }
     with session_scope(session=instance.get_session()) as session:  # type: ignore
+        metadata_ids = _get_or_add_metadata_ids(
+            instance.hass, session, metadata, instance.statistics_meta_ids
+        )
         for stats in platform_stats:
             for entity_id, stat in stats.items():
-                metadata_id = _get_or_add_metadata_id(
-                    instance.hass, session, entity_id, stat["meta"]
+                session.add(
+                    Statistics.from_stats(metadata_ids[entity_id], start, stat["stat"])
                 )
-                session.add(Statistics.from_stats(metadata_id, start, stat["stat"]))
+        _compile_rollups(session, start)
+        _purge_expired_statistics(session, end, instance.statistics_keep_days)
+
+    # Only cache the metadata_ids once they are committed
+    instance.statistics_meta_ids.update(metadata_ids)
 
     return True
 
 
+def _compile_rollups(session: scoped_session, start: datetime) -> None:
+    """Update the rows of the coarser tiers covering the hour starting at start.
+
+    The rows of the current day and month are rebuilt every hour, so the
+    rollups are always up to date with the hourly statistics.
+    """
+    tiers = list(STATISTICS_TIERS.items())
+    for (source_tier, source), (tier, target) in zip(tiers, tiers[1:]):
+        period_start, period_end = _tier_period(tier, start)
+        rows = (
+            session.query(*_statistics_columns(source))
+            .filter(source.start >= period_start)
+            .filter(source.start < period_end)
+            .order_by(source.metadata_id, source.start)
+            .all()
+        )
+        session.query(target).filter(target.start == period_start).delete(
+            synchronize_session=False
+        )
+        for metadata_id, group in groupby(rows, lambda row: row.metadata_id):
+            session.add(
+                target.from_stats(
+                    metadata_id, period_start, _rollup(source_tier, list(group))
+                )
+            )
+
+
+def _rollup(tier: str, rows: list) -> dict[str, Any]:
+    """Roll up statistics rows of a tier, ordered by start, into a single row.
+
+    The mean is weighted by the duration of the period of each row, as local
+    days last 23 to 25 hours and months 28 to 31 days.
+    """
+    weighted_means = []
+    for row in rows:
+        if row.mean is None:
+            continue
+        start, end = _tier_period(tier, process_timestamp(row.start))
+        weighted_means.append((row.mean, (end - start).total_seconds()))
+    mean: float | None = None
+    if weighted_means:
+        mean = sum(row_mean * duration for row_mean, duration in weighted_means)
+        mean /= sum(duration for _, duration in weighted_means)
+    mins = [row.min for row in rows if row.min is not None]
+    maxes = [row.max for row in rows if row.max is not None]
+    last = rows[-1]
+    return {
+        "mean": mean,
+        "min": min(mins) if mins else None,
+        "max": max(maxes) if maxes else None,
+        "last_reset": last.last_reset,
+        "state": last.state,
+        "sum": last.sum,
+    }
+
+
+def _purge_expired_statistics(
+    session: scoped_session, now: datetime, keep_days: dict[str, int]
+) -> None:
+    """Delete the statistics of tiers which are older than their retention."""
+    for tier, days in keep_days.items():
+        table = STATISTICS_TIERS[tier]
+        deleted_rows = (
+            session.query(table)
+            .filter(table.start < now - timedelta(days=days))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s expired %s statistics", deleted_rows, tier)
+
+
 def _get_metadata(
     hass: HomeAssistant,
     session: scoped_session,
@@ -257,31 +429,41 @@ def statistics_during_period(
     start_time: datetime,
     end_time: datetime | None = None,
     statistic_ids: list[str] | None = None,
+    period: str = "hour",
 ) -> dict[str, list[dict[str, str]]]:
-    """Return states changes during UTC period start_time - end_time."""
+    """Return statistics during UTC period start_time - end_time.
+
+    Period is the resolution of the statistics, one of the keys of
+    STATISTICS_TIERS; the rows are read from the tier of that resolution.
+    """
+    table = STATISTICS_TIERS[period]
+    if period != "hour":
+        # Include the row of the day or month start_time falls in
+        start_time = _tier_period(period, start_time)[0]
     metadata = None
     with session_scope(hass=hass) as session:
         metadata = _get_metadata(hass, session, statistic_ids, None)
         if not metadata:
             return {}
 
+        # The table is part of the cache key as the steps below refer to it
         baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
+            lambda session: session.query(*_statistics_columns(table)), table
         )
 
-        baked_query += lambda q: q.filter(Statistics.start >= bindparam("start_time"))
+        baked_query += lambda q: q.filter(table.start >= bindparam("start_time"))
 
         if end_time is not None:
-            baked_query += lambda q: q.filter(Statistics.start < bindparam("end_time"))
+            baked_query += lambda q: q.filter(table.start < bindparam("end_time"))
 
         metadata_ids = None
         if statistic_ids is not None:
             baked_query += lambda q: q.filter(
-                Statistics.metadata_id.in_(bindparam("metadata_ids"))
+                table.metadata_id.in_(bindparam("metadata_ids"))
             )
             metadata_ids = list(metadata.keys())
 
-        baked_query += lambda q: q.order_by(Statistics.metadata_id, Statistics.start)
+        baked_query += lambda q: q.order_by(table.metadata_id, table.start)
 
         stats = execute(
             baked_query(session).params(
@@ -327,6 +509,45 @@ def get_last_statistics(
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
 
 
+def get_latest_statistics(
+    hass: HomeAssistant, statistic_ids: list[str]
+) -> dict[str, list[dict]]:
+    """Return the latest statistics for a list of statistic_ids."""
+    with session_scope(hass=hass) as session:
+        metadata = _get_metadata(hass, session, statistic_ids, None)
+        if not metadata:
+            return {}
+
+        # Find the start of the latest row for each statistic_id, then join
+        # the rows back in a single query
+        most_recent_statistic_ids = (
+            session.query(
+                Statistics.metadata_id,
+                func.max(Statistics.start).label("max_start"),
+            )
+            .filter(Statistics.metadata_id.in_(list(metadata.keys())))
+            .group_by(Statistics.metadata_id)
+            .subquery()
+        )
+        query = (
+            session.query(*QUERY_STATISTICS)
+            .join(
+                most_recent_statistic_ids,
+                and_(
+                    Statistics.metadata_id == most_recent_statistic_ids.c.metadata_id,
+                    Statistics.start == most_recent_statistic_ids.c.max_start,
+                ),
+            )
+            .order_by(Statistics.metadata_id)
+        )
+
+        stats = execute(query)
+        if not stats:
+            return {}
+
+        return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
+
+
 def _sorted_statistics_to_dict(
     hass: HomeAssistant,
     stats: list,
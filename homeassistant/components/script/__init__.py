@@ -32,6 +32,12 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import make_entity_service_schema
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import (
+    REFERENCE_AREA,
+    REFERENCE_DEVICE,
+    REFERENCE_ENTITY,
+    ReferenceIndex,
+)
 from homeassistant.helpers.script import (
     ATTR_CUR,
     ATTR_MAX,
@@ -50,6 +56,7 @@ from .const import (
     ATTR_VARIABLES,
     CONF_FIELDS,
     CONF_TRACE,
+    DATA_REFERENCE_INDEX,
     DOMAIN,
     ENTITY_ID_FORMAT,
     EVENT_SCRIPT_STARTED,
@@ -74,16 +81,11 @@ def is_on(hass, entity_id):
 @callback
 def scripts_with_entity(hass: HomeAssistant, entity_id: str) -> list[str]:
     """Return all scripts that reference the entity."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if entity_id in script_entity.script.referenced_entities
-    ]
+    return index.async_referrers(REFERENCE_ENTITY, entity_id)
 
 
 @callback
@@ -105,16 +107,11 @@ def entities_in_script(hass: HomeAssistant, entity_id: str) -> list[str]:
 @callback
 def scripts_with_device(hass: HomeAssistant, device_id: str) -> list[str]:
     """Return all scripts that reference the device."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if device_id in script_entity.script.referenced_devices
-    ]
+    return index.async_referrers(REFERENCE_DEVICE, device_id)
 
 
 @callback
@@ -136,16 +133,11 @@ def devices_in_script(hass: HomeAssistant, entity_id: str) -> list[str]:
 @callback
 def scripts_with_area(hass: HomeAssistant, area_id: str) -> list[str]:
     """Return all scripts that reference the area."""
-    if DOMAIN not in hass.data:
+    index: ReferenceIndex | None = hass.data.get(DATA_REFERENCE_INDEX)
+    if index is None:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if area_id in script_entity.script.referenced_areas
-    ]
+    return index.async_referrers(REFERENCE_AREA, area_id)
 
 
 @callback
@@ -166,6 +158,7 @@ def areas_in_script(hass: HomeAssistant, entity_id: str) -> list[str]:
 
 async def async_setup(hass, config):
     """Load the scripts from the configuration."""
+    hass.data[DATA_REFERENCE_INDEX] = ReferenceIndex()
     hass.data[DOMAIN] = component = EntityComponent(LOGGER, DOMAIN, hass)
 
     # To register scripts as valid domain for Blueprint
@@ -176,7 +169,7 @@ async def async_setup(hass, config):
 
     async def reload_service(service):
         """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -229,10 +222,14 @@ async def async_setup(hass, config):
 async def _async_process_config(hass, config, component) -> bool:
     """Process script configuration.
 
+    Scripts of the component whose configuration did not change are kept
+    running, all others are removed and replaced by new ones.
+
     Return true, if Blueprints were used.
     """
     entities = []
     blueprints_used = False
+    kept: set[str] = set()
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf: dict[str, dict[str, Any] | BlueprintInputs] = config[config_key]
@@ -263,12 +260,26 @@ async def _async_process_config(hass, config, component) -> bool:
             else:
                 raw_config = cast(ScriptConfig, config_block).raw_config
 
+            existing = component.get_entity(ENTITY_ID_FORMAT.format(object_id))
+            if (
+                existing is not None
+                and raw_config is not None
+                and existing.raw_config == raw_config
+                and existing.raw_blueprint_inputs == raw_blueprint_inputs
+            ):
+                kept.add(existing.entity_id)
+                continue
+
             entities.append(
                 ScriptEntity(
                     hass, object_id, config_block, raw_config, raw_blueprint_inputs
                 )
             )
 
+    for script_entity in list(component.entities):
+        if script_entity.entity_id not in kept:
+            await component.async_remove_entity(script_entity.entity_id)
+
     await component.async_add_entities(entities)
 
     async def service_handler(service):
@@ -337,6 +348,16 @@ class ScriptEntity(ToggleEntity):
         """Return the name of the entity."""
         return self.script.name
 
+    @property
+    def raw_config(self):
+        """Return the configuration the script was created from."""
+        return self._raw_config
+
+    @property
+    def raw_blueprint_inputs(self):
+        """Return the blueprint inputs the script was created from."""
+        return self._blueprint_inputs
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -415,8 +436,18 @@ class ScriptEntity(ToggleEntity):
         """
         await self.script.async_stop()
 
+    async def async_added_to_hass(self):
+        """Index the items referenced by the script."""
+        self.hass.data[DATA_REFERENCE_INDEX].async_add(
+            self.entity_id,
+            areas=self.script.referenced_areas,
+            devices=self.script.referenced_devices,
+            entities=self.script.referenced_entities,
+        )
+
     async def async_will_remove_from_hass(self):
         """Stop script and remove service when it will be removed from Home Assistant."""
+        self.hass.data[DATA_REFERENCE_INDEX].async_remove(self.entity_id)
         await self.script.async_stop()
 
         # remove service
@@ -3,6 +3,8 @@ import logging
 
 DOMAIN = "script"
 
+DATA_REFERENCE_INDEX = "script_reference_index"
+
 ATTR_LAST_ACTION = "last_action"
 ATTR_LAST_TRIGGERED = "last_triggered"
 ATTR_VARIABLES = "variables"
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import datetime
-import itertools
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from homeassistant.components.recorder import history, statistics
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
 from homeassistant.components.sensor import (
     ATTR_STATE_CLASS,
     DEVICE_CLASS_BATTERY,
@@ -36,12 +37,12 @@ from homeassistant.const import (
     TEMP_FAHRENHEIT,
     TEMP_KELVIN,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import Event, HomeAssistant, State
 import homeassistant.util.dt as dt_util
 import homeassistant.util.pressure as pressure_util
 import homeassistant.util.temperature as temperature_util
 
-from . import ATTR_LAST_RESET, DOMAIN
+from . import ATTR_LAST_RESET, DOMAIN, ENTITY_ID_FORMAT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -94,27 +95,50 @@ UNIT_CONVERSIONS: dict[str, dict[str, Callable]] = {
     },
 }
 
+ENTITY_ID_PREFIX = ENTITY_ID_FORMAT.format("")
+
 # Keep track of entities for which a warning about unsupported unit has been logged
 WARN_UNSUPPORTED_UNIT = set()
 
 
+# The statistics period the aggregator folds states into
+STATISTICS_PERIOD = datetime.timedelta(hours=1)
+# Number of uncompiled periods the aggregator keeps for each entity
+MAX_PENDING_PERIODS = 3
+
+DATA_STATISTICS_AGGREGATOR = "sensor_statistics_aggregator"
+
+# Marks a state which has no last_reset attribute
+_NO_LAST_RESET = object()
+
+
+def _statistics_keys(state: State) -> list[str]:
+    """Get the device class or unit statistics should be compiled for."""
+    if state.attributes.get(ATTR_STATE_CLASS) != STATE_CLASS_MEASUREMENT:
+        return []
+
+    keys = []
+
+    if (
+        key := state.attributes.get(ATTR_DEVICE_CLASS)
+    ) in DEVICE_CLASS_OR_UNIT_STATISTICS:
+        keys.append(key)
+
+    if (
+        key := state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    ) in DEVICE_CLASS_OR_UNIT_STATISTICS:
+        keys.append(key)
+
+    return keys
+
+
 def _get_entities(hass: HomeAssistant) -> list[tuple[str, str]]:
     """Get (entity_id, device_class) of all sensors for which to compile statistics."""
     all_sensors = hass.states.all(DOMAIN)
     entity_ids = []
 
     for state in all_sensors:
-        if state.attributes.get(ATTR_STATE_CLASS) != STATE_CLASS_MEASUREMENT:
-            continue
-
-        if (
-            key := state.attributes.get(ATTR_DEVICE_CLASS)
-        ) in DEVICE_CLASS_OR_UNIT_STATISTICS:
-            entity_ids.append((state.entity_id, key))
-
-        if (
-            key := state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        ) in DEVICE_CLASS_OR_UNIT_STATISTICS:
+        for key in _statistics_keys(state):
             entity_ids.append((state.entity_id, key))
 
     return entity_ids
@@ -127,78 +151,255 @@ def _is_number(s: str) -> bool:  # pylint: disable=invalid-name
     return s.replace(".", "", 1).isdigit()
 
 
-def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
-) -> float:
-    """Calculate a time weighted average.
+def _normalize_state(
+    state: State, key: str, entity_id: str
+) -> tuple[str | None, float, Any] | None:
+    """Normalize the unit of a state.
 
-    The average is calculated by, weighting the states by duration in seconds between
-    state changes.
-    Note: there's no interpolation of values between state changes.
+    Returns a (unit, value, last_reset) tuple, or None if the state should be
+    excluded from statistics.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
+    # Exclude non numerical states from statistics
+    if not _is_number(state.state):
+        return None
 
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = start if state.last_updated < start else state.last_updated
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
+    fstate = float(state.state)
+    unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    last_reset = state.attributes.get(ATTR_LAST_RESET, _NO_LAST_RESET)
 
-        old_fstate = fstate
-        old_start_time = start_time
+    if key not in UNIT_CONVERSIONS:
+        # We're not normalizing this device class, return the state as it is
+        return unit, fstate, last_reset
 
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
+    # Exclude unsupported units from statistics
+    if unit not in UNIT_CONVERSIONS[key]:
+        if entity_id not in WARN_UNSUPPORTED_UNIT:
+            WARN_UNSUPPORTED_UNIT.add(entity_id)
+            _LOGGER.warning("%s has unknown unit %s", entity_id, unit)
+        return None
 
-    return accumulated / (end - start).total_seconds()
+    return DEVICE_CLASS_UNITS[key], UNIT_CONVERSIONS[key][unit](fstate), last_reset
 
 
-def _normalize_states(
-    entity_history: list[State], key: str, entity_id: str
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
-    unit = None
+class _PeriodAccumulator:
+    """Fold the normalized states of a sensor during one statistics period.
 
-    if key not in UNIT_CONVERSIONS:
-        # We're not normalizing this device class, return the state as they are
-        fstates = [
-            (float(el.state), el) for el in entity_history if _is_number(el.state)
-        ]
-        if fstates:
-            unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return unit, fstates
+    Note: there's no interpolation of values between state changes.
+    """
+
+    __slots__ = (
+        "start",
+        "carry",
+        "unit",
+        "min",
+        "max",
+        "first_time",
+        "last_time",
+        "last_value",
+        "weighted",
+        "sum_segments",
+    )
+
+    def __init__(
+        self,
+        start: datetime.datetime,
+        carry: tuple[str | None, float, Any] | None = None,
+    ) -> None:
+        """Initialize the accumulator with the state known when the period starts."""
+        self.start = start
+        self.carry = carry
+        self.unit: str | None = None
+        self.min = 0.0
+        self.max = 0.0
+        self.first_time = start
+        self.last_time = start
+        self.last_value: float | None = None
+        self.weighted = 0.0
+        # Runs of states with the same last_reset as [last_reset, first, last]
+        self.sum_segments: list[list] = []
+        if carry is not None:
+            self.add(carry, start)
+
+    def add(
+        self, sample: tuple[str | None, float, Any], time: datetime.datetime
+    ) -> None:
+        """Fold a normalized state into the accumulator."""
+        unit, value, last_reset = sample
+        if self.last_value is None:
+            # Adjust start time, if there was no last known state
+            self.unit = unit
+            self.first_time = time
+            self.min = self.max = value
+        else:
+            # Accumulate the value, weighted by duration until next state change
+            duration = time - self.last_time
+            self.weighted += self.last_value * duration.total_seconds()
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        self.last_value = value
+        self.last_time = time
+
+        if last_reset is _NO_LAST_RESET:
+            return
+        if self.sum_segments and self.sum_segments[-1][0] == last_reset:
+            self.sum_segments[-1][2] = value
+        else:
+            self.sum_segments.append([last_reset, value, value])
+
+    def time_weighted_average(self, end: datetime.datetime) -> float:
+        """Calculate the time weighted average until end of the period."""
+        assert self.last_value is not None
+        # Accumulate the value, weighted by duration until end of the period
+        duration = end - self.last_time
+        accumulated = self.weighted + self.last_value * duration.total_seconds()
+        return accumulated / (end - self.first_time).total_seconds()
 
-    fstates = []
 
+def _accumulate_history(
+    entity_history: list[State], key: str, entity_id: str, start: datetime.datetime
+) -> _PeriodAccumulator:
+    """Fold states read back from the database."""
+    accumulator = _PeriodAccumulator(start)
     for state in entity_history:
-        # Exclude non numerical states from statistics
-        if not _is_number(state.state):
+        if (sample := _normalize_state(state, key, entity_id)) is None:
             continue
+        # The recorder will give us the last known state, which may be well
+        # before the requested start time for the statistics
+        accumulator.add(sample, max(state.last_updated, start))
+    return accumulator
 
-        fstate = float(state.state)
-        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        # Exclude unsupported units from statistics
-        if unit not in UNIT_CONVERSIONS[key]:
-            if entity_id not in WARN_UNSUPPORTED_UNIT:
-                WARN_UNSUPPORTED_UNIT.add(entity_id)
-                _LOGGER.warning("%s has unknown unit %s", entity_id, unit)
-            continue
 
-        fstates.append((UNIT_CONVERSIONS[key][unit](fstate), state))
+class StatisticsAggregator:
+    """Fold recorded sensor states into per period accumulators.
+
+    Statistics for a period can be compiled from the accumulators instead of
+    reading the states back from the database, as long as every state change
+    since the start of the period has been observed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the aggregator with the current states."""
+        self.period = STATISTICS_PERIOD
+        self.valid_from = dt_util.utcnow()
+        self._latest: dict[tuple[str, str], tuple[str | None, float, Any] | None] = {}
+        self._pending: dict[tuple[str, str], list[_PeriodAccumulator]] = {}
+        self._last_sums: dict[str, tuple[datetime.datetime, tuple]] = {}
+
+        entity_filter = hass.data[DATA_INSTANCE].entity_filter
+        for state in hass.states.all(DOMAIN):
+            if not entity_filter(state.entity_id):
+                continue
+            for key in _statistics_keys(state):
+                self._latest[(state.entity_id, key)] = _normalize_state(
+                    state, key, state.entity_id
+                )
+
+    def _period_start(self, time: datetime.datetime) -> datetime.datetime:
+        """Return the start of the period time belongs to."""
+        period = self.period.total_seconds()
+        return dt_util.utc_from_timestamp(time.timestamp() // period * period)
+
+    def _invalidate_until(self, time: datetime.datetime) -> None:
+        """Stop using the accumulators for periods starting before time."""
+        self.valid_from = max(self.valid_from, time)
+
+    def add_state_changed(self, event: Event) -> None:
+        """Fold a state_changed event into the accumulators."""
+        if (new_state := event.data.get("new_state")) is None:
+            return
+
+        entity_id = new_state.entity_id
+        old_state = event.data.get("old_state")
+        time = new_state.last_updated
+        period_start = self._period_start(time)
+        # Attribute only changes are not significant for the history
+        significant = new_state.last_changed == time
+
+        for key in _statistics_keys(new_state):
+            sample = _normalize_state(new_state, key, entity_id)
+            entity_key = (entity_id, key)
+            accumulators = self._pending.setdefault(entity_key, [])
+            if accumulators and accumulators[-1].start == period_start:
+                accumulator = accumulators[-1]
+            elif accumulators and accumulators[-1].start > period_start:
+                # A state change from an earlier period can't be folded in
+                self._invalidate_until(accumulators[-1].start + self.period)
+                continue
+            else:
+                carry = None
+                if old_state is not None:
+                    carry = _normalize_state(old_state, key, entity_id)
+                accumulator = _PeriodAccumulator(period_start, carry)
+                accumulators.append(accumulator)
+                if len(accumulators) > MAX_PENDING_PERIODS:
+                    dropped = accumulators.pop(0)
+                    self._invalidate_until(dropped.start + self.period)
+
+            if significant and sample is not None:
+                accumulator.add(sample, time)
+            self._latest[entity_key] = sample
+
+    def period_accumulators(
+        self,
+        entities: list[tuple[str, str]],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict[tuple[str, str], _PeriodAccumulator]:
+        """Return the accumulators for the entities fully observed during start-end."""
+        if (
+            start < self.valid_from
+            or end - start != self.period
+            or self._period_start(start) != start
+        ):
+            return {}
+
+        result = {}
+        for entity_key in entities:
+            accumulators = self._pending.get(entity_key)
+            if accumulators:
+                # Forget periods which have already been compiled
+                while accumulators and accumulators[0].start < start:
+                    accumulators.pop(0)
+                    self._invalidate_until(start)
+            if accumulators and accumulators[0].start == start:
+                result[entity_key] = accumulators[0]
+            elif accumulators:
+                # No state changes during the period
+                result[entity_key] = _PeriodAccumulator(start, accumulators[0].carry)
+            elif entity_key in self._latest:
+                result[entity_key] = _PeriodAccumulator(start, self._latest[entity_key])
+
+        return result
+
+    def last_sum(self, entity_id: str, start: datetime.datetime) -> tuple | None:
+        """Return (last_reset, state, sum) compiled for the period ending at start."""
+        if (last_sum := self._last_sums.get(entity_id)) and last_sum[0] == start:
+            return last_sum[1]
+        return None
+
+    def set_last_sum(
+        self,
+        entity_id: str,
+        end: datetime.datetime,
+        last_reset: str | None,
+        state: float,
+        _sum: float,
+    ) -> None:
+        """Remember the sum compiled for the period ending at end."""
+        self._last_sums[entity_id] = (end, (last_reset, state, _sum))
+
+
+def record_state_changed(hass: HomeAssistant, event: Event) -> None:
+    """Fold a recorded state change into the statistics aggregator.
+
+    Note: This is called from the recorder thread
+    """
+    if not event.data["entity_id"].startswith(ENTITY_ID_PREFIX):
+        return
 
-    return DEVICE_CLASS_UNITS[key], fstates
+    if (aggregator := hass.data.get(DATA_STATISTICS_AGGREGATOR)) is None:
+        aggregator = hass.data[DATA_STATISTICS_AGGREGATOR] = StatisticsAggregator(hass)
+    aggregator.add_state_changed(event)
 
 
 def compile_statistics(
@@ -212,28 +413,56 @@ def compile_statistics(
 
     entities = _get_entities(hass)
 
-    # Get history between start and end
-    history_list = history.get_significant_states(  # type: ignore
-        hass, start - datetime.timedelta.resolution, end, [i[0] for i in entities]
-    )
+    aggregator: StatisticsAggregator | None = hass.data.get(DATA_STATISTICS_AGGREGATOR)
+    accumulators = {}
+    if aggregator is not None:
+        accumulators = aggregator.period_accumulators(entities, start, end)
+
+    # Get history between start and end for entities which were not aggregated
+    if missing := [
+        entity_id for entity_id, key in entities if (entity_id, key) not in accumulators
+    ]:
+        history_list = history.get_significant_states(  # type: ignore
+            hass, start - datetime.timedelta.resolution, end, missing
+        )
+        for entity_id, key in entities:
+            if (entity_id, key) in accumulators or entity_id not in history_list:
+                continue
+            accumulators[(entity_id, key)] = _accumulate_history(
+                history_list[entity_id], key, entity_id, start
+            )
 
+    # Get the last compiled statistics for all sum sensors in one go
+    last_sums = {}
+    need_last_stats = []
     for entity_id, key in entities:
-        wanted_statistics = DEVICE_CLASS_OR_UNIT_STATISTICS[key]
-
-        if entity_id not in history_list:
+        if (
+            "sum" not in DEVICE_CLASS_OR_UNIT_STATISTICS[key]
+            or (entity_id, key) not in accumulators
+        ):
             continue
+        if aggregator is not None and (
+            last_sum := aggregator.last_sum(entity_id, start)
+        ):
+            last_sums[entity_id] = last_sum
+        else:
+            need_last_stats.append(entity_id)
+    last_stats = {}
+    if need_last_stats:
+        last_stats = statistics.get_latest_statistics(hass, need_last_stats)
 
-        entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(entity_history, key, entity_id)
+    for entity_id, key in entities:
+        wanted_statistics = DEVICE_CLASS_OR_UNIT_STATISTICS[key]
 
-        if not fstates:
+        accumulator = accumulators.get((entity_id, key))
+        if accumulator is None or accumulator.last_value is None:
             continue
 
         result[entity_id] = {}
 
         # Set meta data
         result[entity_id]["meta"] = {
-            "unit_of_measurement": unit,
+            "unit_of_measurement": accumulator.unit,
             "has_mean": "mean" in wanted_statistics,
             "has_sum": "sum" in wanted_statistics,
         }
@@ -241,38 +470,36 @@ def compile_statistics(
         # Make calculations
         stat: dict = {}
         if "max" in wanted_statistics:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))
+            stat["max"] = accumulator.max
         if "min" in wanted_statistics:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))
+            stat["min"] = accumulator.min
 
         if "mean" in wanted_statistics:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            stat["mean"] = accumulator.time_weighted_average(end)
 
         if "sum" in wanted_statistics:
             last_reset = old_last_reset = None
             new_state = old_state = None
             _sum = 0
-            last_stats = statistics.get_last_statistics(hass, 1, entity_id)
-            if entity_id in last_stats:
+            if entity_id in last_sums:
+                last_reset, new_state, _sum = last_sums[entity_id]
+                old_last_reset = last_reset
+                old_state = new_state
+            elif entity_id in last_stats:
                 # We have compiled history for this sensor before, use that as a starting point
                 last_reset = old_last_reset = last_stats[entity_id][0]["last_reset"]
                 new_state = old_state = last_stats[entity_id][0]["state"]
                 _sum = last_stats[entity_id][0]["sum"]
 
-            for fstate, state in fstates:
-
-                if "last_reset" not in state.attributes:
-                    continue
-                if (last_reset := state.attributes["last_reset"]) != old_last_reset:
+            for last_reset, first, last in accumulator.sum_segments:
+                if last_reset != old_last_reset:
                     # The sensor has been reset, update the sum
                     if old_state is not None:
                         _sum += new_state - old_state
                     # ..and update the starting point
-                    new_state = fstate
+                    old_state = first
                     old_last_reset = last_reset
-                    old_state = new_state
-                else:
-                    new_state = fstate
+                new_state = last
 
             if last_reset is None or new_state is None or old_state is None:
                 # No valid updates
@@ -284,6 +511,14 @@ def compile_statistics(
             stat["last_reset"] = dt_util.parse_datetime(last_reset)
             stat["sum"] = _sum
             stat["state"] = new_state
+            if aggregator is not None:
+                aggregator.set_last_sum(
+                    entity_id,
+                    end,
+                    process_timestamp_to_utc_isoformat(stat["last_reset"]),
+                    new_state,
+                    _sum,
+                )
 
         result[entity_id]["stat"] = stat
 
@@ -237,8 +237,9 @@ class TemplateEntity(Entity):
             for attribute in attributes:
                 attribute.async_setup()
 
+        # Only the final state matters, render once per burst of state changes
         result_info = async_track_template_result(
-            self.hass, template_var_tups, self._handle_results
+            self.hass, template_var_tups, self._handle_results, coalesce_window=0
         )
         self.async_on_remove(result_info.async_remove)
         self._async_update = result_info.async_refresh
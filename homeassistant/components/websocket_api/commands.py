@@ -27,6 +27,7 @@ from homeassistant.helpers.event import (
     async_track_template_result,
 )
 from homeassistant.helpers.json import ExtendedJSONEncoder
+from homeassistant.helpers.polling import async_get_polling_scheduler
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
@@ -51,6 +52,9 @@ def async_register_commands(
     async_reg(hass, handle_integration_setup_info)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_polling_slowest)
+    async_reg(hass, handle_job_metrics)
+    async_reg(hass, handle_executor_pools)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
@@ -238,7 +242,7 @@ def handle_get_states(
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -305,6 +309,62 @@ async def handle_integration_setup_info(
     )
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "polling/slowest",
+        vol.Optional("limit", default=10): cv.positive_int,
+    }
+)
+@decorators.require_admin
+def handle_polling_slowest(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle listing the entities with the slowest polled updates."""
+    scheduler = async_get_polling_scheduler(hass)
+    connection.send_result(
+        msg["id"],
+        [stats.as_dict() for stats in scheduler.async_slowest_pollers(msg["limit"])],
+    )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "job_metrics",
+        vol.Optional("enabled"): bool,
+        vol.Optional("limit", default=20): cv.positive_int,
+    }
+)
+@decorators.require_admin
+def handle_job_metrics(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle enabling, disabling and reading the job metrics."""
+    if msg.get("enabled") is True:
+        hass.async_enable_job_metrics()
+    elif msg.get("enabled") is False:
+        hass.async_disable_job_metrics()
+
+    if hass.job_metrics is None:
+        connection.send_result(msg["id"], {"enabled": False})
+        return
+
+    connection.send_result(
+        msg["id"], {"enabled": True, **hass.job_metrics.as_dict(msg["limit"])}
+    )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "executor_pools"})
+@decorators.require_admin
+def handle_executor_pools(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle listing the queue metrics of the executor pools."""
+    connection.send_result(msg["id"], hass.async_executor_pool_metrics())
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Hashable
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 import voluptuous as vol
 
@@ -27,11 +27,13 @@ class ActiveConnection:
         send_message: Callable[[str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        drain: Callable[[], Awaitable[bool]] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        self._drain = drain
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
@@ -53,6 +55,17 @@ class ActiveConnection:
         )
         self.send_message(content)
 
+    async def async_drain(self) -> bool:
+        """Wait until the client has read most of the pending messages.
+
+        Commands sending many messages wait for this between messages, so the
+        client is not disconnected for falling behind. Returns False if the
+        connection is closed first.
+        """
+        if self._drain is None:
+            return True
+        return await self._drain()
+
     @callback
     def send_error(self, msg_id: int, code: str, message: str) -> None:
         """Send a error message."""
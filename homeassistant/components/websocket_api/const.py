@@ -3,12 +3,10 @@ from __future__ import annotations
 
 import asyncio
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Final
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection
@@ -26,6 +24,9 @@ URL: Final = "/api/websocket"
 PENDING_MSG_PEAK: Final = 512
 PENDING_MSG_PEAK_TIME: Final = 5
 MAX_PENDING_MSG: Final = 2048
+# Commands sending many messages wait for the client while more are pending
+PENDING_MSG_DRAIN: Final = 256
+PENDING_MSG_DRAIN_INTERVAL: Final = 0.05
 
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
@@ -52,4 +53,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
-JSON_DUMP: Final = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP: Final = json_dumps
@@ -21,6 +21,8 @@ from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
     MAX_PENDING_MSG,
+    PENDING_MSG_DRAIN,
+    PENDING_MSG_DRAIN_INTERVAL,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
     SIGNAL_WEBSOCKET_CONNECTED,
@@ -116,6 +118,17 @@ class WebSocketHandler:
                 self.hass, PENDING_MSG_PEAK_TIME, self._check_write_peak
             )
 
+    async def _async_drain(self) -> bool:
+        """Wait until the client has read most of the pending messages.
+
+        Returns False if the connection is closed first.
+        """
+        while self._to_write.qsize() >= PENDING_MSG_DRAIN:
+            if self._writer_task is None or self._writer_task.done():
+                return False
+            await asyncio.sleep(PENDING_MSG_DRAIN_INTERVAL)
+        return self._writer_task is not None and not self._writer_task.done()
+
     @callback
     def _check_write_peak(self, _utc_time: dt.datetime) -> None:
         """Check that we are no longer above the write peak."""
@@ -160,7 +173,9 @@ class WebSocketHandler:
         # event we do not want to block for websocket responses
         self._writer_task = asyncio.create_task(self._writer())
 
-        auth = AuthPhase(self._logger, self.hass, self._send_message, request)
+        auth = AuthPhase(
+            self._logger, self.hass, self._send_message, request, self._async_drain
+        )
         connection = None
         disconnect_warn = None
 
@@ -1,13 +1,15 @@
 """Message templates for websocket commands."""
 from __future__ import annotations
 
+from contextlib import suppress
 from functools import lru_cache
 import logging
 from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,12 +33,32 @@ BASE_COMMAND_MESSAGE_SCHEMA: Final = vol.Schema({vol.Required("id"): cv.positive
 IDEN_TEMPLATE: Final = "__IDEN__"
 IDEN_JSON_TEMPLATE: Final = '"__IDEN__"'
 
+_STATE_CHANGED_DATA_KEYS: Final = {"entity_id", "old_state", "new_state"}
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def construct_result_message(iden: int, payload: str) -> str:
+    """Construct a success result message JSON from an already serialized result."""
+    return f'{{"id":{iden},"type":"result","success":true,"result":{payload}}}'
+
+
+def states_result_message(iden: int, states: list[State]) -> str:
+    """Return a success result message JSON for a list of states.
+
+    The states are assembled from their cached JSON.
+    """
+    try:
+        payload = ",".join(state.as_json for state in states)
+    except (ValueError, TypeError):
+        # Let message_to_json find and log the bad data
+        return message_to_json(result_message(iden, states))
+    return construct_result_message(iden, f"[{payload}]")
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -71,9 +93,31 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
+    if event.event_type == EVENT_STATE_CHANGED:
+        with suppress(ValueError, TypeError, KeyError, AttributeError):
+            return _state_changed_event_json(event)
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def _state_changed_event_json(event: Event) -> str:
+    """Serialize a state changed event message from the cached state JSON."""
+    data = event.data
+    if data.keys() != _STATE_CHANGED_DATA_KEYS:
+        raise KeyError
+    old_state = data["old_state"]
+    new_state = data["new_state"]
+    return (
+        f'{{"id":{IDEN_JSON_TEMPLATE},"type":"event","event":{{'
+        f'"event_type":"{EVENT_STATE_CHANGED}","data":{{'
+        f'"entity_id":{const.JSON_DUMP(data["entity_id"])},'
+        f'"old_state":{"null" if old_state is None else old_state.as_json},'
+        f'"new_state":{"null" if new_state is None else new_state.as_json}}},'
+        f'"origin":"{event.origin.value}",'
+        f'"time_fired":"{event.time_fired.isoformat()}",'
+        f'"context":{const.JSON_DUMP(event.context.as_dict())}}}}}'
+    )
+
+
 def message_to_json(message: dict[str, Any]) -> str:
     """Serialize a websocket message to json."""
     try:
@@ -43,6 +43,7 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_PACKAGES,
     CONF_TEMPERATURE_UNIT,
+    CONF_TEMPLATE_BYTECODE_CACHE,
     CONF_TIME_ZONE,
     CONF_TYPE,
     CONF_UNIT_SYSTEM,
@@ -239,6 +240,7 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend(
         # pylint: disable=no-value-for-parameter
         vol.Optional(CONF_MEDIA_DIRS): cv.schema_with_slug_keys(vol.IsDir()),
         vol.Optional(CONF_LEGACY_TEMPLATES): cv.boolean,
+        vol.Optional(CONF_TEMPLATE_BYTECODE_CACHE): cv.boolean,
         vol.Optional(CONF_CURRENCY): cv.currency,
     }
 )
@@ -536,6 +538,7 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: dict) -> Non
         (CONF_EXTERNAL_URL, "external_url"),
         (CONF_MEDIA_DIRS, "media_dirs"),
         (CONF_LEGACY_TEMPLATES, "legacy_templates"),
+        (CONF_TEMPLATE_BYTECODE_CACHE, "template_bytecode_cache"),
         (CONF_CURRENCY, "currency"),
     ):
         if key in config:
@@ -7,7 +7,16 @@ of entities and react to changes.
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Collection, Coroutine, Iterable, Mapping
+from bisect import bisect_left
+from collections import deque
+from collections.abc import (
+    Awaitable,
+    Collection,
+    Coroutine,
+    Generator,
+    Iterable,
+    Mapping,
+)
 import datetime
 import enum
 import functools
@@ -16,7 +25,8 @@ import os
 import pathlib
 import re
 import threading
-from time import monotonic
+from time import monotonic, perf_counter
+import types
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, cast
 
@@ -27,6 +37,7 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
@@ -59,6 +70,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -66,6 +78,7 @@ from homeassistant.util.async_ import (
     shutdown_run_callback_threadsafe,
 )
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import MeteredThreadPoolExecutor
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
 import homeassistant.util.uuid as uuid_util
@@ -102,6 +115,10 @@ BLOCK_LOG_TIMEOUT = 60
 # How long we wait for the result of a service call
 SERVICE_CALL_LIMIT = 10  # seconds
 
+# Event types that support keyed listeners and the event data key they
+# are indexed by
+KEYED_EVENT_DATA_KEYS = {EVENT_STATE_CHANGED: ATTR_ENTITY_ID}
+
 # Source of core configuration
 SOURCE_DISCOVERED = "discovered"
 SOURCE_STORAGE = "storage"
@@ -110,6 +127,12 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Upper bounds in seconds of the job metrics duration histogram buckets
+JOB_METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.2, 0.5, 1.0)
+# How often loop lag and the executor queue depth are sampled
+JOB_METRICS_SAMPLE_INTERVAL = 1.0  # seconds
+JOB_METRICS_SAMPLES = 300
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -154,6 +177,32 @@ class HassJobType(enum.Enum):
     Executor = 3
 
 
+class ExecutorPool(str, enum.Enum):
+    """Represent a named executor pool.
+
+    Executor jobs run in the default executor unless they target a pool.
+    Every pool has its own threads, so a class of jobs that is slow or
+    saturated can't starve the jobs of another class.
+    """
+
+    # File, network and camera image I/O
+    IO = "io"
+    # Database queries the frontend is waiting for, such as history
+    DB_READ = "db_read"
+    # Updates of polled integrations
+    INTEGRATION_POLL = "integration_poll"
+    # CPU bound work
+    CPU = "cpu"
+
+
+EXECUTOR_POOL_WORKERS = {
+    ExecutorPool.IO: 16,
+    ExecutorPool.DB_READ: 4,
+    ExecutorPool.INTEGRATION_POLL: 32,
+    ExecutorPool.CPU: max(2, os.cpu_count() or 1),
+}
+
+
 class HassJob:
     """Represent a job to be run later.
 
@@ -191,6 +240,193 @@ def _get_callable_job_type(target: Callable) -> HassJobType:
     return HassJobType.Executor
 
 
+def _job_target_name(target: Callable) -> str:
+    """Return the name job metrics are recorded under."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    module = getattr(target, "__module__", None)
+    name = getattr(target, "__qualname__", None) or type(target).__qualname__
+    return f"{module}.{name}" if module else name
+
+
+class JobTimings:
+    """Histogram of the durations of a job target."""
+
+    __slots__ = ("job_type", "count", "total", "max", "buckets")
+
+    def __init__(self, job_type: HassJobType) -> None:
+        """Initialize the timings."""
+        self.job_type = job_type
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(JOB_METRICS_BUCKETS) + 1)
+
+    def add(self, duration: float) -> None:
+        """Record a duration."""
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect_left(JOB_METRICS_BUCKETS, duration)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the timings."""
+        return {
+            "job_type": self.job_type.name,
+            "count": self.count,
+            "total": round(self.total, 6),
+            "max": round(self.max, 6),
+            "buckets": dict(zip([*map(str, JOB_METRICS_BUCKETS), "inf"], self.buckets)),
+        }
+
+
+class JobMetrics:
+    """Instrument the jobs run by Home Assistant and the event loop.
+
+    Callbacks and coroutine jobs are timed while they run in the event
+    loop, a coroutine once for every step between awaits, so a job that
+    blocks the loop shows up with a large max. Executor jobs are timed in
+    their thread. Loop lag and the queue depths of the default executor and
+    the executor pools are sampled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the metrics."""
+        self.hass = hass
+        self.timings: dict[str, JobTimings] = {}
+        self.loop_lag: deque[float] = deque(maxlen=JOB_METRICS_SAMPLES)
+        self.executor_queue_depth: deque[int] = deque(maxlen=JOB_METRICS_SAMPLES)
+        self.pool_queue_depth: dict[ExecutorPool, deque[int]] = {}
+        self._sample_handle: asyncio.TimerHandle | None = None
+
+    def _timings(self, target: Callable, job_type: HassJobType) -> JobTimings:
+        """Return the timings of a target."""
+        name = _job_target_name(target)
+        if (timings := self.timings.get(name)) is None:
+            timings = self.timings[name] = JobTimings(job_type)
+        return timings
+
+    def run_callback(self, target: Callable, *args: Any) -> None:
+        """Run and time a callback."""
+        timings = self._timings(target, HassJobType.Callback)
+        start = perf_counter()
+        try:
+            target(*args)
+        finally:
+            timings.add(perf_counter() - start)
+
+    def run_executor_job(self, target: Callable[..., T], *args: Any) -> T:
+        """Run and time an executor job, called in the executor thread."""
+        start = perf_counter()
+        try:
+            return target(*args)
+        finally:
+            duration = perf_counter() - start
+            self.hass.loop.call_soon_threadsafe(
+                self._add_executor_timing, target, duration
+            )
+
+    def _add_executor_timing(self, target: Callable, duration: float) -> None:
+        """Record the duration of an executor job in the event loop."""
+        self._timings(target, HassJobType.Executor).add(duration)
+
+    async def time_coroutine(self, target: Callable, coro: Coroutine) -> Any:
+        """Await a coroutine and time every step it runs in the event loop."""
+        return await _timed_steps(
+            coro, self._timings(target, HassJobType.Coroutinefunction)
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Start sampling loop lag and the executor queue depth."""
+        self._async_schedule_sample()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sampling."""
+        if self._sample_handle is not None:
+            self._sample_handle.cancel()
+            self._sample_handle = None
+
+    @callback
+    def _async_schedule_sample(self) -> None:
+        """Schedule the next sample."""
+        loop = self.hass.loop
+        when = loop.time() + JOB_METRICS_SAMPLE_INTERVAL
+        self._sample_handle = loop.call_at(when, self._async_sample, when)
+
+    @callback
+    def _async_sample(self, scheduled: float) -> None:
+        """Sample how late this callback runs and the executor queue depths."""
+        self.loop_lag.append(max(self.hass.loop.time() - scheduled, 0.0))
+        executor = self.hass.loop._default_executor  # type: ignore[attr-defined]  # pylint: disable=protected-access
+        if (work_queue := getattr(executor, "_work_queue", None)) is not None:
+            self.executor_queue_depth.append(work_queue.qsize())
+        for pool, pool_executor in self.hass.executor_pools.items():
+            if (samples := self.pool_queue_depth.get(pool)) is None:
+                samples = self.pool_queue_depth[pool] = deque(
+                    maxlen=JOB_METRICS_SAMPLES
+                )
+            samples.append(pool_executor.queued)
+        self._async_schedule_sample()
+
+    @callback
+    def as_dict(self, limit: int | None = None) -> dict[str, Any]:
+        """Return the metrics with the targets that blocked the longest first."""
+        targets = sorted(
+            self.timings.items(), key=lambda item: item[1].max, reverse=True
+        )[:limit]
+        return {
+            "targets": {name: timings.as_dict() for name, timings in targets},
+            "loop_lag": {
+                "samples": len(self.loop_lag),
+                "max": round(max(self.loop_lag, default=0.0), 6),
+                "last": round(self.loop_lag[-1], 6) if self.loop_lag else None,
+            },
+            "executor_queue_depth": _queue_depth_as_dict(self.executor_queue_depth),
+            "pool_queue_depth": {
+                pool.value: _queue_depth_as_dict(samples)
+                for pool, samples in self.pool_queue_depth.items()
+            },
+        }
+
+
+def _queue_depth_as_dict(samples: deque[int]) -> dict[str, Any]:
+    """Summarize queue depth samples."""
+    return {
+        "samples": len(samples),
+        "max": max(samples, default=0),
+        "last": samples[-1] if samples else None,
+    }
+
+
+@types.coroutine
+def _timed_steps(coro: Coroutine, timings: JobTimings) -> Generator[Any, Any, Any]:
+    """Drive a coroutine, recording how long every step runs."""
+    value: Any = None
+    exc: BaseException | None = None
+    while True:
+        start = perf_counter()
+        try:
+            if exc is None:
+                yielded = coro.send(value)
+            else:
+                yielded = coro.throw(exc)
+        except StopIteration as stop:
+            timings.add(perf_counter() - start)
+            return stop.value
+        except BaseException:
+            timings.add(perf_counter() - start)
+            raise
+        timings.add(perf_counter() - start)
+        value, exc = None, None
+        try:
+            value = yield yielded
+        except BaseException as err:  # pylint: disable=broad-except
+            exc = err
+
+
 class CoreState(enum.Enum):
     """Represent the current state of Home Assistant."""
 
@@ -232,6 +468,10 @@ class HomeAssistant:
         self._stopped: asyncio.Event | None = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # Set by async_enable_job_metrics
+        self.job_metrics: JobMetrics | None = None
+        # Created when the first job targets them
+        self.executor_pools: dict[ExecutorPool, MeteredThreadPoolExecutor] = {}
 
     @property
     def is_running(self) -> bool:
@@ -358,6 +598,9 @@ class HomeAssistant:
         hassjob: HassJob to call.
         args: parameters for method to call.
         """
+        if (metrics := self.job_metrics) is not None:
+            return self._async_add_measured_hass_job(metrics, hassjob, *args)
+
         if hassjob.job_type == HassJobType.Coroutinefunction:
             task = self.loop.create_task(hassjob.target(*args))
         elif hassjob.job_type == HassJobType.Callback:
@@ -374,6 +617,42 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def _async_add_measured_hass_job(
+        self, metrics: JobMetrics, hassjob: HassJob, *args: Any
+    ) -> asyncio.Future | None:
+        """Add a HassJob that records job metrics."""
+        target = hassjob.target
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(metrics.time_coroutine(target, target(*args)))
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(metrics.run_callback, target, *args)
+            return None
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, metrics.run_executor_job, target, *args
+            )
+
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
+    @callback
+    def async_enable_job_metrics(self) -> JobMetrics:
+        """Start recording job metrics and return them."""
+        if self.job_metrics is None:
+            self.job_metrics = JobMetrics(self)
+            self.job_metrics.async_start()
+        return self.job_metrics
+
+    @callback
+    def async_disable_job_metrics(self) -> None:
+        """Stop recording job metrics."""
+        if self.job_metrics is not None:
+            self.job_metrics.async_stop()
+            self.job_metrics = None
+
     def create_task(self, target: Awaitable) -> None:
         """Add task to the executor pool.
 
@@ -401,7 +680,12 @@ class HomeAssistant:
         self, target: Callable[..., T], *args: Any
     ) -> Awaitable[T]:
         """Add an executor job from within the event loop."""
-        task = self.loop.run_in_executor(None, target, *args)
+        if (metrics := self.job_metrics) is not None:
+            task = self.loop.run_in_executor(
+                None, metrics.run_executor_job, target, *args
+            )
+        else:
+            task = self.loop.run_in_executor(None, target, *args)
 
         # If a task is scheduled
         if self._track_task:
@@ -409,6 +693,47 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_pool_executor_job(
+        self, pool: ExecutorPool, target: Callable[..., T], *args: Any
+    ) -> Awaitable[T]:
+        """Add an executor job that runs in a named pool from within the event loop."""
+        executor = self.async_get_executor_pool(pool)
+        if (metrics := self.job_metrics) is not None:
+            task = self.loop.run_in_executor(
+                executor, metrics.run_executor_job, target, *args
+            )
+        else:
+            task = self.loop.run_in_executor(executor, target, *args)
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
+    @callback
+    def async_get_executor_pool(self, pool: ExecutorPool) -> MeteredThreadPoolExecutor:
+        """Return the executor of a named pool."""
+        if (executor := self.executor_pools.get(pool)) is None:
+            if self.state == CoreState.stopped:
+                raise RuntimeError(
+                    f"Cannot create executor pool {pool.value} after shutdown"
+                )
+            executor = self.executor_pools[pool] = MeteredThreadPoolExecutor(
+                thread_name_prefix=f"SyncWorker_{pool.value}",
+                max_workers=EXECUTOR_POOL_WORKERS[pool],
+            )
+        return executor
+
+    @callback
+    def async_executor_pool_metrics(self) -> dict[str, dict[str, int]]:
+        """Return the queue metrics of the executor pools that are in use."""
+        return {
+            pool.value: executor.as_dict()
+            for pool, executor in self.executor_pools.items()
+        }
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -429,7 +754,10 @@ class HomeAssistant:
         args: parameters for method to call.
         """
         if hassjob.job_type == HassJobType.Callback:
-            hassjob.target(*args)
+            if self.job_metrics is None:
+                hassjob.target(*args)
+            else:
+                self.job_metrics.run_callback(hassjob.target, *args)
             return None
 
         return self.async_add_hass_job(hassjob, *args)
@@ -567,6 +895,18 @@ class HomeAssistant:
                 "Timed out waiting for shutdown stage 3 to complete, the shutdown will continue"
             )
 
+        # The default executor is shut down with the loop. The pools are kept,
+        # so they refuse jobs, and pools created meanwhile are shut down too.
+        shut_down: set[ExecutorPool] = set()
+        while pools := self.executor_pools.keys() - shut_down:
+            shut_down |= pools
+            await asyncio.gather(
+                *(
+                    self.loop.run_in_executor(None, self.executor_pools[pool].shutdown)
+                    for pool in pools
+                )
+            )
+
         self.exit_code = exit_code
         self.state = CoreState.stopped
 
@@ -574,19 +914,67 @@ class HomeAssistant:
             self._stopped.set()
 
 
-@attr.s(slots=True, frozen=True)
 class Context:
-    """The context that triggered something."""
+    """The context that triggered something.
 
-    user_id: str = attr.ib(default=None)
-    parent_id: str | None = attr.ib(default=None)
-    id: str = attr.ib(factory=uuid_util.random_uuid_hex)
+    A context is created for nearly every event and state, so it is a
+    slotted object set through its slot descriptors instead of a frozen attrs
+    class to keep creation cheap. Like the attrs class it is immutable, as it
+    is hashed.
+    """
+
+    __slots__ = ("user_id", "parent_id", "id")
+
+    def __init__(
+        self,
+        user_id: str | None = None,
+        parent_id: str | None = None,
+        id: str | None = _UNDEF,  # type: ignore[assignment]  # pylint: disable=redefined-builtin
+    ) -> None:
+        """Initialize the context."""
+        _set_context_user_id(self, user_id)
+        _set_context_parent_id(self, parent_id)
+        _set_context_id(self, uuid_util.random_uuid_hex() if id is _UNDEF else id)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent changing the context."""
+        raise attr.exceptions.FrozenInstanceError()
+
+    def __delattr__(self, name: str) -> None:
+        """Prevent changing the context."""
+        raise attr.exceptions.FrozenInstanceError()
+
+    def __reduce__(self) -> tuple[type[Context], tuple[str | None, ...]]:
+        """Return how to copy and pickle the context through __init__."""
+        return (Context, (self.user_id, self.parent_id, self.id))
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare contexts."""
+        return bool(
+            self.__class__ == other.__class__
+            and self.id == other.id
+            and self.user_id == other.user_id
+            and self.parent_id == other.parent_id
+        )
+
+    def __hash__(self) -> int:
+        """Make hashable."""
+        return hash((self.user_id, self.parent_id, self.id))
+
+    def __repr__(self) -> str:
+        """Return the representation of the context."""
+        return f"Context(user_id={self.user_id!r}, parent_id={self.parent_id!r}, id={self.id!r})"
 
     def as_dict(self) -> dict[str, str | None]:
         """Return a dictionary representation of the context."""
         return {"id": self.id, "parent_id": self.parent_id, "user_id": self.user_id}
 
 
+_set_context_user_id = Context.user_id.__set__  # type: ignore[attr-defined]
+_set_context_parent_id = Context.parent_id.__set__  # type: ignore[attr-defined]
+_set_context_id = Context.id.__set__  # type: ignore[attr-defined]
+
+
 class EventOrigin(enum.Enum):
     """Represent the origin of an event."""
 
@@ -661,6 +1049,7 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[tuple[HassJob, Callable | None]]] = {}
+        self._keyed_listeners: dict[str, dict[str, list[HassJob]]] = {}
         self._hass = hass
 
     @callback
@@ -669,7 +1058,33 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, keyed in self._keyed_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + sum(
+                len(jobs) for jobs in keyed.values()
+            )
+        return listeners
+
+    @callback
+    def async_keyed_listeners(self, event_type: str) -> dict[str, int]:
+        """Return dictionary with keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        return {
+            key: len(jobs)
+            for key, jobs in self._keyed_listeners.get(event_type, {}).items()
+        }
+
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners subscribed to this event type.
+
+        Listeners for all events are not taken into account.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners or event_type in self._keyed_listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -706,21 +1121,41 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        match_all_listeners = (
+            self._listeners.get(MATCH_ALL)
+            if event_type != EVENT_HOMEASSISTANT_CLOSE
+            else None
+        )
+
+        key: str | None = None
+        keyed_listeners = self._keyed_listeners.get(event_type)
+        if keyed_listeners is not None and event_data is not None:
+            key = event_data.get(KEYED_EVENT_DATA_KEYS[event_type])
+            if key not in keyed_listeners:
+                key = None
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        if match_all_listeners is not None:
+            self._async_dispatch(match_all_listeners, event)
 
+        if listeners is not None:
+            self._async_dispatch(listeners, event)
+
+        if key is not None:
+            self._hass.loop.call_soon(self._async_dispatch_keyed, key, event)
+
+    @callback
+    def _async_dispatch(
+        self, listeners: list[tuple[HassJob, Callable | None]], event: Event
+    ) -> None:
+        """Dispatch an event to a list of filterable listeners."""
         for job, event_filter in listeners:
             if event_filter is not None:
                 try:
@@ -731,6 +1166,21 @@ class EventBus:
                     continue
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_dispatch_keyed(self, key: str, event: Event) -> None:
+        """Run the keyed listeners for an event."""
+        keyed_listeners = self._keyed_listeners.get(event.event_type)
+        if keyed_listeners is None or key not in keyed_listeners:
+            return
+
+        for job in keyed_listeners[key][:]:
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing %s for %s", event.event_type, key
+                )
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -783,6 +1233,43 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        keys: str | Iterable[str],
+        listener: Callable,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type indexed by key.
+
+        Only events whose indexed data value matches one of the keys are
+        passed to the listener. For EVENT_STATE_CHANGED the key is the
+        entity_id. Dispatching is a dict lookup regardless of how many
+        keyed listeners are registered.
+
+        This method must be run in the event loop.
+        """
+        if event_type not in KEYED_EVENT_DATA_KEYS:
+            raise HomeAssistantError(
+                f"Event type {event_type} does not support keyed listeners"
+            )
+        if isinstance(keys, str):
+            keys = (keys,)
+        else:
+            keys = tuple(keys)
+
+        job = HassJob(listener)
+        keyed_listeners = self._keyed_listeners.setdefault(event_type, {})
+        for key in keys:
+            keyed_listeners.setdefault(key, []).append(job)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_keyed_listener(event_type, keys, job)
+
+        return remove_listener
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None]
     ) -> CALLBACK_TYPE:
@@ -857,6 +1344,28 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_keyed_listener(
+        self, event_type: str, keys: Iterable[str], job: HassJob
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+            for key in keys:
+                keyed_listeners[key].remove(job)
+                if not keyed_listeners[key]:
+                    del keyed_listeners[key]
+
+            if not keyed_listeners:
+                self._keyed_listeners.pop(event_type)
+        except (KeyError, ValueError):
+            # KeyError is key event_type or key listener did not exist
+            # ValueError if listener did not exist within key
+            _LOGGER.exception("Unable to remove unknown keyed job listener %s", job)
+
 
 class State:
     """Object to represent a state within the state machine.
@@ -878,9 +1387,11 @@ class State:
         "last_changed",
         "last_updated",
         "context",
-        "domain",
-        "object_id",
+        "_domain",
+        "_object_id",
         "_as_dict",
+        "_attributes_json",
+        "_as_json",
     ]
 
     def __init__(
@@ -910,12 +1421,35 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if type(attributes) is MappingProxyType:
+            # Reused from a previous state of the entity
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._attributes_json: str | None = None
+        self._as_json: str | None = None
+
+    @property
+    def domain(self) -> str:
+        """Domain of this state."""
+        try:
+            return self._domain
+        except AttributeError:
+            self._domain, self._object_id = split_entity_id(self.entity_id)
+            return self._domain
+
+    @property
+    def object_id(self) -> str:
+        """Object id of this state."""
+        try:
+            return self._object_id
+        except AttributeError:
+            self._domain, self._object_id = split_entity_id(self.entity_id)
+            return self._object_id
 
     @property
     def name(self) -> str:
@@ -948,6 +1482,41 @@ class State:
             }
         return self._as_dict
 
+    @property
+    def attributes_json(self) -> str:
+        """Return the attributes as compact JSON.
+
+        Async friendly.
+
+        Serialized once per state, the result is shared by the websocket
+        and REST APIs and the recorder. Raises ValueError or TypeError if
+        the attributes can't be serialized.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_dumps(dict(self.attributes))
+        return self._attributes_json
+
+    @property
+    def as_json(self) -> str:
+        """Return the JSON representation of as_dict.
+
+        Async friendly.
+
+        Built around the cached attributes JSON. Raises ValueError or
+        TypeError if the attributes can't be serialized.
+        """
+        if self._as_json is None:
+            as_dict = self.as_dict()
+            self._as_json = (
+                f'{{"entity_id":{json_dumps(self.entity_id)},'
+                f'"state":{json_dumps(self.state)},'
+                f'"attributes":{self.attributes_json},'
+                f'"last_changed":"{as_dict["last_changed"]}",'
+                f'"last_updated":"{as_dict["last_updated"]}",'
+                f'"context":{json_dumps(as_dict["context"])}}}'
+            )
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: dict) -> Any:
         """Initialize a state from a dict.
@@ -1204,7 +1773,9 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = attributes is old_state.attributes or (
+                old_state.attributes == MappingProxyType(attributes)
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1224,6 +1795,9 @@ class StateMachine:
             context,
             old_state is None,
         )
+        if same_attr and attributes is old_state.attributes:  # type: ignore[union-attr]
+            # The attributes are unchanged, so is their JSON
+            state._attributes_json = old_state._attributes_json  # type: ignore[union-attr]  # pylint: disable=protected-access
         self._states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1576,6 +2150,9 @@ class Config:
         # Use legacy template behavior
         self.legacy_templates: bool = False
 
+        # Keep compiled templates on disk across restarts
+        self.template_bytecode_cache: bool = False
+
     def distance(self, lat: float, lon: float) -> float | None:
         """Calculate distance from Home Assistant.
 
@@ -1769,9 +2346,15 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(
-            EVENT_TIME_CHANGED, {ATTR_NOW: now}, time_fired=now, context=timer_context
-        )
+        # Time tracking is scheduled with exact deadlines, the time changed
+        # event is only fired for listeners which explicitly subscribed to it
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED,
+                {ATTR_NOW: now},
+                time_fired=now,
+                context=timer_context,
+            )
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
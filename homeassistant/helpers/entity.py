@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 import math
+from operator import attrgetter
 import sys
 from timeit import default_timer as timer
 from typing import Any, TypedDict, final
@@ -30,7 +31,13 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
 )
-from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Context,
+    ExecutorPool,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import EntityPlatform
@@ -50,6 +57,18 @@ SOURCE_PLATFORM_CONFIG = "platform_config"
 # epsilon to make the string representation readable
 FLOAT_PRECISION = abs(int(math.floor(math.log10(abs(sys.float_info.epsilon))))) - 1
 
+# Properties which rarely change between state writes
+_STATIC_ATTRIBUTE_PROPERTIES = attrgetter(
+    "registry_entry",
+    "unit_of_measurement",
+    "name",
+    "icon",
+    "entity_picture",
+    "assumed_state",
+    "supported_features",
+    "device_class",
+)
+
 
 @callback
 @bind_hass
@@ -238,6 +257,13 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Attributes of the last state write, reused while they do not change
+    _static_attributes_key: tuple | None = None
+    _static_attributes: dict[str, Any] | None = None
+    _dynamic_attributes: dict[str, Any] | None = None
+    _customize_attributes: dict[str, Any] | None = None
+    _written_attributes: Mapping[str, Any] | None = None
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_available: bool = True
@@ -505,35 +531,8 @@ class Entity(ABC):
                 extra_state_attributes = self.device_state_attributes
             attr.update(extra_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        previous_static_attributes = self._static_attributes
+        static_attributes = self._async_static_attributes()
 
         end = timer()
 
@@ -561,12 +560,29 @@ class Entity(ABC):
             )
 
         # Overwrite properties that have been set in the config file.
+        customize = None
         if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+            customize = self.hass.data[DATA_CUSTOMIZE].get(self.entity_id)
+
+        attributes: Mapping[str, Any]
+        if (
+            self._written_attributes is not None
+            and static_attributes is previous_static_attributes
+            and attr == self._dynamic_attributes
+            and customize == self._customize_attributes
+        ):
+            # Only the state changed, hand the attributes of the current state
+            # back to the state machine so it can skip comparing them
+            attributes = self._written_attributes
+        else:
+            self._dynamic_attributes = attr
+            self._customize_attributes = customize
+            self._written_attributes = None
+            attributes = {**attr, **static_attributes, **(customize or {})}
 
         # Convert temperature if we detect one
         try:
-            unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
+            unit_of_measure = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
             units = self.hass.config.units
             if (
                 unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
@@ -575,7 +591,12 @@ class Entity(ABC):
                 prec = len(state) - state.index(".") - 1 if "." in state else 0
                 temp = units.temperature(float(state), unit_of_measure)
                 state = str(round(temp) if prec == 0 else round(temp, prec))
-                attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
+                # The converted attributes depend on the state, never reuse them
+                self._dynamic_attributes = None
+                attributes = {
+                    **attributes,
+                    ATTR_UNIT_OF_MEASUREMENT: units.temperature_unit,
+                }
         except ValueError:
             # Could not convert state to float
             pass
@@ -588,9 +609,65 @@ class Entity(ABC):
             self._context_set = None
 
         self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
+            self.entity_id, state, attributes, self.force_update, self._context
         )
 
+        if self._written_attributes is None and self._dynamic_attributes is not None:
+            current = self.hass.states.get(self.entity_id)
+            if current is not None:
+                self._written_attributes = current.attributes
+
+    @callback
+    def _async_static_attributes(self) -> dict[str, Any]:
+        """Return the attributes of the properties which rarely change.
+
+        The attributes are only rebuilt when the registry entry or one of
+        the properties changed since the last state write.
+        """
+        key = _STATIC_ATTRIBUTE_PROPERTIES(self)
+        if self._static_attributes is not None and key == self._static_attributes_key:
+            return self._static_attributes
+
+        (
+            entry,
+            unit_of_measurement,
+            name,
+            icon,
+            entity_picture,
+            assumed_state,
+            supported_features,
+            device_class,
+        ) = key
+        attr: dict[str, Any] = {}
+
+        if unit_of_measurement is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        # pylint: disable=consider-using-ternary
+        name = (entry and entry.name) or name
+        if name is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        icon = (entry and entry.icon) or icon
+        if icon is not None:
+            attr[ATTR_ICON] = icon
+
+        if entity_picture is not None:
+            attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if assumed_state:
+            attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        if supported_features is not None:
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        if device_class is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        self._static_attributes_key = key
+        self._static_attributes = attr
+        return attr
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -638,7 +715,9 @@ class Entity(ABC):
             if hasattr(self, "async_update"):
                 task = self.hass.async_create_task(self.async_update())  # type: ignore
             elif hasattr(self, "update"):
-                task = self.hass.async_add_executor_job(self.update)  # type: ignore
+                task = self.hass.async_add_pool_executor_job(
+                    ExecutorPool.INTEGRATION_POLL, self.update  # type: ignore
+                )
             else:
                 return
 
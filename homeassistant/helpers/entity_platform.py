@@ -5,8 +5,10 @@ import asyncio
 from collections.abc import Coroutine, Iterable
 from contextvars import ContextVar
 from datetime import datetime, timedelta
+from itertools import count
 import logging
 from logging import Logger
+from time import monotonic
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Callable, Protocol
 
@@ -43,7 +45,8 @@ from . import (
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import DISABLED_INTEGRATION, EntityRegistry
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import async_get_polling_scheduler
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -59,6 +62,10 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+# Numbers the polling keys of platforms set up from YAML, which can be
+# configured more than once
+_POLLING_KEY_IDS = count(1)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -100,9 +107,9 @@ class EntityPlatform:
         self._setup_complete = False
         # Method to cancel the state change listener
         self._async_unsub_polling: CALLBACK_TYPE | None = None
+        self._polling_key_id = next(_POLLING_KEY_IDS)
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
-        self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
@@ -402,10 +409,10 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
+        self._async_unsub_polling = async_get_polling_scheduler(
+            self.hass
+        ).async_add_platform(
+            self.polling_key, self.scan_interval, self._update_entity_states
         )
 
     async def _async_add_entity(  # noqa: C901
@@ -678,34 +685,43 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
+    @property
+    def polling_key(self) -> str:
+        """Return the key identifying the platform to the polling scheduler."""
+        key = f"{self.domain}.{self.platform_name}"
+        if self.config_entry is not None:
+            return f"{key}.{self.config_entry.entry_id}"
+        return f"{key}.{self._polling_key_id}"
+
     async def _update_entity_states(self, now: datetime) -> None:
         """Update the states of all the polling entities.
 
         To protect from flooding the executor, we will update async entities
         in parallel and other entities sequential.
 
+        The polling scheduler does not start a new round before this one is
+        done.
+
         This method must be run in the event loop.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        tasks = [
+            self._async_poll_entity(entity)
+            for entity in self.entities.values()
+            if entity.should_poll
+        ]
+        if tasks:
+            await asyncio.gather(*tasks)
 
-            if tasks:
-                await asyncio.gather(*tasks)
+    async def _async_poll_entity(self, entity: Entity) -> None:
+        """Update a polling entity and record how long it took."""
+        start = monotonic()
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            if entity.entity_id is not None:
+                async_get_polling_scheduler(self.hass).async_record_update(
+                    entity.entity_id, self.polling_key, monotonic() - start
+                )
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
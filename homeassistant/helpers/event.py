@@ -42,9 +42,6 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
@@ -54,6 +51,10 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TIME_DEADLINES = "track_time_deadlines"
+
+TRACK_TEMPLATE_RENDERS_SAVED = "track_template_renders_saved"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -242,62 +243,15 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
+    for each one, the event bus keeps a dict of entity ids
+    that care about the state change events so it can
     do a fast dict lookup to route events.
     """
     entity_ids = _async_string_to_lower_list(entity_ids)
     if not entity_ids:
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, entity_ids, action)
 
 
 @callback
@@ -775,10 +729,15 @@ class _TrackTemplateResultInfo:
         hass: HomeAssistant,
         track_templates: Iterable[TrackTemplate],
         action: Callable,
+        coalesce_window: float | None = None,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
         self._job = HassJob(action)
+        self._coalesce_window = coalesce_window
+        self._dirty: dict[Template, tuple[TrackTemplate, Event]] = {}
+        self._dirty_flush: asyncio.TimerHandle | asyncio.Task | None = None
+        self.renders_saved = 0
 
         for track_template_ in track_templates:
             track_template_.template.hass = hass
@@ -810,7 +769,9 @@ class _TrackTemplateResultInfo:
                 )
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._refresh if self._coalesce_window is None else self._mark_dirty,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -866,12 +827,71 @@ class _TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        if self._dirty_flush:
+            self._dirty_flush.cancel()
+            self._dirty_flush = None
+        self._dirty.clear()
 
     @callback
     def async_refresh(self) -> None:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _mark_dirty(self, event: Event) -> None:
+        """Mark the templates the state change affects for re-rendering.
+
+        Each template is rendered once at the end of the coalescing window,
+        no matter how many state changes arrived during the window. It is
+        rendered for the last state change, unless an earlier one is not
+        subject to the rate limit of the template.
+        """
+        for track_template_ in self._track_templates:
+            template = track_template_.template
+            info = self._info[template]
+            if not _event_triggers_rerender(event, info):
+                continue
+            if (dirty := self._dirty.get(template)) is None:
+                self._dirty[template] = (track_template_, event)
+                continue
+            self.renders_saved += 1
+            self.hass.data[TRACK_TEMPLATE_RENDERS_SAVED] = (
+                self.hass.data.get(TRACK_TEMPLATE_RENDERS_SAVED, 0) + 1
+            )
+            if (
+                _rate_limit_for_event(dirty[1], info, track_template_) is None
+                and _rate_limit_for_event(event, info, track_template_) is not None
+            ):
+                continue
+            self._dirty[template] = (track_template_, event)
+
+        if not self._dirty or self._dirty_flush is not None:
+            return
+        assert self._coalesce_window is not None
+        if self._coalesce_window:
+            self._dirty_flush = self.hass.loop.call_later(
+                self._coalesce_window, self._flush_dirty
+            )
+        else:
+            # A task runs after the callbacks already queued in this iteration
+            # of the event loop, and is waited for by async_block_till_done
+            self._dirty_flush = self.hass.async_create_task(self._async_flush_dirty())
+
+    async def _async_flush_dirty(self) -> None:
+        """Render the dirty templates at the end of the event loop iteration."""
+        self._flush_dirty()
+
+    @callback
+    def _flush_dirty(self) -> None:
+        """Render the templates marked dirty during the coalescing window."""
+        self._dirty_flush = None
+        dirty, self._dirty = self._dirty, {}
+        by_event: dict[Event, list[TrackTemplate]] = {}
+        for track_template_, event in dirty.values():
+            by_event.setdefault(event, []).append(track_template_)
+        for event, track_templates in by_event.items():
+            self._refresh(event, track_templates=track_templates)
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -1026,6 +1046,7 @@ def async_track_template_result(
     action: TrackTemplateResultListener,
     raise_on_template_error: bool = False,
     strict: bool = False,
+    coalesce_window: float | None = None,
 ) -> _TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1056,13 +1077,18 @@ def async_track_template_result(
         tracking.
     strict
         When set to True, raise on undefined variables.
+    coalesce_window
+        When set, state changes only mark the templates they affect and
+        each of them is re-rendered once, at the end of the event loop
+        iteration for 0 or after this many seconds. Only the last result
+        is passed to the listener.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = _TrackTemplateResultInfo(hass, track_templates, action)
+    tracker = _TrackTemplateResultInfo(hass, track_templates, action, coalesce_window)
     tracker.async_setup(raise_on_template_error, strict=strict)
     return tracker
 
@@ -1358,6 +1384,82 @@ track_sunset = threaded_listener_factory(async_track_sunset)
 time_tracker_utcnow = dt_util.utcnow
 
 
+class _TimeDeadlines:
+    """Run the time listeners sharing a deadline from a single loop timer.
+
+    Time pattern listeners often fire at the same second, like every
+    automation triggering at the start of the hour, so they are grouped by
+    their next deadline instead of each arming its own timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the deadlines."""
+        self._hass = hass
+        self._listeners: dict[datetime, dict[object, Callable[[], None]]] = {}
+        self._timers: dict[datetime, asyncio.TimerHandle] = {}
+
+    @callback
+    def async_add(
+        self, deadline: datetime, listener: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener once the deadline has passed."""
+        deadline = dt_util.as_utc(deadline)
+        if (listeners := self._listeners.get(deadline)) is None:
+            listeners = self._listeners[deadline] = {}
+            self._timers[deadline] = self._hass.loop.call_later(
+                deadline.timestamp() - time.time(), self._async_run, deadline
+            )
+        token = object()
+        listeners[token] = listener
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            # Also removed while the deadline runs, so it is not called
+            # if an earlier listener of the deadline removes it
+            listeners.pop(token, None)
+            if not listeners and listeners is self._listeners.get(deadline):
+                del self._listeners[deadline]
+                self._timers.pop(deadline).cancel()
+
+        return remove_listener
+
+    @callback
+    def _async_run(self, deadline: datetime) -> None:
+        """Call the listeners of a deadline."""
+        # Depending on the available clock support (including timer hardware
+        # and the OS kernel) it can happen that we fire a little bit too early
+        # as measured by utcnow(). That is bad when callbacks have assumptions
+        # about the current time. Thus, we rearm the timer for the remaining
+        # time.
+        delta = (deadline - time_tracker_utcnow()).total_seconds()
+        if delta > 0:
+            _LOGGER.debug("Called %f seconds too early, rearming", delta)
+            self._timers[deadline] = self._hass.loop.call_later(
+                delta, self._async_run, deadline
+            )
+            return
+
+        del self._timers[deadline]
+        listeners = self._listeners.pop(deadline)
+        for token, listener in list(listeners.items()):
+            if token not in listeners:
+                # Removed by an earlier listener
+                continue
+            try:
+                listener()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while running time listener %s", listener)
+
+
+@callback
+def _async_time_deadlines(hass: HomeAssistant) -> _TimeDeadlines:
+    """Return the time deadlines shared by the time pattern listeners."""
+    if (deadlines := hass.data.get(TRACK_TIME_DEADLINES)) is None:
+        deadlines = hass.data[TRACK_TIME_DEADLINES] = _TimeDeadlines(hass)
+    return cast(_TimeDeadlines, deadlines)
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -1371,7 +1473,7 @@ def async_track_utc_time_change(
     """Add a listener that will fire if time matches a pattern."""
     job = HassJob(action)
     # We do not have to wrap the function with time pattern matching logic
-    # if no pattern given
+    # if no pattern given. Listening makes the timer fire time changed events.
     if all(val is None for val in (hour, minute, second)):
 
         @callback
@@ -1381,6 +1483,8 @@ def async_track_utc_time_change(
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
+    deadlines = _async_time_deadlines(hass)
+
     matching_seconds = dt_util.parse_time_expression(second, 0, 59)
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
@@ -1395,21 +1499,18 @@ def async_track_utc_time_change(
     time_listener: CALLBACK_TYPE | None = None
 
     @callback
-    def pattern_time_change_listener(_: datetime) -> None:
-        """Listen for matching time_changed events."""
+    def pattern_time_change_listener() -> None:
+        """Run the action and wait for the next matching time."""
         nonlocal time_listener
 
         now = time_tracker_utcnow()
-        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
-
-        time_listener = async_track_point_in_utc_time(
-            hass,
-            pattern_time_change_listener,
-            calculate_next(now + timedelta(seconds=1)),
+        time_listener = deadlines.async_add(
+            calculate_next(now + timedelta(seconds=1)), pattern_time_change_listener
         )
+        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
 
-    time_listener = async_track_point_in_utc_time(
-        hass, pattern_time_change_listener, calculate_next(dt_util.utcnow())
+    time_listener = deadlines.async_add(
+        calculate_next(dt_util.utcnow()), pattern_time_change_listener
     )
 
     @callback
@@ -1,7 +1,21 @@
-"""Helpers to help with encoding Home Assistant objects in JSON."""
+"""Helpers to help with encoding Home Assistant objects in JSON.
+
+The json_* functions use orjson when it is installed and fall back to the
+standard library otherwise. Both backends convert Home Assistant objects
+the same way, the accelerated one encodes datetimes natively.
+"""
+from __future__ import annotations
+
 from datetime import datetime, timedelta
 import json
-from typing import Any
+import math
+import re
+from typing import Any, Callable, Final
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -22,6 +36,115 @@ class JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for the json_* functions.
+
+    Raises TypeError for other objects.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Types that can't contain a float, skipped without further checks
+_NO_FLOAT_TYPES: Final = frozenset((str, int, bool, type(None), datetime))
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """Return if data contains NaN or infinity, which orjson encodes as null."""
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        obj_type = type(obj)
+        if obj_type in _NO_FLOAT_TYPES:
+            continue
+        if obj_type is float:
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, set, tuple)):
+            stack.extend(obj)
+        elif hasattr(obj, "as_dict"):
+            stack.append(obj.as_dict())
+    return False
+
+
+if orjson is not None:
+    JSON_BACKEND: Final = "orjson"
+
+    # Python's json module converts int, float, bool and None keys to strings
+    _ORJSON_OPTIONS: Final = orjson.OPT_NON_STR_KEYS
+
+    _INDENT_RE: Final = re.compile(rb"^ +", re.MULTILINE)
+
+    def json_bytes(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes.
+
+        Raises ValueError for NaN and infinity like the standard library
+        does with allow_nan=False.
+        """
+        result = orjson.dumps(
+            data, option=_ORJSON_OPTIONS, default=json_encoder_default
+        )
+        if b"null" in result and _has_non_finite_float(data):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return result
+
+    def json_dumps(data: Any) -> str:
+        """Serialize data to a compact JSON string."""
+        return json_bytes(data).decode("utf-8")
+
+    def json_dumps_pretty(
+        data: Any, *, default: Callable[[Any], Any] | None = json_encoder_default
+    ) -> str:
+        """Serialize data to a JSON string indented by 4."""
+        result = orjson.dumps(
+            data, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2, default=default
+        )
+        if b"null" in result and _has_non_finite_float(data):
+            return json.dumps(data, indent=4, default=default)
+        # JSON strings can't contain a newline, so leading spaces are indentation
+        return _INDENT_RE.sub(lambda match: match[0] * 2, result).decode("utf-8")
+
+    def json_loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse JSON data.
+
+        The recorder and storage write NaN and infinity, which orjson refuses
+        to read, so those documents are parsed by the standard library.
+        """
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+
+else:  # pragma: no cover
+    JSON_BACKEND: Final = "json"  # type: ignore[misc]
+
+    def json_dumps(data: Any) -> str:
+        """Serialize data to a compact JSON string."""
+        return json.dumps(
+            data, default=json_encoder_default, separators=(",", ":"), allow_nan=False
+        )
+
+    def json_bytes(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes."""
+        return json_dumps(data).encode("utf-8")
+
+    def json_dumps_pretty(
+        data: Any, *, default: Callable[[Any], Any] | None = json_encoder_default
+    ) -> str:
+        """Serialize data to an indented JSON string."""
+        return json.dumps(data, indent=4, default=default)
+
+    json_loads = json.loads  # type: ignore[assignment]
+
+
 class ExtendedJSONEncoder(JSONEncoder):
     """JSONEncoder that supports Home Assistant objects and falls back to repr(o)."""
 
@@ -0,0 +1,227 @@
+"""Schedule the polling of entity platforms."""
+from __future__ import annotations
+
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import Any, Callable, cast
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .event import async_track_point_in_utc_time
+
+DATA_POLLING_SCHEDULER = "polling_scheduler"
+
+# The first poll of a platform is brought forward by up to this fraction
+# of its scan interval, so platforms set up together don't poll together
+POLL_SPREAD = 0.1
+MAX_POLL_SPREAD = 10.0  # seconds
+
+# After an update round overruns the scan interval, the platform is polled
+# this many times the round duration apart, up to a multiple of its scan
+# interval, until a round fits in the scan interval again
+OVERRUN_FACTOR = 1.5
+MAX_INTERVAL_FACTOR = 10
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PollerStats:
+    """Update durations of a polled entity."""
+
+    entity_id: str
+    platform: str
+    updates: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+
+    @property
+    def average_duration(self) -> float:
+        """Return the average update duration."""
+        return self.total_duration / self.updates if self.updates else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "entity_id": self.entity_id,
+            "platform": self.platform,
+            "updates": self.updates,
+            "last_duration": round(self.last_duration, 3),
+            "max_duration": round(self.max_duration, 3),
+            "average_duration": round(self.average_duration, 3),
+        }
+
+
+class PlatformPoller:
+    """Poll a platform on its own, possibly adapted, interval."""
+
+    def __init__(
+        self,
+        scheduler: PollingScheduler,
+        key: str,
+        scan_interval: timedelta,
+        action: Callable[[datetime], Awaitable[None]],
+    ) -> None:
+        """Initialize the poller."""
+        self._scheduler = scheduler
+        self._hass = scheduler.hass
+        self.key = key
+        self.scan_interval = scan_interval
+        self.interval = scan_interval
+        self.last_duration = 0.0
+        self.overruns = 0
+        self._action = action
+        self._job = HassJob(self._async_poll)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._polling = False
+        self._stopped = False
+
+    @property
+    def offset(self) -> timedelta:
+        """Return how much earlier than its interval the first poll runs.
+
+        The offset is derived from the key so it is spread but stable.
+        """
+        spread = min(self.scan_interval.total_seconds() * POLL_SPREAD, MAX_POLL_SPREAD)
+        return timedelta(
+            seconds=spread * zlib.crc32(self.key.encode("utf-8")) / 0xFFFFFFFF
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the first poll."""
+        self._async_schedule(self.scan_interval - self.offset)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        self._stopped = True
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_schedule(self, delay: timedelta) -> None:
+        """Schedule the next poll."""
+        self._unsub_timer = async_track_point_in_utc_time(
+            self._hass, self._job, dt_util.utcnow() + delay
+        )
+
+    @callback
+    def _async_poll(self, now: datetime) -> None:
+        """Start an update round."""
+        self._unsub_timer = None
+        if self._polling:
+            return
+        self._polling = True
+        self._hass.async_create_task(self._async_run(now))
+
+    async def _async_run(self, now: datetime) -> None:
+        """Run an update round and schedule the next one."""
+        start = monotonic()
+        try:
+            await self._action(now)
+        finally:
+            self._polling = False
+            self.last_duration = monotonic() - start
+            self._async_adapt_interval()
+            if not self._stopped:
+                self._async_schedule(self.interval)
+
+    @callback
+    def _async_adapt_interval(self) -> None:
+        """Poll less often while update rounds take longer than the scan interval."""
+        scan_seconds = self.scan_interval.total_seconds()
+        if self.last_duration > scan_seconds:
+            self.overruns += 1
+            interval = timedelta(
+                seconds=min(
+                    self.last_duration * OVERRUN_FACTOR,
+                    scan_seconds * MAX_INTERVAL_FACTOR,
+                )
+            )
+            if self.interval == self.scan_interval:
+                _LOGGER.warning(
+                    "Updating %s took %.3f seconds, longer than the scan interval %s; "
+                    "polling every %s until updates are faster",
+                    self.key,
+                    self.last_duration,
+                    self.scan_interval,
+                    interval,
+                )
+            self.interval = interval
+        elif self.interval != self.scan_interval:
+            _LOGGER.info(
+                "Updating %s is back within the scan interval %s",
+                self.key,
+                self.scan_interval,
+            )
+            self.interval = self.scan_interval
+
+
+class PollingScheduler:
+    """Schedule the polling of all entity platforms and track update durations."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.pollers: dict[str, PlatformPoller] = {}
+        self.stats: dict[str, PollerStats] = {}
+
+    @callback
+    def async_add_platform(
+        self,
+        key: str,
+        scan_interval: timedelta,
+        action: Callable[[datetime], Awaitable[None]],
+    ) -> CALLBACK_TYPE:
+        """Poll a platform every scan_interval and return a method to stop."""
+        poller = PlatformPoller(self, key, scan_interval, action)
+        self.pollers[key] = poller
+        poller.async_start()
+
+        @callback
+        def remove_platform() -> None:
+            """Stop polling the platform."""
+            poller.async_stop()
+            if self.pollers.get(key) is poller:
+                del self.pollers[key]
+            for entity_id in [
+                entity_id
+                for entity_id, stats in self.stats.items()
+                if stats.platform == key
+            ]:
+                del self.stats[entity_id]
+
+        return remove_platform
+
+    @callback
+    def async_record_update(self, entity_id: str, key: str, duration: float) -> None:
+        """Record how long an entity update took."""
+        if (stats := self.stats.get(entity_id)) is None:
+            stats = self.stats[entity_id] = PollerStats(entity_id, key)
+        stats.updates += 1
+        stats.last_duration = duration
+        stats.total_duration += duration
+        stats.max_duration = max(stats.max_duration, duration)
+
+    @callback
+    def async_slowest_pollers(self, limit: int = 10) -> list[PollerStats]:
+        """Return the entities with the slowest average update."""
+        return sorted(
+            self.stats.values(), key=lambda stats: stats.average_duration, reverse=True
+        )[:limit]
+
+
+@callback
+def async_get_polling_scheduler(hass: HomeAssistant) -> PollingScheduler:
+    """Return the polling scheduler."""
+    if (scheduler := hass.data.get(DATA_POLLING_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLLING_SCHEDULER] = PollingScheduler(hass)
+    return cast(PollingScheduler, scheduler)
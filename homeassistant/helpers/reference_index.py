@@ -0,0 +1,66 @@
+"""Index which entities reference which entities, devices and areas."""
+from __future__ import annotations
+
+from typing import Iterable
+
+from homeassistant.core import callback
+
+REFERENCE_AREA = "area"
+REFERENCE_DEVICE = "device"
+REFERENCE_ENTITY = "entity"
+
+
+class ReferenceIndex:
+    """Reverse index from referenced entities, devices and areas to referrers.
+
+    Referrers are entity ids, like the automations or scripts referencing the
+    items. They are returned in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._index: dict[str, dict[str, dict[str, None]]] = {
+            REFERENCE_AREA: {},
+            REFERENCE_DEVICE: {},
+            REFERENCE_ENTITY: {},
+        }
+        self._references: dict[str, dict[str, set[str]]] = {}
+
+    @callback
+    def async_add(
+        self,
+        referrer: str,
+        *,
+        areas: Iterable[str] = (),
+        devices: Iterable[str] = (),
+        entities: Iterable[str] = (),
+    ) -> None:
+        """Index the items a referrer references, replacing earlier ones."""
+        self.async_remove(referrer)
+        references = self._references[referrer] = {
+            REFERENCE_AREA: set(areas),
+            REFERENCE_DEVICE: set(devices),
+            REFERENCE_ENTITY: set(entities),
+        }
+        for kind, item_ids in references.items():
+            index = self._index[kind]
+            for item_id in item_ids:
+                index.setdefault(item_id, {})[referrer] = None
+
+    @callback
+    def async_remove(self, referrer: str) -> None:
+        """Remove a referrer from the index."""
+        if (references := self._references.pop(referrer, None)) is None:
+            return
+        for kind, item_ids in references.items():
+            index = self._index[kind]
+            for item_id in item_ids:
+                referrers = index[item_id]
+                del referrers[referrer]
+                if not referrers:
+                    del index[item_id]
+
+    @callback
+    def async_referrers(self, kind: str, item_id: str) -> list[str]:
+        """Return the referrers referencing an item of a kind."""
+        return list(self._index[kind].get(item_id, ()))
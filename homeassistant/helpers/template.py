@@ -4,6 +4,7 @@ from __future__ import annotations
 from ast import literal_eval
 import asyncio
 import base64
+from collections import OrderedDict
 import collections.abc
 from collections.abc import Generator, Iterable
 from contextlib import suppress
@@ -12,17 +13,22 @@ from datetime import datetime, timedelta
 from functools import partial, wraps
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
+import os
 import random
 import re
 import sys
+import tempfile
+import threading
+from types import CodeType
 from typing import Any, Callable, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import contextfunction, pass_context
+from jinja2.bccache import Bucket
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
 import voluptuous as vol
@@ -32,10 +38,13 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -65,6 +74,9 @@ _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
 
+COMPILED_TEMPLATE_CACHE_SIZE = 4096
+BYTECODE_CACHE_FILE = "core.template_bytecode"
+
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -1437,6 +1449,151 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """Keep the compiled templates in a single file across restarts.
+
+    The file is read once when Home Assistant starts and written after
+    startup and on shutdown, so compiling never touches the disk. Only the
+    templates used since the last start are written back.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the bytecode cache."""
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._stored: dict[str, bytes] = {}
+        self._used: dict[str, bytes] = {}
+        self._dirty = False
+
+    def load(self) -> None:
+        """Read the stored bytecode."""
+        try:
+            with open(self.path, "rb") as fdesc:
+                stored = marshal.load(fdesc)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Unable to read template bytecode cache: %s", err)
+            return
+        if isinstance(stored, dict):
+            self._stored = stored
+
+    def save(self) -> None:
+        """Write the bytecode of the templates used since the last start."""
+        if not self._dirty and len(self._used) == len(self._stored):
+            return
+        used = dict(self._used)
+        tmp_filename = ""
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(self.path), delete=False
+            ) as fdesc:
+                tmp_filename = fdesc.name
+                marshal.dump(used, fdesc)
+            os.replace(tmp_filename, self.path)
+        except OSError as err:
+            _LOGGER.error("Unable to write template bytecode cache: %s", err)
+            with suppress(OSError):
+                os.remove(tmp_filename)
+            return
+        self._stored = used
+        self._dirty = False
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the stored bytecode into the bucket."""
+        if (data := self._stored.get(bucket.key)) is not None:
+            # Bytecode from another Jinja or Python version resets the bucket
+            bucket.bytecode_from_string(data)
+        if bucket.code is None:
+            self.misses += 1
+            return
+        self.hits += 1
+        self._used[bucket.key] = data
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Store the bytecode of the bucket."""
+        self._used[bucket.key] = bucket.bytecode_to_string()
+        self._dirty = True
+
+
+class CompiledTemplateCache:
+    """Least recently used cache of compiled templates shared by all environments.
+
+    Identical template strings used by many entities and automations are
+    only compiled once per environment type.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.bytecode_cache: TemplateBytecodeCache | None = None
+        self._code: OrderedDict[tuple[str, str], CodeType] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> CodeType | None:
+        """Return the compiled code of a template."""
+        with self._lock:
+            if (code := self._code.get(key)) is None:
+                self.misses += 1
+                return None
+            self._code.move_to_end(key)
+            self.hits += 1
+            return code
+
+    def set(self, key: tuple[str, str], code: CodeType) -> None:
+        """Add the compiled code of a template."""
+        with self._lock:
+            self._code[key] = code
+            if len(self._code) > self.maxsize:
+                self._code.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the compiled templates."""
+        with self._lock:
+            self._code.clear()
+
+    def info(self) -> dict[str, int]:
+        """Return the size and the hit counters of the cache."""
+        info = {"size": len(self._code), "hits": self.hits, "misses": self.misses}
+        if (bytecode_cache := self.bytecode_cache) is not None:
+            info["bytecode_hits"] = bytecode_cache.hits
+            info["bytecode_misses"] = bytecode_cache.misses
+        return info
+
+
+_COMPILED_TEMPLATES = CompiledTemplateCache(COMPILED_TEMPLATE_CACHE_SIZE)
+
+
+def compiled_template_cache_info() -> dict[str, int]:
+    """Return the size and the hit counters of the compiled template cache."""
+    return _COMPILED_TEMPLATES.info()
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the bytecode of the templates compiled during earlier runs."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import STORAGE_DIR
+
+    bytecode_cache = TemplateBytecodeCache(
+        hass.config.path(STORAGE_DIR, BYTECODE_CACHE_FILE)
+    )
+    await hass.async_add_executor_job(bytecode_cache.load)
+    _COMPILED_TEMPLATES.bytecode_cache = bytecode_cache
+
+    async def _async_save(event: Event) -> None:
+        """Write the bytecode of the templates compiled so far."""
+        await hass.async_add_executor_job(bytecode_cache.save)
+        _LOGGER.debug("Compiled template cache: %s", compiled_template_cache_info())
+        if event.event_type == EVENT_HOMEASSISTANT_FINAL_WRITE:
+            _COMPILED_TEMPLATES.bytecode_cache = None
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_save)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1448,7 +1605,16 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        if limited:
+            self.template_type = "limited"
+        elif strict:
+            self.template_type = "strict"
+        else:
+            self.template_type = "normal"
+        if hass is None:
+            # Filters and tests are checked when compiling and the ones that
+            # need hass are missing, so the code can't be shared
+            self.template_type = f"{self.template_type}_no_hass"
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1603,11 +1769,22 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
+        key = (self.template_type, source)
+        if (cached := _COMPILED_TEMPLATES.get(key)) is not None:
+            return cached
 
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+        if (bytecode_cache := _COMPILED_TEMPLATES.bytecode_cache) is None:
+            cached = super().compile(source)
+        else:
+            bucket = bytecode_cache.get_bucket(
+                self, f"{self.template_type}:{source}", None, source
+            )
+            if bucket.code is None:
+                bucket.code = super().compile(source)
+                bytecode_cache.set_bucket(bucket)
+            cached = bucket.code
 
+        _COMPILED_TEMPLATES.set(key, cached)
         return cached
 
 
@@ -9,13 +9,14 @@ from datetime import datetime
 import json
 import logging
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSON_BACKEND, JSONEncoder
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -39,6 +40,7 @@ def run(args):
 
     bench = BENCHMARKS[args.name]
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
+    print("Using JSON backend:", JSON_BACKEND)
 
     with suppress(KeyboardInterrupt):
         while True:
@@ -377,6 +379,32 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def write_entity_state(hass):
+    """Write the state of a power meter sensor a million times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.sensor import STATE_CLASS_MEASUREMENT, SensorEntity
+    from homeassistant.const import DEVICE_CLASS_POWER, POWER_WATT
+
+    entity = SensorEntity()
+    entity.hass = hass
+    entity.entity_id = "sensor.power_meter"
+    entity._attr_name = "Power Meter"  # pylint: disable=protected-access
+    entity._attr_device_class = DEVICE_CLASS_POWER  # pylint: disable=protected-access
+    entity._attr_state_class = (
+        STATE_CLASS_MEASUREMENT  # pylint: disable=protected-access
+    )
+    entity._attr_unit_of_measurement = POWER_WATT  # pylint: disable=protected-access
+
+    start = timer()
+
+    for value in range(10 ** 6):
+        entity._attr_state = value  # pylint: disable=protected-access
+        entity.async_write_ha_state()
+
+    return timer() - start
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -390,6 +418,168 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_events(hass):
+    """Serialize 100k state changed events for websocket subscribers."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import _cached_event_message
+
+    events = []
+    old_state = None
+    for value in range(10 ** 5):
+        new_state = core.State(
+            "sensor.power_meter",
+            str(value),
+            {"friendly_name": "Power Meter", "unit_of_measurement": "W"},
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "sensor.power_meter",
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+            )
+        )
+        old_state = new_state
+
+    start = timer()
+    for event in events:
+        _cached_event_message(event)
+    return timer() - start
+
+
+@benchmark
+async def json_save_storage(hass):
+    """Write a storage file with 5000 entity registry entries 100 times."""
+    # pylint: disable=import-outside-toplevel
+    import os
+    import tempfile
+
+    from homeassistant.util.json import save_json
+
+    data = {
+        "version": 1,
+        "key": "core.entity_registry",
+        "data": {
+            "entities": [
+                {
+                    "entity_id": f"sensor.power_meter_{i}",
+                    "config_entry_id": "5b4a8ac1dee54b0a8fa1b1a0f8ac1a3b",
+                    "device_id": "9d5f4b5cc9f84f1e8ad7f0aa2c6fbc5e",
+                    "area_id": None,
+                    "unique_id": f"power_meter_{i}",
+                    "platform": "demo",
+                    "name": None,
+                    "icon": None,
+                    "disabled_by": None,
+                    "capabilities": {"state_class": "measurement"},
+                    "supported_features": 0,
+                    "device_class": None,
+                    "unit_of_measurement": "W",
+                    "original_name": f"Power Meter {i}",
+                    "original_icon": None,
+                }
+                for i in range(5000)
+            ]
+        },
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "core.entity_registry")
+        start = timer()
+        for _ in range(100):
+            save_json(path, data, encoder=JSONEncoder)
+        return timer() - start
+
+
+@benchmark
+async def json_serialize_recorder_rows(hass):
+    """Serialize 100k state changed and service call events into recorder rows."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import Events, StateAttributes, States
+
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "sensor.power_meter",
+                "old_state": None,
+                "new_state": core.State(
+                    "sensor.power_meter",
+                    str(value),
+                    {
+                        "friendly_name": "Power Meter",
+                        "unit_of_measurement": "W",
+                        "value": value,
+                    },
+                ),
+            },
+        )
+        for value in range(10 ** 5)
+    ]
+
+    service_event = core.Event(
+        "call_service",
+        {
+            "domain": "light",
+            "service": "turn_on",
+            "service_data": {"entity_id": ["light.kitchen"], "brightness": 100},
+        },
+    )
+
+    start = timer()
+    for event in events:
+        Events.row_from_event(event, event_data="{}")
+        States.row_from_event(event)
+        StateAttributes.shared_attrs_from_event(event)
+        Events.row_from_event(service_event)
+    return timer() - start
+
+
+def _memory_benchmark(name, factory, count=10 ** 5):
+    """Create objects and print the memory they hold on to."""
+    tracemalloc.start()
+    try:
+        start = timer()
+        objects = [factory(i) for i in range(count)]
+        runtime = timer() - start
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f"{count} {name} use {size} bytes, {size // len(objects)} bytes each")
+    return runtime
+
+
+@benchmark
+async def memory_contexts(hass):
+    """Measure the memory of a hundred thousand contexts."""
+    return _memory_benchmark("contexts", lambda i: core.Context())
+
+
+@benchmark
+async def memory_events(hass):
+    """Measure the memory of a hundred thousand events."""
+    return _memory_benchmark("events", lambda i: core.Event("test_event", {"value": i}))
+
+
+@benchmark
+async def memory_states(hass):
+    """Measure the memory of a hundred thousand states after serialization."""
+
+    def create_state(i):
+        state = core.State(
+            f"sensor.power_meter_{i}",
+            str(i),
+            {"friendly_name": "Power Meter", "unit_of_measurement": "W"},
+        )
+        state.as_dict()
+        return state
+
+    return _memory_benchmark("states", create_state)
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -1,19 +1,22 @@
 """Executor util helpers."""
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 import contextlib
 import logging
 import queue
 import sys
-from threading import Thread
+from threading import Lock, Thread
 import time
 import traceback
+from typing import Any, Callable, TypeVar
 
 from homeassistant.util.thread import async_raise
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 MAX_LOG_ATTEMPTS = 2
 
 _JOIN_ATTEMPTS = 10
@@ -111,3 +114,54 @@ class InterruptibleThreadPoolExecutor(ThreadPoolExecutor):
             )
             if timeout_remaining <= 0:
                 return
+
+
+class MeteredThreadPoolExecutor(InterruptibleThreadPoolExecutor):
+    """An InterruptibleThreadPoolExecutor that counts the work it is given."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the executor."""
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = Lock()
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+        self.max_queued = 0
+
+    @property
+    def queued(self) -> int:
+        """Return the number of jobs waiting for a thread."""
+        return self._work_queue.qsize()  # type: ignore[attr-defined]
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> Future[_T]:
+        """Submit a job and record how many jobs are waiting."""
+        with self._metrics_lock:
+            self.submitted += 1
+        future = super().submit(self._run, fn, *args, **kwargs)
+        with self._metrics_lock:
+            self.max_queued = max(self.max_queued, self.queued)
+        return future
+
+    def _run(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Run a job in a worker thread."""
+        with self._metrics_lock:
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._metrics_lock:
+                self.running -= 1
+                self.completed += 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the queue metrics of the executor."""
+        return {
+            "max_workers": self._max_workers,  # type: ignore[attr-defined]
+            "submitted": self.submitted,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+        }
@@ -673,10 +673,16 @@ async def test_automation_stops(hass, calls, service):
             blocking=True,
         )
     else:
+        changed_config = {
+            automation.DOMAIN: {
+                **config[automation.DOMAIN],
+                "trigger": {"platform": "event", "event_type": "test_event_changed"},
+            }
+        }
         with patch(
             "homeassistant.config.load_yaml_config_file",
             autospec=True,
-            return_value=config,
+            return_value=changed_config,
         ):
             await hass.services.async_call(
                 automation.DOMAIN, SERVICE_RELOAD, blocking=True
@@ -688,6 +694,66 @@ async def test_automation_stops(hass, calls, service):
     assert len(calls) == (1 if service == "turn_off_no_stop" else 0)
 
 
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test reloading only replaces the automations whose config changed."""
+    hello = {
+        "alias": "hello",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": [
+            {"event": "running"},
+            {"wait_template": "{{ is_state('test.entity', 'goodbye') }}"},
+            {"service": "test.automation"},
+        ],
+    }
+    bye = {
+        "alias": "bye",
+        "trigger": {"platform": "event", "event_type": "test_event_bye"},
+        "action": {"service": "test.automation"},
+    }
+    assert await async_setup_component(
+        hass, automation.DOMAIN, {automation.DOMAIN: [hello, bye]}
+    )
+    component = hass.data[automation.DOMAIN]
+    hello_entity = component.get_entity("automation.hello")
+    bye_entity = component.get_entity("automation.bye")
+
+    running = asyncio.Event()
+
+    @callback
+    def running_cb(event):
+        running.set()
+
+    hass.bus.async_listen_once("running", running_cb)
+    hass.states.async_set("test.entity", "hello")
+
+    hass.bus.async_fire("test_event")
+    await running.wait()
+
+    changed_bye = {**bye, "trigger": {"platform": "event", "event_type": "bye"}}
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: [hello, changed_bye]},
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert component.get_entity("automation.hello") is hello_entity
+    assert component.get_entity("automation.bye") is not bye_entity
+    assert hass.states.get("automation.hello").attributes["current"] == 1
+
+    hass.states.async_set("test.entity", "goodbye")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.bus.async_fire("test_event_bye")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.bus.async_fire("bye")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
 async def test_automation_restore_state(hass):
     """Ensure states are restored on startup."""
     time = dt_util.utcnow()
@@ -1131,6 +1197,52 @@ async def test_extraction_functions(hass):
     }
 
 
+async def test_extraction_functions_after_reload(hass):
+    """Test the extraction functions reflect reloaded automations."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: {
+                "alias": "hello",
+                "trigger": {"platform": "state", "entity_id": "light.old"},
+                "action": {
+                    "service": "test.automation",
+                    "target": {"area_id": "area-old"},
+                },
+            }
+        },
+    )
+    assert automation.automations_with_entity(hass, "light.old") == ["automation.hello"]
+    assert automation.automations_with_area(hass, "area-old") == ["automation.hello"]
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={
+            automation.DOMAIN: {
+                "alias": "hello",
+                "trigger": {"platform": "state", "entity_id": "light.new"},
+                "action": {"service": "test.automation"},
+            }
+        },
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert automation.automations_with_entity(hass, "light.old") == []
+    assert automation.automations_with_area(hass, "area-old") == []
+    assert automation.automations_with_entity(hass, "light.new") == ["automation.hello"]
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: []},
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert automation.automations_with_entity(hass, "light.new") == []
+
+
 async def test_logbook_humanify_automation_triggered_event(hass):
     """Test humanifying Automation Trigger event."""
     hass.config.components.add("recorder")
@@ -17,7 +17,6 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import CoreState
-from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component
 
 from tests.common import assert_setup_component
@@ -439,11 +438,11 @@ async def test_reloading_groups(hass):
         "group.second_group",
         "group.test_group",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    keyed_listeners = hass.bus.async_keyed_listeners("state_changed")
+    assert keyed_listeners["hello.world"] == 1
+    assert keyed_listeners["light.bowl"] == 1
+    assert keyed_listeners["test.one"] == 1
+    assert keyed_listeners["test.two"] == 1
 
     with patch(
         "homeassistant.config.load_yaml_config_file",
@@ -458,10 +457,11 @@ async def test_reloading_groups(hass):
         "group.all_tests",
         "group.hello",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    keyed_listeners = hass.bus.async_keyed_listeners("state_changed")
+    assert "hello.world" not in keyed_listeners
+    assert keyed_listeners["light.bowl"] == 1
+    assert keyed_listeners["test.one"] == 1
+    assert keyed_listeners["test.two"] == 1
 
 
 async def test_modify_group(hass):
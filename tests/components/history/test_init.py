@@ -1,15 +1,23 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
+from collections import defaultdict
 from datetime import timedelta
 import json
 from unittest.mock import patch, sentinel
 
+from aiohttp import web
 import pytest
 from pytest import approx
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.history import (
+    get_significant_states,
+    stream_compact_states,
+    stream_significant_states,
+)
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component
@@ -489,6 +497,91 @@ def test_get_significant_states_only(hass_history):
     assert states == hist[entity_id]
 
 
+@pytest.mark.parametrize("minimal_response", [False, True])
+def test_stream_significant_states(hass_history, minimal_response):
+    """Test streaming significant states matches the full result."""
+    hass = hass_history
+    zero, four, _ = record_states(hass)
+
+    # Starting later gives entities which only have a start time state
+    for start in (zero, zero + timedelta(seconds=2)):
+        hist = get_significant_states(
+            hass,
+            start,
+            four,
+            filters=history.Filters(),
+            minimal_response=minimal_response,
+        )
+        streamed = defaultdict(list)
+        entity_ids = []
+        with patch(
+            "homeassistant.components.recorder.history.STREAM_CHUNK_SIZE", 1
+        ), session_scope(hass=hass) as session:
+            for entity_id, states in stream_significant_states(
+                hass,
+                session,
+                start,
+                four,
+                filters=history.Filters(),
+                minimal_response=minimal_response,
+            ):
+                assert len(states) == 1
+                if not entity_ids or entity_ids[-1] != entity_id:
+                    entity_ids.append(entity_id)
+                streamed[entity_id].extend(states)
+
+        # Every entity once, the entities with rows sorted by the database
+        assert sorted(entity_ids) == sorted(hist)
+        assert streamed == hist
+
+
+def test_stream_compact_states(hass_history):
+    """Test the compact format holds the same states as the full result."""
+    hass = hass_history
+    zero, four, _ = record_states(hass)
+
+    for start in (zero, zero + timedelta(seconds=2)):
+        hist = get_significant_states(hass, start, four, filters=history.Filters())
+        with session_scope(hass=hass) as session:
+            compact = dict(
+                stream_compact_states(
+                    hass, session, start, four, filters=history.Filters()
+                )
+            )
+        assert sorted(compact) == sorted(hist)
+
+        for entity_id, compact_states in compact.items():
+            states = hist[entity_id]
+            assert compact_states["states"] == [state.state for state in states]
+
+            last_changed = 0
+            attribute_changes = dict(compact_states["attributes"])
+            for idx, state in enumerate(states):
+                last_changed += compact_states["last_changed"][idx]
+                last_updated = last_changed + compact_states["last_updated"][idx]
+                assert last_changed == approx(state.last_changed.timestamp())
+                assert last_updated == approx(state.last_updated.timestamp())
+                if idx in attribute_changes:
+                    attributes = attribute_changes[idx]
+                assert attributes == dict(state.attributes)
+
+    with session_scope(hass=hass) as session:
+        compact = dict(
+            stream_compact_states(
+                hass,
+                session,
+                zero,
+                four,
+                filters=history.Filters(),
+                minimal_response=True,
+            )
+        )
+    assert compact["media_player.test"]["states"] == ["idle", "YouTube", "Netflix"]
+    assert "attributes" not in compact["media_player.test"]
+    assert compact["thermostat.test"]["states"] == ["20", "21", "21"]
+    assert len(compact["thermostat.test"]["attributes"]) == 3
+
+
 def check_significant_states(hass, zero, four, states, config):
     """Check if significant states are retrieved."""
     filters = history.Filters()
@@ -792,6 +885,84 @@ async def test_entity_ids_limit_via_api(hass, hass_client):
     assert response_json[1][0]["entity_id"] == "light.cow"
 
 
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streaming the response."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?minimal_response"
+    )
+    assert response.status == 200
+    expected = sorted(await response.json(), key=lambda states: states[0]["entity_id"])
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?minimal_response&stream"
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert response_json == expected
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "light.cow",
+        "light.kitchen",
+    ]
+    assert len(response_json[1]) == 2
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?skip_initial_state&stream"
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_compact(hass, hass_client):
+    """Test the fetch period view with the compact format."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100})
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(f"/api/history/period/{start.isoformat()}?compact")
+    assert response.status == 200
+    response_json = await response.json()
+    assert list(response_json) == ["light.cow", "light.kitchen"]
+    assert response_json["light.kitchen"]["states"] == ["on", "off"]
+    assert response_json["light.kitchen"]["last_updated"] == [0, 0]
+    assert response_json["light.kitchen"]["attributes"] == [[0, {"brightness": 100}]]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?compact&stream"
+    )
+    assert response.status == 200
+    assert await response.json() == response_json
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?compact&stream&skip_initial_state"
+    )
+    assert response.status == 200
+    assert await response.json() == {}
+
+
 async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_client):
     """Test limiting history to entity_ids with skip_initial_state."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -942,6 +1113,111 @@ async def test_statistics_during_period_bad_start_time(hass, hass_ws_client):
     assert response["error"]["code"] == "invalid_start_time"
 
 
+async def test_history_stream(hass, hass_ws_client):
+    """Test history/stream."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    with patch("homeassistant.components.recorder.history.STREAM_CHUNK_SIZE", 1):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": start.isoformat(),
+                "entity_ids": ["light.kitchen", "light.cow"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        events = []
+        while not (response := await client.receive_json())["event"].get("done"):
+            assert response["id"] == 1
+            events.append(response["event"])
+
+    assert [
+        (event["entity_id"], [state["state"] for state in event["states"]])
+        for event in events
+    ] == [
+        ("light.cow", ["on"]),
+        ("light.kitchen", ["on"]),
+        ("light.kitchen", ["off"]),
+    ]
+
+
+async def test_history_stream_slow_client(hass, hass_ws_client):
+    """Test history/stream waits for a client that reads slower than it sends."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    entity_ids = [f"light.light_{idx}" for idx in range(30)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    send_str = web.WebSocketResponse.send_str
+
+    async def slow_send_str(self, data, *args, **kwargs):
+        await asyncio.sleep(0.005)
+        return await send_str(self, data, *args, **kwargs)
+
+    with patch(
+        "homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 10
+    ), patch("homeassistant.components.websocket_api.http.PENDING_MSG_DRAIN", 5), patch(
+        "homeassistant.components.websocket_api.http.PENDING_MSG_DRAIN_INTERVAL", 0.001
+    ), patch(
+        "homeassistant.components.recorder.history.STREAM_CHUNK_SIZE", 1
+    ), patch.object(
+        web.WebSocketResponse, "send_str", slow_send_str
+    ):
+        client = await hass_ws_client()
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": start.isoformat(),
+                "entity_ids": entity_ids,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        events = []
+        while not (response := await client.receive_json())["event"].get("done"):
+            events.append(response["event"])
+
+    assert sorted(event["entity_id"] for event in events) == sorted(entity_ids)
+
+
+async def test_history_stream_bad_start_time(hass, hass_ws_client):
+    """Test history/stream with a bad start time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/stream", "start_time": "cats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_statistics_during_period_bad_end_time(hass, hass_ws_client):
     """Test statistics_during_period."""
     now = dt_util.utcnow()
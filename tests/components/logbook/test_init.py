@@ -1,9 +1,10 @@
 """The tests for the logbook component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
 import collections
 from datetime import datetime, timedelta
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 import voluptuous as vol
@@ -1834,6 +1835,268 @@ async def test_context_filter(hass, hass_client):
     assert response.status == 400
 
 
+async def test_logbook_stream(hass, hass_client, hass_ws_client):
+    """Test streamed entries are the same as the entries of a response."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    context = ha.Context()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    hass.states.async_set("switch.blu", None)
+    hass.states.async_set("switch.blu", "on", context=context)
+    hass.states.async_set("light.kitchen", None)
+    hass.states.async_set("light.kitchen", "on", context=context)
+
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    entries = await _async_fetch_logbook(client)
+    assert len(entries) == 3
+    assert entries[2]["context_entity_id"] == "switch.blu"
+
+    with patch.object(logbook, "STREAM_CHUNK_SIZE", 2):
+        assert await _async_fetch_logbook(client, {"stream": ""}) == entries
+
+        ws_client = await hass_ws_client()
+        await ws_client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/stream",
+                "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+            }
+        )
+        msg = await ws_client.receive_json()
+        assert msg["success"]
+
+        streamed = []
+        while "events" in (msg := await ws_client.receive_json())["event"]:
+            assert len(msg["event"]["events"]) <= 2
+            streamed.extend(msg["event"]["events"])
+
+    assert msg["event"] == {"done": True}
+    assert streamed == entries
+
+
+async def test_logbook_event_stream(hass, hass_ws_client):
+    """Test entries in the database are sent and then live entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    ws_client = await hass_ws_client()
+    # Not committed by the recorder yet when subscribing
+    hass.states.async_set("switch.blu", None)
+    hass.states.async_set("switch.blu", "on")
+    await hass.async_block_till_done()
+
+    await ws_client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+        }
+    )
+    msg = await ws_client.receive_json()
+    assert msg["success"]
+
+    msg = await ws_client.receive_json()
+    assert len(msg["event"]["events"]) == 1
+    _assert_entry(msg["event"]["events"][0], entity_id="switch.blu", state="on")
+    msg = await ws_client.receive_json()
+    assert msg["event"] == {"live": True}
+
+    context = ha.Context()
+    hass.states.async_set("switch.blu", "off", context=context)
+    # Attribute changes and continuous sensors are not in the logbook
+    hass.states.async_set("switch.blu", "off", {"icon": "mdi:switch"})
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("light.kitchen", None)
+    hass.states.async_set("light.kitchen", "on", context=context)
+    await hass.async_block_till_done()
+
+    msg = await ws_client.receive_json()
+    assert msg["id"] == 1
+    _assert_entry(msg["event"]["events"][0], entity_id="switch.blu", state="off")
+    msg = await ws_client.receive_json()
+    entry = msg["event"]["events"][0]
+    _assert_entry(entry, entity_id="light.kitchen", state="on")
+    assert entry["context_entity_id"] == "switch.blu"
+    assert entry["context_event_type"] == EVENT_STATE_CHANGED
+
+    logbook.async_log_entry(hass, "Alarm", "is triggered", "switch")
+    await hass.async_block_till_done()
+    msg = await ws_client.receive_json()
+    _assert_entry(
+        msg["event"]["events"][0],
+        name="Alarm",
+        message="is triggered",
+        domain="switch",
+    )
+
+    await ws_client.send_json(
+        {"id": 2, "type": "unsubscribe_events", "subscription": 1}
+    )
+    msg = await ws_client.receive_json()
+    assert msg["id"] == 2
+    assert msg["success"]
+
+    hass.states.async_set("switch.blu", "on")
+    await hass.async_block_till_done()
+    await ws_client.send_json({"id": 3, "type": "ping"})
+    msg = await ws_client.receive_json()
+    assert msg["id"] == 3
+
+
+async def test_logbook_event_stream_recorder_stuck(hass, hass_ws_client):
+    """Test the event stream goes live when the recorder doesn't commit in time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    async def _never_done():
+        await asyncio.Event().wait()
+
+    ws_client = await hass_ws_client()
+    with patch.object(logbook, "RECORDER_COMMIT_TIMEOUT", 0.1), patch.object(
+        hass.data[recorder.DATA_INSTANCE],
+        "async_block_till_done",
+        side_effect=_never_done,
+    ):
+        await ws_client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/event_stream",
+                "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+            }
+        )
+        msg = await ws_client.receive_json()
+        assert msg["success"]
+
+        msg = await ws_client.receive_json()
+        assert msg["event"] == {"live": True}
+
+
+async def test_logbook_context_before_window(hass, hass_client):
+    """Test parent contexts that started before the period are looked up."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await async_setup_component(hass, "automation", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    context = ha.Context()
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    await _async_commit_and_wait(hass)
+
+    start_time = dt_util.utcnow()
+    hass.states.async_set("switch.blu", None)
+    hass.states.async_set("switch.blu", "on", context=ha.Context(parent_id=context.id))
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    response = await client.get(f"/api/logbook/{start_time.isoformat()}")
+    assert response.status == 200
+    entries = await response.json()
+
+    assert len(entries) == 1
+    _assert_entry(entries[0], entity_id="switch.blu", state="on")
+    assert entries[0]["context_event_type"] == EVENT_AUTOMATION_TRIGGERED
+    assert entries[0]["context_entity_id"] == "automation.alarm"
+
+
+def test_context_lookup_evicts_old_contexts():
+    """Test the context lookup keeps contexts of recent events in memory."""
+    start_time = dt_util.utcnow()
+    lookup = logbook.ContextLookup(Mock(), start_time)
+
+    def _event(context_id, minutes):
+        return Mock(
+            context_id=context_id, time_fired=start_time + timedelta(minutes=minutes)
+        )
+
+    first = _event("first", 1)
+    lookup.add(first)
+    lookup.add(_event("first", 2))
+    assert lookup.get("first") is first
+    assert lookup.get(None) is None
+
+    second = _event("second", 90)
+    lookup.add(second)
+    # Contexts are only evicted once the entries are made
+    assert lookup.get("first") is first
+    lookup.evict(second.time_fired)
+
+    db_event = Mock()
+    with patch.object(lookup, "_lookup", return_value=db_event) as mock_lookup:
+        assert lookup.get("second") is second
+        assert lookup.get("first") is db_event
+        assert lookup.get("first") is db_event
+
+    assert mock_lookup.mock_calls == [call("first")]
+    assert lookup._horizon == first.time_fired
+
+    # Later events of an evicted context are not its first event
+    lookup.add(_event("first", 91))
+    assert lookup.get("first") is db_event
+
+    # The ids of contexts that are still running are remembered longest
+    with patch.object(logbook, "CONTEXT_LOOKUP_EVICTED_SIZE", 2):
+        lookup.evict(start_time + timedelta(minutes=200))
+        assert list(lookup._evicted) == ["first", "second"]
+        lookup.add(_event("first", 201))
+        lookup.add(_event("third", 202))
+        lookup.evict(start_time + timedelta(minutes=400))
+    assert list(lookup._evicted) == ["first", "third"]
+
+
+async def test_logbook_context_lookup_with_gaps(hass, hass_client):
+    """Test contexts are kept for entries after gaps longer than the window."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    now = dt_util.utcnow()
+    context = ha.Context()
+    hass.states.async_set("light.a", None)
+    hass.states.async_set("switch.blu", None)
+    for minutes, entity_id, state, state_context in (
+        (-10, "light.a", "off", None),
+        (0, "light.a", "on", None),
+        (1, "switch.blu", "on", context),
+        (80, "light.a", "off", None),
+        (160, "light.a", "on", context),
+    ):
+        with patch(
+            "homeassistant.core.dt_util.utcnow",
+            return_value=now + timedelta(minutes=minutes),
+        ):
+            hass.states.async_set(entity_id, state, context=state_context)
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    entries = await _async_fetch_logbook(client)
+    assert [(entry["entity_id"], entry["state"]) for entry in entries] == [
+        ("light.a", "off"),
+        ("light.a", "on"),
+        ("switch.blu", "on"),
+        ("light.a", "off"),
+        ("light.a", "on"),
+    ]
+    assert ["context_entity_id" in entry for entry in entries] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert entries[4]["context_entity_id"] == "switch.blu"
+
+
 async def _async_fetch_logbook(client, params=None):
     if params is None:
         params = {}
@@ -7,6 +7,7 @@ from homeassistant import setup
 from homeassistant.components.profiler import (
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_JOB_METRICS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_MEMORY,
@@ -16,6 +17,7 @@ from homeassistant.components.profiler import (
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -192,3 +194,37 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_job_metrics(hass, caplog):
+    """Test we can record and log job metrics."""
+
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_JOB_METRICS)
+
+    @callback
+    def _slow_callback():
+        """Run as a job."""
+
+    async def _record_jobs(*_):
+        hass.async_run_job(_slow_callback)
+
+    with patch(
+        "homeassistant.components.profiler.asyncio.sleep", side_effect=_record_jobs
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_JOB_METRICS, {CONF_SECONDS: 0.000001}, blocking=True
+        )
+
+    assert "_slow_callback (Callback): 1 runs" in caplog.text
+    assert "Event loop lag max" in caplog.text
+    assert hass.job_metrics is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
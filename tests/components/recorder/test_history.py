@@ -3,7 +3,7 @@
 from copy import copy
 from datetime import timedelta
 import json
-from unittest.mock import patch, sentinel
+from unittest.mock import Mock, patch, sentinel
 
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.models import process_timestamp
@@ -307,6 +307,34 @@ def test_get_significant_states_are_ordered(hass_recorder):
     assert list(hist.keys()) == entity_ids
 
 
+def test_group_by_entity_id_in_database_order():
+    """Test start time states are paired with rows in the database order."""
+    # MySQL's utf8mb4_unicode_ci sorts _ before .
+    rows = [
+        Mock(entity_id="sensor_x.temp", state="1"),
+        Mock(entity_id="sensor_x.temp", state="2"),
+        Mock(entity_id="sensor.temp", state="3"),
+    ]
+    start_time_states = {
+        "sensor.temp": sentinel.sensor,
+        "sensor_x.temp": sentinel.sensor_x,
+        "a.only_start": sentinel.only_start,
+    }
+
+    grouped = [
+        (ent_id, start_time_state, [row.state for row in group])
+        for ent_id, start_time_state, group in history._group_by_entity_id(
+            rows, start_time_states
+        )
+    ]
+
+    assert grouped == [
+        ("sensor_x.temp", sentinel.sensor_x, ["1", "2"]),
+        ("sensor.temp", sentinel.sensor, ["3"]),
+        ("a.only_start", sentinel.only_start, []),
+    ]
+
+
 def test_get_significant_states_only(hass_recorder):
     """Test significant states when significant_states_only is set."""
     hass = hass_recorder()
@@ -1,5 +1,6 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
+import asyncio
 from datetime import datetime, timedelta
 import sqlite3
 from unittest.mock import patch
@@ -25,7 +26,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -141,6 +147,66 @@ async def test_saving_state(
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_async_block_till_done(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test waiting for the events received so far to be committed."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("test.recorder", "on")
+    await hass.async_block_till_done()
+    await instance.async_block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+
+    # The wait ends when the commit fails
+    hass.states.async_set("test.recorder", "off")
+    await hass.async_block_till_done()
+    with patch.object(
+        instance, "_commit_event_session_or_retry", side_effect=SQLAlchemyError
+    ):
+        await asyncio.wait_for(instance.async_block_till_done(), 5)
+
+    # The wait is skipped when the recorder is not processing its queue
+    instance.async_recorder_ready.clear()
+    with patch(
+        "homeassistant.components.recorder.SynchronizeTask"
+    ) as mock_synchronize_task:
+        await instance.async_block_till_done()
+    assert mock_synchronize_task.mock_calls == []
+
+
+async def test_saving_states_shares_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with identical attributes share one attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.recorder", "on", attributes)
+    hass.states.async_set("test.recorder", "off", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.recorder", "on", attributes)
+    hass.states.async_set("test.other", "on", {"test_attr": 6})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 4
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert (
+            db_states[0].attributes_id
+            == db_states[1].attributes_id
+            == db_states[2].attributes_id
+        )
+        assert db_states[3].attributes_id != db_states[0].attributes_id
+        assert session.query(StateAttributes).count() == 2
+        assert db_states[2].to_native().attributes == attributes
+        assert db_states[3].to_native().attributes == {"test_attr": 6}
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -761,6 +827,127 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_states_bulk_insert(hass_recorder):
+    """Test saving states with the bulk insert path."""
+    hass = hass_recorder({"bulk_insert": True})
+    assert hass.data[DATA_INSTANCE]._bulk_writer is not None
+
+    hass.states.set("test.one", "on", {"shared": True})
+    hass.states.set("test.two", "on", {"shared": True})
+    hass.bus.fire("bulk_event", {"some": "data"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"shared": True})
+    hass.states.remove("test.two")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 4
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[3].state is None
+
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[2].attributes_id
+        assert session.query(StateAttributes).count() == 2
+        assert states[2].to_native().attributes == {"shared": True}
+
+        for state in states:
+            event = session.query(Events).filter_by(event_id=state.event_id).one()
+            assert event.event_type == "state_changed"
+
+        event = session.query(Events).filter_by(event_type="bulk_event").one()
+        assert event.to_native().data == {"some": "data"}
+
+
+def test_bulk_insert_unsupported_dialect():
+    """Test the bulk insert path is only used for supported dialects."""
+    assert recorder.bulk_insert_supported("sqlite")
+    assert recorder.bulk_insert_supported("mysql")
+    assert not recorder.bulk_insert_supported("postgresql")
+
+
+def test_coalesce_state_changes(hass_recorder):
+    """Test attribute only updates are coalesced within a commit window."""
+    hass = hass_recorder({"coalesce_state_changes": True})
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.one", "on", {"value": 1})
+    hass.states.set("test.one", "on", {"value": 2})
+    hass.states.set("test.two", "on", {"value": 1})
+    hass.states.set("test.one", "on", {"value": 3})
+    hass.states.set("test.one", "on", {"value": 4})
+    hass.states.set("test.one", "off", {"value": 4})
+    hass.states.set("test.two", "on", {"value": 2})
+    hass.states.set("test.two", "on", {"value": 2}, force_update=True)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = [
+            (state.entity_id, state.state, state.to_native().attributes["value"])
+            for state in session.query(States).order_by(States.event_id)
+        ]
+    assert states == [
+        ("test.one", "on", 1),
+        ("test.two", "on", 1),
+        ("test.one", "on", 4),
+        ("test.one", "off", 4),
+        ("test.two", "on", 2),
+        ("test.two", "on", 2),
+    ]
+    assert instance.coalesced_state_changes == 2
+
+
+def test_recorder_metric_sensors(hass_recorder):
+    """Test the recorder metric sensors are updated and not recorded."""
+    hass = hass_recorder({"max_queue_backlog": 100, "metric_sensors": True})
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.max_queue_backlog == 100
+    wait_recording_done(hass)
+
+    hass.states.set("test.one", "on", {})
+    hass.bus.fire("metric_event")
+    wait_recording_done(hass)
+
+    assert instance.rows_per_commit == 3
+    assert instance.commit_latency > 0
+    assert instance.oldest_pending_event_age == 0
+
+    for entity_id in (
+        "sensor.recorder_queue_depth",
+        "sensor.recorder_commit_latency",
+        "sensor.recorder_rows_per_commit",
+        "sensor.recorder_oldest_event_age",
+    ):
+        assert entity_id in instance.metrics_entity_ids
+        assert hass.states.get(entity_id) is not None
+
+    hass.add_job(
+        hass.data["entity_components"]["sensor"]
+        .get_entity("sensor.recorder_rows_per_commit")
+        .async_update_ha_state(True)
+    )
+    wait_recording_done(hass)
+    assert hass.states.get("sensor.recorder_rows_per_commit").state == "3"
+
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(States)
+            .filter(States.entity_id.like("sensor.recorder_%"))
+            .count()
+            == 0
+        )
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -293,6 +293,41 @@ def test_forgiving_add_column():
         migration._add_columns(session, "hello", ["context_id CHARACTER(36)"])
 
 
+def test_backfill_events_entity_id():
+    """Test the entity_id of existing events is extracted from the event data."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    event_data = {
+        "logbook_entry": '{"name": "Alarm", "entity_id": "switch.alarm"}',
+        "automation_triggered": '{"entity_id":"automation.alarm"}',
+        "script_started": '{\n    "name": "Script",\n    "entity_id" : "script.x"\n}',
+        "call_service": '{"service_data": {"entity_id": ["light.a", "light.b"]}}',
+        "state_changed": '{"entity_id": "light.kitchen"}',
+        "invalid_json": '{"entity_id": "light.kitchen"',
+        "no_entity": "{}",
+    }
+    with Session(engine) as session:
+        for event_type, data in event_data.items():
+            session.add(models.Events(event_type=event_type, event_data=data))
+        session.commit()
+
+        with patch.object(migration, "BACKFILL_BATCH_SIZE", 2):
+            migration._backfill_events_entity_id(session.connection())
+        session.commit()
+
+        assert dict(
+            session.query(models.Events.event_type, models.Events.entity_id)
+        ) == {
+            "logbook_entry": "switch.alarm",
+            "automation_triggered": "automation.alarm",
+            "script_started": "script.x",
+            "call_service": None,
+            "state_changed": None,
+            "invalid_json": None,
+            "no_entity": None,
+        }
+
+
 def test_forgiving_add_index():
     """Test that add index will continue if index exists."""
     engine = create_engine("sqlite://", poolclass=StaticPool)
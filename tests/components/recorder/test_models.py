@@ -1,5 +1,6 @@
 """The tests for the Recorder component."""
 from datetime import datetime
+import math
 
 import pytest
 from sqlalchemy import create_engine
@@ -9,6 +10,7 @@ from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -26,6 +28,18 @@ def test_from_event_to_db_event():
     assert event == Events.from_event(event).to_native()
 
 
+def test_from_event_to_db_event_entity_id():
+    """Test the entity_id of an event is extracted from the event data."""
+    event = ha.Event("test_event", {"entity_id": "light.kitchen"})
+    assert Events.from_event(event).entity_id == "light.kitchen"
+
+    event = ha.Event("test_event", {"entity_id": ["light.kitchen", "light.hall"]})
+    assert Events.from_event(event).entity_id is None
+
+    event = ha.Event(EVENT_STATE_CHANGED, {"entity_id": "light.kitchen"})
+    assert Events.from_event(event, event_data="{}").entity_id is None
+
+
 def test_from_event_to_db_state():
     """Test converting event to db state."""
     state = ha.State("sensor.temperature", "18")
@@ -37,7 +51,40 @@ def test_from_event_to_db_state():
     # We don't restore context unless we need it by joining the
     # events table on the event_id for state_changed events
     state.context = ha.Context(id=None)
-    assert state == States.from_event(event).to_native()
+    db_state = States.from_event(event)
+    db_state.state_attributes = StateAttributes.from_event(event)
+    assert state == db_state.to_native()
+
+
+def test_from_event_to_db_state_attributes():
+    """Test converting event to db state attributes."""
+    attrs = {"this_attr": True}
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    assert db_attrs.to_native() == attrs
+    assert db_attrs.hash == StateAttributes.hash_shared_attrs(db_attrs.shared_attrs)
+
+
+def test_from_event_to_db_state_attributes_nan():
+    """Test state attributes and event data with NaN survive a round trip."""
+    state = ha.State("sensor.temperature", "18", {"value": float("NaN"), "other": 1})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    attrs = db_attrs.to_native()
+    assert math.isnan(attrs["value"])
+    assert attrs["other"] == 1
+
+    event = ha.Event("test_event", {"value": float("inf")})
+    assert Events.from_event(event).to_native().data == {"value": float("inf")}
 
 
 def test_from_event_to_delete_state():
@@ -57,6 +104,7 @@ def test_from_event_to_delete_state():
     assert db_state.state == ""
     assert db_state.last_changed == event.time_fired
     assert db_state.last_updated == event.time_fired
+    assert StateAttributes.from_event(event).shared_attrs == "{}"
 
 
 def test_entity_ids():
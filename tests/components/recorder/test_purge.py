@@ -4,17 +4,27 @@ import json
 import sqlite3
 from unittest.mock import MagicMock, patch
 
+import pytest
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import PurgeTask
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.const import (
+    EVENT_RECORDER_PURGE_PROGRESS,
+    MAX_ROWS_TO_PURGE,
+)
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.repack import repack_worthwhile
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -61,6 +71,104 @@ async def test_purge_old_states(
         assert states.count() == 2
 
 
+async def test_purge_old_states_removes_unused_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test shared attributes are deleted once no state references them."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+
+    with recorder.session_scope(hass=hass) as session:
+        old_attributes = StateAttributes(shared_attrs='{"old":true}', hash=1)
+        shared_attributes = StateAttributes(shared_attrs='{"shared":true}', hash=2)
+        for event_id, (timestamp, attributes) in enumerate(
+            (
+                (eleven_days_ago, old_attributes),
+                (eleven_days_ago, shared_attributes),
+                (utcnow, shared_attributes),
+            ),
+            start=1000,
+        ):
+            session.add(
+                Events(
+                    event_id=event_id,
+                    event_type=EVENT_STATE_CHANGED,
+                    event_data="{}",
+                    origin="LOCAL",
+                    created=timestamp,
+                    time_fired=timestamp,
+                )
+            )
+            session.add(
+                States(
+                    entity_id="sensor.test",
+                    domain="sensor",
+                    state="on",
+                    state_attributes=attributes,
+                    last_changed=timestamp,
+                    last_updated=timestamp,
+                    created=timestamp,
+                    event_id=event_id,
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+
+        assert session.query(States).count() == 1
+        attributes = session.query(StateAttributes).all()
+        assert len(attributes) == 1
+        assert attributes[0].shared_attrs == '{"shared":true}'
+
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+async def test_purge_keeps_attributes_of_pending_states(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    bulk_insert: bool,
+):
+    """Test the purge keeps shared attributes used by states not yet committed."""
+    instance = await async_setup_recorder_instance(hass, {"bulk_insert": bulk_insert})
+
+    hass.states.async_set("sensor.old", "on", {"shared": True})
+    await async_wait_recording_done(hass, instance)
+
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+    with session_scope(hass=hass) as session:
+        session.query(States).update(
+            {"last_updated": eleven_days_ago, "created": eleven_days_ago},
+            synchronize_session=False,
+        )
+        session.query(Events).update(
+            {"time_fired": eleven_days_ago, "created": eleven_days_ago},
+            synchronize_session=False,
+        )
+
+    # The new state reuses the cached attributes id of the old state
+    # and is still pending when the purge runs
+    hass.states.async_set("sensor.new", "on", {"shared": True})
+    await hass.async_block_till_done()
+    instance.queue.put(PurgeTask(dt_util.utcnow() - timedelta(days=4), False, False))
+    await async_wait_purge_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States).all()
+        assert [state.entity_id for state in states] == ["sensor.new"]
+        attributes = (
+            session.query(StateAttributes)
+            .filter(StateAttributes.attributes_id == states[0].attributes_id)
+            .one()
+        )
+        assert json.loads(attributes.shared_attrs) == {"shared": True}
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -273,6 +381,127 @@ async def test_purge_method(
         assert "Vacuuming SQL DB to free space" in caplog.text
 
 
+async def test_purge_progress_event(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purge progress is reported with an event that is not recorded."""
+    instance = await async_setup_recorder_instance(hass)
+    await _add_test_states(hass, instance)
+
+    progress = []
+
+    @callback
+    def _progress_listener(event):
+        progress.append(event.data)
+
+    hass.bus.async_listen(EVENT_RECORDER_PURGE_PROGRESS, _progress_listener)
+
+    await hass.services.async_call("recorder", "purge", {"keep_days": 4})
+    await hass.async_block_till_done()
+    await async_wait_purge_done(hass, instance)
+    await hass.async_block_till_done()
+
+    assert progress
+    assert progress[-1]["done"] is True
+    assert progress[-1]["states"] == 4
+    assert progress[-1]["events"] == 4
+    assert progress[-1]["rows_per_second"] >= 0
+    assert instance.purge_progress is None
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(
+            Events.event_type == EVENT_RECORDER_PURGE_PROGRESS
+        )
+        assert events.count() == 0
+
+
+async def test_purge_progress_per_purge(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test overlapping purges each report their own progress."""
+    instance = await async_setup_recorder_instance(hass)
+
+    first = dt_util.utcnow() - timedelta(days=4)
+    second = dt_util.utcnow() - timedelta(days=2)
+    batches = {first: 3, second: 2}
+
+    def _purge_one_batch(instance, purge_before, *args):
+        instance.purge_progress.states += 1
+        batches[purge_before] -= 1
+        return batches[purge_before] == 0
+
+    progress = []
+
+    @callback
+    def _progress_listener(event):
+        progress.append(event.data)
+
+    hass.bus.async_listen(EVENT_RECORDER_PURGE_PROGRESS, _progress_listener)
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        side_effect=_purge_one_batch,
+    ), patch("homeassistant.components.recorder.PURGE_TIME_SLICE", 0):
+        instance.queue.put(PurgeTask(first, repack=False, apply_filter=False))
+        instance.queue.put(PurgeTask(second, repack=False, apply_filter=False))
+        await async_wait_purge_done(hass, instance)
+        await hass.async_block_till_done()
+
+    assert sorted(data["states"] for data in progress if data["done"]) == [2, 3]
+    assert instance.purge_progress is None
+
+
+async def test_purge_auto_repack(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    caplog,
+):
+    """Test the nightly purge only repacks when enough space is freed."""
+    instance = await async_setup_recorder_instance(hass)
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with patch(
+        "homeassistant.components.recorder.purge.repack_worthwhile",
+        return_value=False,
+    ):
+        instance.queue.put(
+            PurgeTask(purge_before, repack=False, apply_filter=False, auto_repack=True)
+        )
+        await async_wait_purge_done(hass, instance)
+    assert "Vacuuming SQL DB to free space" not in caplog.text
+
+    with patch(
+        "homeassistant.components.recorder.purge.repack_worthwhile",
+        return_value=True,
+    ):
+        instance.queue.put(
+            PurgeTask(purge_before, repack=False, apply_filter=False, auto_repack=True)
+        )
+        await async_wait_purge_done(hass, instance)
+    assert "Vacuuming SQL DB to free space" in caplog.text
+
+
+async def test_repack_worthwhile(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the free space ratio check used by the auto repack."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await async_wait_recording_done(hass, instance)
+
+    with patch(
+        "homeassistant.components.recorder.repack.AUTO_REPACK_MIN_FREE_RATIO", 0
+    ):
+        assert repack_worthwhile(instance)
+    with patch(
+        "homeassistant.components.recorder.repack.AUTO_REPACK_MIN_FREE_RATIO", 1.1
+    ):
+        assert not repack_worthwhile(instance)
+    with patch.object(instance.engine.dialect, "name", "postgresql"):
+        assert not repack_worthwhile(instance)
+
+
 async def test_purge_edge_case(
     hass: HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
@@ -1,17 +1,28 @@
 """The tests for sensor recorder platform."""
 # pylint: disable=protected-access,invalid-name
-from datetime import timedelta
-from unittest.mock import patch, sentinel
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch, sentinel
 
+import pytest
 from pytest import approx
+import voluptuous as vol
 
-from homeassistant.components.recorder import history
+from homeassistant.components.recorder import CONFIG_SCHEMA, history
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    Statistics,
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
+    process_timestamp_to_utc_isoformat,
+)
 from homeassistant.components.recorder.statistics import (
+    _rollup,
     get_last_statistics,
+    get_latest_statistics,
     statistics_during_period,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import TEMP_CELSIUS
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -93,6 +104,18 @@ def test_compile_hourly_statistics(hass_recorder):
     stats = get_last_statistics(hass, 1, "sensor.test3")
     assert stats == {}
 
+    # Test get_latest_statistics
+    stats = get_latest_statistics(
+        hass, ["sensor.test1", "sensor.test2", "sensor.test3"]
+    )
+    assert stats == {
+        "sensor.test1": [{**expected_2, "statistic_id": "sensor.test1"}],
+        "sensor.test2": [{**expected_2, "statistic_id": "sensor.test2"}],
+    }
+
+    stats = get_latest_statistics(hass, ["sensor.test3"])
+    assert stats == {}
+
 
 def test_rename_entity(hass_recorder):
     """Test statistics is migrated when entity_id is changed."""
@@ -144,13 +167,124 @@ def test_rename_entity(hass_recorder):
     stats = statistics_during_period(hass, zero)
     assert stats == {"sensor.test1": expected_stats1, "sensor.test2": expected_stats2}
 
+    assert "sensor.test1" in recorder.statistics_meta_ids
+
     entity_reg.async_update_entity(reg_entry.entity_id, new_entity_id="sensor.test99")
     hass.block_till_done()
+    wait_recording_done(hass)
+    assert "sensor.test1" not in recorder.statistics_meta_ids
 
     stats = statistics_during_period(hass, zero)
     assert stats == {"sensor.test99": expected_stats99, "sensor.test2": expected_stats2}
 
 
+@pytest.mark.parametrize(
+    "keep_days, valid",
+    [
+        ({"hour": 1}, False),
+        ({"hour": 2}, True),
+        ({"day": 7}, False),
+        ({"day": 32}, True),
+        ({"month": 1}, True),
+        ({"week": 7}, False),
+    ],
+)
+def test_statistics_keep_days_config(keep_days, valid):
+    """Test a tier must be kept long enough to roll up the next tier."""
+    config = {"recorder": {"statistics_keep_days": keep_days}}
+    if valid:
+        CONFIG_SCHEMA(config)
+    else:
+        with pytest.raises(vol.Invalid):
+            CONFIG_SCHEMA(config)
+
+
+def test_compile_statistics_rollups(hass_recorder):
+    """Test the daily and monthly tiers are rolled up from the hourly statistics."""
+    hass = hass_recorder({"statistics_keep_days": {"hour": 400}})
+    recorder = hass.data[DATA_INSTANCE]
+    today = dt_util.as_local(dt_util.utcnow()).date()
+    first_of_month = (today.replace(day=1) - timedelta(days=40)).replace(day=1)
+    month_start = dt_util.as_utc(dt_util.start_of_local_day(first_of_month))
+    day_start = dt_util.as_utc(
+        dt_util.start_of_local_day(first_of_month + timedelta(days=1))
+    )
+    hours = [day_start + timedelta(hours=hour) for hour in range(3)]
+    expired = day_start - timedelta(days=500)
+
+    with session_scope(hass=hass) as session:
+        meta = StatisticsMeta.from_meta("recorder", "sensor.test1", "kWh", True, True)
+        session.add(meta)
+        session.flush()
+        for start, mean, _sum in zip([expired, *hours], (1, 10, 20, 60), (1, 2, 3, 4)):
+            session.add(
+                Statistics.from_stats(
+                    meta.id,
+                    start,
+                    {
+                        "mean": mean,
+                        "min": mean - 1,
+                        "max": mean + 1,
+                        "state": _sum,
+                        "sum": _sum,
+                    },
+                )
+            )
+
+    recorder.do_adhoc_statistics(start=hours[-1])
+    wait_recording_done(hass)
+
+    expected = {
+        "statistic_id": "sensor.test1",
+        "mean": approx(30.0),
+        "min": approx(9.0),
+        "max": approx(61.0),
+        "last_reset": None,
+        "state": approx(4.0),
+        "sum": approx(4.0),
+    }
+    stats = statistics_during_period(hass, hours[1], period="day")
+    assert stats == {
+        "sensor.test1": [
+            {**expected, "start": process_timestamp_to_utc_isoformat(day_start)}
+        ]
+    }
+    stats = statistics_during_period(hass, day_start, period="month")
+    assert stats == {
+        "sensor.test1": [
+            {**expected, "start": process_timestamp_to_utc_isoformat(month_start)}
+        ]
+    }
+
+    # The expired hourly row is deleted, the rollups are kept
+    stats = statistics_during_period(hass, expired, period="hour")
+    assert len(stats["sensor.test1"]) == 3
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsDaily).count() == 1
+        assert session.query(StatisticsMonthly).count() == 1
+
+
+def test_rollup_weights_means_by_period_duration():
+    """Test the rolled up mean is weighted by the duration of each day."""
+    original_tz = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone("US/Pacific"))
+
+    # Naive UTC starts, as read from the database; DST starts on 2021-03-14
+    rows = [
+        Mock(start=datetime(2021, 3, 13, 8), mean=0, min=0, max=0),
+        Mock(start=datetime(2021, 3, 14, 8), mean=47, min=47, max=47),
+        Mock(start=datetime(2021, 3, 15, 7), mean=None, min=None, max=None),
+    ]
+    rollup = _rollup("day", rows)
+
+    dt_util.set_default_time_zone(original_tz)
+
+    # 24 hours of 0 and 23 hours of 47
+    assert rollup["mean"] == approx(23.0)
+    assert rollup["min"] == 0
+    assert rollup["max"] == 47
+
+
 def record_states(hass):
     """Record some test states.
 
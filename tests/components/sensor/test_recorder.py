@@ -13,6 +13,10 @@ from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
     statistics_during_period,
 )
+from homeassistant.components.sensor.recorder import (
+    DATA_STATISTICS_AGGREGATOR,
+    compile_statistics,
+)
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -606,6 +610,80 @@ def test_compile_hourly_statistics_unavailable(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_compile_hourly_statistics_incremental(hass_recorder, caplog):
+    """Test compiling hourly statistics from the incremental aggregator."""
+    zero = (dt_util.utcnow() + timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow",
+        return_value=zero - timedelta(minutes=10),
+    ):
+        hass.states.set("sensor.test1", "20", TEMPERATURE_SENSOR_ATTRIBUTES)
+        wait_recording_done(hass)
+    record_states(hass, zero, "sensor.test1", TEMPERATURE_SENSOR_ATTRIBUTES)
+    attributes = {**ENERGY_SENSOR_ATTRIBUTES, "last_reset": None}
+    seq = [10, 15, 20, 10, 30, 40, 50, 60, 70]
+    four, _, _ = record_energy_states(hass, zero, "sensor.test2", attributes, seq)
+
+    with patch(
+        "homeassistant.components.sensor.recorder.history.get_significant_states",
+        side_effect=AssertionError,
+    ):
+        for hour in range(3):
+            recorder.do_adhoc_statistics(
+                period="hourly", start=zero + timedelta(hours=hour)
+            )
+            wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, zero)
+    assert stats["sensor.test1"] == [
+        {
+            "statistic_id": "sensor.test1",
+            "start": process_timestamp_to_utc_isoformat(zero + timedelta(hours=hour)),
+            "mean": approx(mean),
+            "min": approx(min),
+            "max": approx(max),
+            "last_reset": None,
+            "state": None,
+            "sum": None,
+        }
+        for hour, mean, min, max in (
+            (0, 16.5, 10, 30),
+            (1, 30, 30, 30),
+            (2, 30, 30, 30),
+        )
+    ]
+    assert stats["sensor.test2"] == [
+        {
+            "statistic_id": "sensor.test2",
+            "start": process_timestamp_to_utc_isoformat(zero + timedelta(hours=hour)),
+            "max": None,
+            "mean": None,
+            "min": None,
+            "last_reset": process_timestamp_to_utc_isoformat(last_reset),
+            "state": approx(state),
+            "sum": approx(_sum),
+        }
+        for hour, last_reset, state, _sum in (
+            (0, zero, 20, 10),
+            (1, four, 40, 10),
+            (2, four, 70, 40),
+        )
+    ]
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+    # The statistics compiled from history match the aggregated statistics
+    aggregated = compile_statistics(hass, zero, zero + timedelta(hours=1))
+    aggregator = hass.data.pop(DATA_STATISTICS_AGGREGATOR)
+    compiled = compile_statistics(hass, zero, zero + timedelta(hours=1))
+    hass.data[DATA_STATISTICS_AGGREGATOR] = aggregator
+    assert aggregated["sensor.test1"] == compiled["sensor.test1"]
+
+
 def test_compile_hourly_statistics_fails(hass_recorder, caplog):
     """Test compiling hourly statistics throws."""
     zero = dt_util.utcnow()
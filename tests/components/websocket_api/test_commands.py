@@ -14,10 +14,11 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import URL
-from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.core import Context, ExecutorPool, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.polling import async_get_polling_scheduler
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
 
@@ -1189,3 +1190,80 @@ async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
         {"domain": "august", "seconds": 12.5},
         {"domain": "isy994", "seconds": 12.8},
     ]
+
+
+async def test_polling_slowest(hass, websocket_client):
+    """Test listing the slowest polled entities."""
+    scheduler = async_get_polling_scheduler(hass)
+    scheduler.async_record_update("sensor.fast", "sensor.demo", 0.1)
+    scheduler.async_record_update("sensor.slow", "sensor.demo", 2.5)
+    scheduler.async_record_update("sensor.slow", "sensor.demo", 1.5)
+
+    await websocket_client.send_json({"id": 5, "type": "polling/slowest", "limit": 1})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == [
+        {
+            "entity_id": "sensor.slow",
+            "platform": "sensor.demo",
+            "updates": 2,
+            "last_duration": 1.5,
+            "max_duration": 2.5,
+            "average_duration": 2.0,
+        }
+    ]
+
+
+async def test_job_metrics(hass, websocket_client):
+    """Test enabling, reading and disabling job metrics."""
+    await websocket_client.send_json({"id": 5, "type": "job_metrics"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {"enabled": False}
+
+    await websocket_client.send_json({"id": 6, "type": "job_metrics", "enabled": True})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["enabled"] is True
+    assert hass.job_metrics is not None
+
+    @callback
+    def job_metrics_callback():
+        """Run as a job."""
+
+    hass.async_add_job(job_metrics_callback)
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 7, "type": "job_metrics", "limit": 1})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert len(msg["result"]["targets"]) == 1
+    assert "loop_lag" in msg["result"]
+    assert "executor_queue_depth" in msg["result"]
+
+    await websocket_client.send_json({"id": 8, "type": "job_metrics", "enabled": False})
+    msg = await websocket_client.receive_json()
+    assert msg["result"] == {"enabled": False}
+    assert hass.job_metrics is None
+
+
+async def test_executor_pools(hass, websocket_client):
+    """Test listing the executor pool metrics."""
+    await hass.async_add_pool_executor_job(ExecutorPool.IO, lambda: None)
+
+    await websocket_client.send_json({"id": 5, "type": "executor_pools"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {
+        "io": {
+            "max_workers": 16,
+            "submitted": 1,
+            "running": 0,
+            "queued": 0,
+            "max_queued": 0,
+            "completed": 1,
+        }
+    }
@@ -1,9 +1,12 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
     cached_event_message,
+    event_message,
     message_to_json,
+    states_result_message,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import callback
@@ -78,18 +81,62 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_changed_event_message(hass):
+    """Test state changed event messages are built from the state JSON."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.window", "off")
+    hass.states.async_remove("light.window")
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+    lru_event_cache.cache_clear()
+
+    for event in events:
+        assert json.loads(cached_event_message(5, event)) == json.loads(
+            message_to_json(event_message(5, event))
+        )
+
+
+async def test_states_result_message(hass, caplog):
+    """Test a result message for states is built from the state JSON."""
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.door", "off")
+    states = hass.states.async_all()
+
+    assert json.loads(states_result_message(2, states)) == {
+        "id": 2,
+        "type": "result",
+        "success": True,
+        "result": [state.as_dict() for state in states],
+    }
+
+    hass.states.async_set("light.bad", "on", {"bad": object()})
+    msg = json.loads(states_result_message(3, hass.states.async_all()))
+    assert msg["success"] is False
+    assert "Unable to serialize to JSON" in caplog.text
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
     json_str = message_to_json({"id": 1, "message": "xyz"})
 
-    assert json_str == '{"id": 1, "message": "xyz"}'
+    assert json_str == '{"id":1,"message":"xyz"}'
 
     json_str2 = message_to_json({"id": 1, "message": _Unserializeable()})
 
     assert (
         json_str2
-        == '{"id": 1, "type": "result", "success": false, "error": {"code": "unknown_error", "message": "Invalid JSON in response"}}'
+        == '{"id":1,"type":"result","success":false,"error":{"code":"unknown_error","message":"Invalid JSON in response"}}'
     )
     assert "Unable to serialize to JSON" in caplog.text
 
@@ -788,3 +788,64 @@ async def test_float_conversion(hass):
     state = hass.states.get("hello.world")
     assert state is not None
     assert state.state == "3.6"
+
+
+async def test_write_state_reuses_attributes(hass):
+    """Test attributes are reused when only the state changes."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_icon = "mdi:power"
+    ent._attr_state = "1"
+    ent.async_write_ha_state()
+    first = hass.states.get("hello.world")
+
+    ent._attr_state = "2"
+    ent.async_write_ha_state()
+    second = hass.states.get("hello.world")
+    assert second.state == "2"
+    assert second.attributes is first.attributes
+
+    ent._attr_icon = "mdi:power-plug"
+    ent.async_write_ha_state()
+    third = hass.states.get("hello.world")
+    assert third.last_updated != second.last_updated
+    assert third.attributes == {"icon": "mdi:power-plug"}
+
+    with patch.object(
+        entity.Entity, "extra_state_attributes", PropertyMock(return_value={"a": 1})
+    ):
+        ent._attr_state = "3"
+        ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes == {
+        "icon": "mdi:power-plug",
+        "a": 1,
+    }
+
+    # Someone else wrote the state, it is restored on the next write
+    hass.states.async_set("hello.world", "3", {"other": True})
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes == {"icon": "mdi:power-plug"}
+
+
+async def test_write_state_registry_entry_updated(hass):
+    """Test the attributes change when the registry entry changes."""
+    entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+    )
+    registry = mock_registry(hass, {"hello.world": entry})
+
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.registry_entry = entry
+    ent._attr_name = "World"
+    ent.add_to_platform_start(hass, MagicMock(platform_name="test-platform"), None)
+    await ent.add_to_platform_finish()
+    assert hass.states.get("hello.world").name == "World"
+
+    registry.async_update_entity("hello.world", name="Renamed world")
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world").name == "Renamed world"
@@ -16,6 +16,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TEMPLATE_RENDERS_SAVED,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -1022,6 +1023,79 @@ async def test_track_template_result(hass):
     assert len(wildercard_runs) == 4
 
 
+async def test_track_template_result_coalesced(hass):
+    """Test a burst of state changes renders a coalesced template once."""
+    runs = []
+    hass.states.async_set("sensor.one", 0)
+    hass.states.async_set("sensor.two", 0)
+
+    template_sum = Template(
+        "{{ (states.sensor.one.state|int) + (states.sensor.two.state|int) }}", hass
+    )
+
+    @ha.callback
+    def run_callback(event, updates):
+        runs.append((event and event.data["entity_id"], int(updates.pop().result or 0)))
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_sum, None)], run_callback, coalesce_window=0
+    )
+    await hass.async_block_till_done()
+
+    for value in range(1, 26):
+        hass.states.async_set("sensor.one", value)
+        hass.states.async_set("sensor.two", value)
+    await hass.async_block_till_done()
+
+    assert runs == [("sensor.two", 50)]
+    assert info.renders_saved == 49
+    assert hass.data[TRACK_TEMPLATE_RENDERS_SAVED] == 49
+
+    hass.states.async_set("sensor.one", 30)
+    await hass.async_block_till_done()
+
+    assert runs == [("sensor.two", 50), ("sensor.one", 55)]
+    assert info.renders_saved == 49
+
+
+async def test_track_template_result_coalesce_window(hass):
+    """Test coalesced templates render at the end of the window."""
+    runs = []
+
+    template_state = Template("{{ states.sensor.test.state }}", hass)
+
+    @ha.callback
+    def run_callback(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_state, None)],
+        run_callback,
+        coalesce_window=0.5,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test", "on")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.test", "off")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["off"]
+    assert info.renders_saved == 1
+
+    hass.states.async_set("sensor.test", "on")
+    await hass.async_block_till_done()
+    info.async_remove()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == ["off"]
+
+
 async def test_track_template_result_complex(hass):
     """Test tracking template."""
     specific_runs = []
@@ -2717,6 +2791,82 @@ async def test_periodic_task_minute(hass):
     assert len(specific_runs) == 2
 
 
+async def test_periodic_tasks_share_deadline(hass):
+    """Test periodic tasks firing at the same time share one timer."""
+    specific_runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ), patch.object(hass.loop, "call_later", wraps=hass.loop.call_later) as call_later:
+        unsub_1 = async_track_utc_time_change(
+            hass, callback(lambda x: specific_runs.append(1)), minute=0, second=0
+        )
+        unsub_2 = async_track_utc_time_change(
+            hass, callback(lambda x: specific_runs.append(2)), minute="/5", second=0
+        )
+        assert call_later.call_count == 1
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert specific_runs == [1, 2]
+
+    unsub_2()
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert specific_runs == [1, 2]
+
+    unsub_1()
+
+
+async def test_periodic_task_removed_by_task_sharing_deadline(hass):
+    """Test a periodic task removed by another task of the same deadline does not run."""
+    specific_runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    @callback
+    def remove_second(now):
+        specific_runs.append(1)
+        unsub_2()
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsub_1 = async_track_utc_time_change(hass, remove_second, minute=0, second=0)
+        unsub_2 = async_track_utc_time_change(
+            hass, callback(lambda x: specific_runs.append(2)), minute=0, second=0
+        )
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert specific_runs == [1]
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 13, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert specific_runs == [1, 1]
+
+    unsub_1()
+
+
 async def test_periodic_task_hour(hass):
     """Test periodic tasks per hour."""
     specific_runs = []
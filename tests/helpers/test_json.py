@@ -1,10 +1,19 @@
 """Test Home Assistant remote methods and classes."""
 from datetime import timedelta
+import json
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_dumps,
+    json_dumps_pretty,
+    json_encoder_default,
+    json_loads,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -63,3 +72,76 @@ def test_trace_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+def test_json_encoder_default(hass):
+    """Test the default hook of the json_* functions."""
+    state = core.State("test.test", "hello")
+
+    now = dt_util.utcnow()
+    assert json_encoder_default(now) == now.isoformat()
+    assert sorted(json_encoder_default({"milk", "beer"})) == ["beer", "milk"]
+    assert json_encoder_default(("milk", "beer")) == ["milk", "beer"]
+    assert json_encoder_default(state) == state.as_dict()
+
+    with pytest.raises(TypeError):
+        json_encoder_default(object())
+
+
+def test_json_dumps(hass):
+    """Test serializing Home Assistant objects with the json_* functions."""
+    state = core.State("test.test", "hello")
+    now = dt_util.utcnow()
+    data = {"state": state, "now": now, "items": {"milk"}, 1: None}
+    expected = {
+        "state": state.as_dict(),
+        "now": now.isoformat(),
+        "items": ["milk"],
+        "1": None,
+    }
+
+    assert json_loads(json_dumps(data)) == expected
+    assert json_loads(json_bytes(data)) == expected
+    assert json_loads(json_dumps_pretty(data)) == expected
+    assert json_dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+    with pytest.raises(TypeError):
+        json_dumps({"bad": object()})
+
+    with pytest.raises(TypeError):
+        json_dumps_pretty({"bad": {"milk"}}, default=None)
+
+
+def test_json_dumps_not_allows_nan(hass):
+    """Test the compact json_* functions raise for NaN and infinity."""
+    state = core.State("test.test", "hello", {"value": float("NaN")})
+
+    with pytest.raises(ValueError):
+        json_dumps({"value": float("NaN")})
+
+    with pytest.raises(ValueError):
+        json_bytes({"values": [None, float("inf")]})
+
+    with pytest.raises(ValueError):
+        json_dumps({"state": state})
+
+    assert json_dumps({"value": None}) == '{"value":null}'
+
+
+def test_json_dumps_pretty(hass):
+    """Test json_dumps_pretty matches the standard library indented by 4."""
+    data = {"key": "multi\n  line", "items": [1, {"empty": {}}, []], "none": None}
+
+    assert json_dumps_pretty(data) == json.dumps(data, indent=4)
+    assert json_dumps_pretty({"value": float("NaN")}) == '{\n    "value": NaN\n}'
+
+
+def test_json_loads_nan():
+    """Test json_loads reads the NaN and infinity the recorder and storage write."""
+    data = json_loads('{"nan":NaN,"inf":Infinity,"list":[1]}')
+    assert data["nan"] != data["nan"]
+    assert data["inf"] == float("inf")
+    assert data["list"] == [1]
+
+    with pytest.raises(ValueError):
+        json_loads("{invalid")
@@ -0,0 +1,125 @@
+"""Tests for the polling scheduler."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.helpers.polling import (
+    MAX_POLL_SPREAD,
+    PlatformPoller,
+    async_get_polling_scheduler,
+)
+import homeassistant.util.dt as dt_util
+
+from tests.common import MockEntity, MockEntityPlatform, async_fire_time_changed
+
+
+async def test_first_poll_is_spread(hass):
+    """Test the first polls of platforms are spread but stable."""
+    scheduler = async_get_polling_scheduler(hass)
+    interval = timedelta(seconds=30)
+    offsets = {
+        PlatformPoller(scheduler, f"sensor.platform_{idx}", interval, Mock()).offset
+        for idx in range(10)
+    }
+
+    assert len(offsets) == 10
+    assert all(timedelta(0) <= offset <= interval * 0.1 for offset in offsets)
+    assert (
+        PlatformPoller(scheduler, "sensor.platform_0", interval, Mock()).offset
+        in offsets
+    )
+
+    long_interval = timedelta(hours=1)
+    assert PlatformPoller(
+        scheduler, "sensor.platform_0", long_interval, Mock()
+    ).offset <= timedelta(seconds=MAX_POLL_SPREAD)
+
+
+async def test_poll_records_entity_durations(hass):
+    """Test polling records how long entity updates take."""
+    platform = MockEntityPlatform(hass)
+    fast = MockEntity(name="fast", should_poll=True)
+    slow = MockEntity(name="slow", should_poll=True)
+    await platform.async_add_entities([fast, slow])
+
+    with patch(
+        "homeassistant.helpers.entity_platform.monotonic",
+        side_effect=[0, 1, 1, 5],
+    ):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+        await hass.async_block_till_done()
+
+    scheduler = async_get_polling_scheduler(hass)
+    slowest = scheduler.async_slowest_pollers()
+    assert [stats.as_dict() for stats in slowest] == [
+        {
+            "entity_id": "test_domain.slow",
+            "platform": platform.polling_key,
+            "updates": 1,
+            "last_duration": 4,
+            "max_duration": 4,
+            "average_duration": 4,
+        },
+        {
+            "entity_id": "test_domain.fast",
+            "platform": platform.polling_key,
+            "updates": 1,
+            "last_duration": 1,
+            "max_duration": 1,
+            "average_duration": 1,
+        },
+    ]
+
+    await platform.async_reset()
+    assert scheduler.stats == {}
+    assert scheduler.pollers == {}
+
+
+async def test_platforms_configured_twice_are_polled_apart(hass):
+    """Test two YAML entries of the same platform get their own pollers."""
+    platform_1 = MockEntityPlatform(hass)
+    platform_2 = MockEntityPlatform(hass)
+    await platform_1.async_add_entities([MockEntity(name="one", should_poll=True)])
+    await platform_2.async_add_entities([MockEntity(name="two", should_poll=True)])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+    await hass.async_block_till_done()
+
+    scheduler = async_get_polling_scheduler(hass)
+    assert platform_1.polling_key != platform_2.polling_key
+    assert set(scheduler.pollers) == {platform_1.polling_key, platform_2.polling_key}
+    assert set(scheduler.stats) == {"test_domain.one", "test_domain.two"}
+
+    await platform_1.async_reset()
+    assert set(scheduler.pollers) == {platform_2.polling_key}
+    assert set(scheduler.stats) == {"test_domain.two"}
+
+
+async def test_overrun_adapts_interval(hass, caplog):
+    """Test the interval is stretched while update rounds overrun it."""
+    platform = MockEntityPlatform(hass)
+    entity = MockEntity(should_poll=True)
+    entity.async_update = AsyncMock()
+    await platform.async_add_entities([entity])
+    poller = async_get_polling_scheduler(hass).pollers[platform.polling_key]
+    start = dt_util.utcnow()
+
+    with patch("homeassistant.helpers.polling.monotonic", side_effect=[0, 20]):
+        async_fire_time_changed(hass, start + timedelta(seconds=15))
+        await hass.async_block_till_done()
+
+    assert len(entity.async_update.mock_calls) == 1
+    assert poller.interval == timedelta(seconds=30)
+    assert poller.overruns == 1
+    assert "longer than the scan interval" in caplog.text
+
+    # Not polled at the scan interval
+    async_fire_time_changed(hass, start + timedelta(seconds=29))
+    await hass.async_block_till_done()
+    assert len(entity.async_update.mock_calls) == 1
+
+    with patch("homeassistant.helpers.polling.monotonic", side_effect=[0, 1]):
+        async_fire_time_changed(hass, start + timedelta(seconds=31))
+        await hass.async_block_till_done()
+
+    assert len(entity.async_update.mock_calls) == 2
+    assert poller.interval == timedelta(seconds=15)
@@ -0,0 +1,46 @@
+"""Tests for the reference index."""
+from homeassistant.helpers.reference_index import (
+    REFERENCE_AREA,
+    REFERENCE_DEVICE,
+    REFERENCE_ENTITY,
+    ReferenceIndex,
+)
+
+
+def test_reference_index():
+    """Test adding, replacing and removing referrers."""
+    index = ReferenceIndex()
+    index.async_add(
+        "automation.first",
+        areas={"kitchen"},
+        devices={"device-1"},
+        entities={"light.both", "light.first"},
+    )
+    index.async_add("automation.second", entities={"light.both"})
+
+    assert index.async_referrers(REFERENCE_ENTITY, "light.both") == [
+        "automation.first",
+        "automation.second",
+    ]
+    assert index.async_referrers(REFERENCE_ENTITY, "light.first") == [
+        "automation.first"
+    ]
+    assert index.async_referrers(REFERENCE_DEVICE, "device-1") == ["automation.first"]
+    assert index.async_referrers(REFERENCE_AREA, "kitchen") == ["automation.first"]
+    assert index.async_referrers(REFERENCE_AREA, "unknown") == []
+
+    # Adding a referrer again replaces its references
+    index.async_add("automation.first", entities={"light.both"})
+    assert index.async_referrers(REFERENCE_ENTITY, "light.first") == []
+    assert index.async_referrers(REFERENCE_DEVICE, "device-1") == []
+    assert index.async_referrers(REFERENCE_ENTITY, "light.both") == [
+        "automation.second",
+        "automation.first",
+    ]
+
+    index.async_remove("automation.second")
+    index.async_remove("automation.unknown")
+    assert index.async_referrers(REFERENCE_ENTITY, "light.both") == ["automation.first"]
+
+    index.async_remove("automation.first")
+    assert index.async_referrers(REFERENCE_ENTITY, "light.both") == []
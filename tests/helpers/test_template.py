@@ -11,6 +11,8 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     MASS_GRAMS,
     PRESSURE_PA,
@@ -2315,35 +2317,103 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
-    template_string = (
-        "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
-    )
-    tpl = template.Template(
-        (template_string),
-    )
-    tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+async def test_compiled_template_cache(hass):
+    """Test identical templates are compiled once per environment type."""
+    template_string = "{{ 'compiled template cache' | upper }}"
+    info = template.compiled_template_cache_info()
 
-    tpl2 = template.Template(
-        (template_string),
-    )
-    tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-
-    del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-    del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    template.Template(template_string).ensure_valid()
+    template.Template(template_string, hass).ensure_valid()
+
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render(strict=True) == "COMPILED TEMPLATE CACHE"
+
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render(limited=True) == "COMPILED TEMPLATE CACHE"
+
+    new_info = template.compiled_template_cache_info()
+    assert new_info["misses"] - info["misses"] == 2
+    assert new_info["hits"] - info["hits"] == 2
+
+
+async def test_compiled_template_cache_without_hass(hass):
+    """Test templates compiled with hass are not used to validate without hass."""
+    template_string = "{{ 'light.kitchen' | device_id }}"
+
+    template.Template(template_string, hass).ensure_valid()
+
+    with pytest.raises(TemplateError):
+        template.Template(template_string).ensure_valid()
+
+
+async def test_compiled_template_cache_evicts_least_recently_used():
+    """Test the compiled template cache is bounded."""
+    cache = template.CompiledTemplateCache(2)
+    code = compile("", "<template>", "exec")
+
+    cache.set(("normal", "a"), code)
+    cache.set(("normal", "b"), code)
+    assert cache.get(("normal", "a")) is code
+    cache.set(("normal", "c"), code)
+
+    assert cache.get(("normal", "b")) is None
+    assert cache.get(("normal", "a")) is code
+    assert cache.info() == {"size": 2, "hits": 2, "misses": 1}
+
+
+async def test_template_bytecode_cache(hass, tmp_path):
+    """Test compiled templates are persisted across restarts."""
+    template_string = "{{ 'template bytecode cache' | upper }}"
+    path = str(tmp_path / template.BYTECODE_CACHE_FILE)
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    bytecode_cache.load()
+
+    with patch.object(
+        template, "_COMPILED_TEMPLATES", template.CompiledTemplateCache(8)
+    ):
+        template._COMPILED_TEMPLATES.bytecode_cache = bytecode_cache
+        template.Template(template_string, hass).ensure_valid()
+        assert bytecode_cache.misses == 1
+        await hass.async_add_executor_job(bytecode_cache.save)
+
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    await hass.async_add_executor_job(bytecode_cache.load)
+
+    with patch.object(
+        template, "_COMPILED_TEMPLATES", template.CompiledTemplateCache(8)
+    ), patch.object(template.ImmutableSandboxedEnvironment, "compile") as compile_mock:
+        template._COMPILED_TEMPLATES.bytecode_cache = bytecode_cache
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "TEMPLATE BYTECODE CACHE"
+        assert compile_mock.call_count == 0
+        assert template.compiled_template_cache_info() == {
+            "size": 1,
+            "hits": 0,
+            "misses": 1,
+            "bytecode_hits": 1,
+            "bytecode_misses": 0,
+        }
+
+
+async def test_load_bytecode_cache(hass):
+    """Test the bytecode cache is loaded and written around startup."""
+    with patch.object(
+        template, "_COMPILED_TEMPLATES", template.CompiledTemplateCache(8)
+    ), patch.object(template.TemplateBytecodeCache, "load") as load_mock, patch.object(
+        template.TemplateBytecodeCache, "save"
+    ) as save_mock:
+        await template.async_load_bytecode_cache(hass)
+        assert load_mock.call_count == 1
+        assert template._COMPILED_TEMPLATES.bytecode_cache is not None
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+        assert save_mock.call_count == 1
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+        assert save_mock.call_count == 2
+        assert template._COMPILED_TEMPLATES.bytecode_cache is None
 
 
 def test_is_template_string():
@@ -491,6 +491,7 @@ async def test_loading_configuration(hass):
             "internal_url": "http://example.local",
             "media_dirs": {"mymedia": "/usr"},
             "legacy_templates": True,
+            "template_bytecode_cache": True,
             "currency": "EUR",
         },
     )
@@ -509,6 +510,7 @@ async def test_loading_configuration(hass):
     assert hass.config.media_dirs == {"mymedia": "/usr"}
     assert hass.config.config_source == config_util.SOURCE_YAML
     assert hass.config.legacy_templates is True
+    assert hass.config.template_bytecode_cache is True
     assert hass.config.currency == "EUR"
 
 
@@ -1,11 +1,15 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+import copy
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
+import pickle
 from tempfile import TemporaryDirectory
+import threading
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import pytest
@@ -33,6 +37,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
@@ -53,7 +58,7 @@ def test_split_entity_id():
 
 def test_async_add_hass_job_schedule_callback():
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_metrics=None)
     job = MagicMock()
 
     ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
@@ -64,7 +69,7 @@ def test_async_add_hass_job_schedule_callback():
 
 def test_async_add_hass_job_schedule_partial_callback():
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_metrics=None)
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
@@ -76,7 +81,7 @@ def test_async_add_hass_job_schedule_partial_callback():
 
 def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_metrics=None)
 
     async def job():
         pass
@@ -89,7 +94,7 @@ def test_async_add_hass_job_schedule_coroutinefunction(loop):
 
 def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_metrics=None)
 
     async def job():
         pass
@@ -104,7 +109,7 @@ def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
 
 def test_async_add_job_add_hass_threaded_job_to_pool():
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_metrics=None)
 
     def job():
         pass
@@ -117,7 +122,7 @@ def test_async_add_job_add_hass_threaded_job_to_pool():
 
 def test_async_create_task_schedule_coroutine(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_metrics=None)
 
     async def job():
         pass
@@ -130,7 +135,7 @@ def test_async_create_task_schedule_coroutine(loop):
 
 def test_async_run_hass_job_calls_callback():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(job_metrics=None)
     calls = []
 
     def job():
@@ -143,7 +148,7 @@ def test_async_run_hass_job_calls_callback():
 
 def test_async_run_hass_job_delegates_non_async():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(job_metrics=None)
     calls = []
 
     def job():
@@ -154,6 +159,87 @@ def test_async_run_hass_job_delegates_non_async():
     assert len(hass.async_add_hass_job.mock_calls) == 1
 
 
+async def test_job_metrics(hass):
+    """Test job metrics time callbacks, coroutines and executor jobs."""
+    metrics = hass.async_enable_job_metrics()
+    assert hass.async_enable_job_metrics() is metrics
+
+    @ha.callback
+    def metrics_callback():
+        """Run in the event loop."""
+
+    async def metrics_coroutine():
+        """Run in the event loop."""
+        await asyncio.sleep(0)
+
+    def metrics_executor():
+        """Run in the executor."""
+
+    hass.async_add_hass_job(ha.HassJob(metrics_callback))
+    hass.async_run_hass_job(ha.HassJob(metrics_callback))
+    hass.async_add_hass_job(ha.HassJob(metrics_coroutine))
+    hass.async_add_hass_job(ha.HassJob(metrics_executor))
+    await hass.async_block_till_done()
+
+    result = metrics.as_dict()
+    targets = {
+        name.rsplit(".", 1)[-1]: timings for name, timings in result["targets"].items()
+    }
+    assert targets["metrics_callback"]["job_type"] == "Callback"
+    assert targets["metrics_callback"]["count"] == 2
+    # One step before and one after the sleep
+    assert targets["metrics_coroutine"]["job_type"] == "Coroutinefunction"
+    assert targets["metrics_coroutine"]["count"] == 2
+    assert targets["metrics_executor"]["job_type"] == "Executor"
+    assert targets["metrics_executor"]["count"] == 1
+    assert sum(targets["metrics_callback"]["buckets"].values()) == 2
+    assert result["loop_lag"] == {"samples": 0, "max": 0.0, "last": None}
+
+    metrics._async_sample(hass.loop.time() - 0.2)
+    assert metrics.as_dict()["loop_lag"]["max"] >= 0.2
+    assert metrics.as_dict()["executor_queue_depth"]["samples"] == 1
+    assert metrics.as_dict()["pool_queue_depth"] == {}
+
+    await hass.async_add_pool_executor_job(ha.ExecutorPool.IO, metrics_executor)
+    await hass.async_add_executor_job(metrics_executor)
+    assert metrics.timings[ha._job_target_name(metrics_executor)].count == 3
+    metrics._async_sample(hass.loop.time())
+    assert metrics.as_dict()["pool_queue_depth"] == {
+        "io": {"samples": 1, "max": 0, "last": 0}
+    }
+
+    hass.async_disable_job_metrics()
+    assert hass.job_metrics is None
+    assert metrics._sample_handle is None
+
+    hass.async_add_hass_job(ha.HassJob(metrics_callback))
+    await hass.async_block_till_done()
+    assert sum(timings.count for timings in metrics.timings.values()) == 7
+
+
+async def test_async_add_pool_executor_job(hass):
+    """Test executor jobs can target a named pool."""
+    thread_names = []
+
+    def job():
+        thread_names.append(threading.current_thread().name)
+        return 1
+
+    assert await hass.async_add_pool_executor_job(ha.ExecutorPool.DB_READ, job) == 1
+    assert thread_names[0].startswith("SyncWorker_db_read")
+    executor = hass.executor_pools[ha.ExecutorPool.DB_READ]
+    assert hass.async_get_executor_pool(ha.ExecutorPool.DB_READ) is executor
+    assert hass.async_executor_pool_metrics()["db_read"]["completed"] == 1
+
+    await hass.async_stop(force=True)
+    assert executor._shutdown
+    with pytest.raises(RuntimeError):
+        await hass.async_add_pool_executor_job(ha.ExecutorPool.DB_READ, job)
+    with pytest.raises(RuntimeError):
+        await hass.async_add_pool_executor_job(ha.ExecutorPool.CPU, job)
+    assert list(hass.executor_pools) == [ha.ExecutorPool.DB_READ]
+
+
 async def test_stage_shutdown(hass):
     """Simulate a shutdown, test calling stuff."""
     test_stop = async_capture_events(hass, EVENT_HOMEASSISTANT_STOP)
@@ -383,6 +469,27 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    state = ha.State("happy.happy", "on", {"pig": "dog", "count": 3})
+    assert json.loads(state.as_json) == state.as_dict()
+    assert state.attributes_json == '{"pig":"dog","count":3}'
+    assert state.as_json is state.as_json
+
+
+async def test_state_json_reused_for_same_attributes(hass):
+    """Test the attributes JSON is passed on when the attributes are reused."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    old_state = hass.states.get("light.bowl")
+    attributes_json = old_state.attributes_json
+
+    hass.states.async_set("light.bowl", "off", old_state.attributes)
+    assert hass.states.get("light.bowl").attributes_json is attributes_json
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 50})
+    assert hass.states.get("light.bowl").attributes_json == '{"brightness":50}'
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -402,6 +509,21 @@ async def test_eventbus_add_remove_listener(hass):
     unsub()
 
 
+async def test_eventbus_has_listeners(hass):
+    """Test checking for listeners of an event type."""
+    assert not hass.bus.async_has_listeners("test")
+
+    unsub = hass.bus.async_listen(MATCH_ALL, lambda event: None)
+    assert not hass.bus.async_has_listeners("test")
+
+    unsub_test = hass.bus.async_listen("test", lambda event: None)
+    assert hass.bus.async_has_listeners("test")
+
+    unsub_test()
+    unsub()
+    assert not hass.bus.async_has_listeners("test")
+
+
 async def test_eventbus_filtered_listener(hass):
     """Test we can prefilter events."""
     calls = []
@@ -431,6 +553,49 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test we can listen for events indexed by key."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, ["light.kitchen", "light.bowl"], listener
+    )
+
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED) == {
+        "light.kitchen": 1,
+        "light.bowl": 1,
+    }
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in calls] == [
+        "light.kitchen",
+        "light.bowl",
+    ]
+
+    unsub()
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED) == {}
+
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+
+
+async def test_eventbus_keyed_listener_unsupported_event_type(hass):
+    """Test keyed listeners are rejected for events without a key."""
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed("test", "light.kitchen", lambda event: None)
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -1151,6 +1316,34 @@ def test_timer_out_of_sync(mock_monotonic, loop):
     assert abs(target - 14.2) < 0.001
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_without_time_changed_listeners(mock_monotonic, loop):
+    """Test the timer does not fire time changed without listeners."""
+    hass = MagicMock()
+    hass.bus.async_has_listeners.return_value = False
+    funcs = []
+    orig_callback = ha.callback
+
+    def mock_callback(func):
+        funcs.append(func)
+        return orig_callback(func)
+
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+
+    with patch.object(ha, "callback", mock_callback), patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
+    ):
+        ha._async_create_timer(hass)
+
+    delay, callback, target = hass.loop.call_later.mock_calls[0][1]
+    callback(target)
+
+    hass.bus.async_has_listeners.assert_called_once_with(EVENT_TIME_CHANGED)
+    assert len(hass.bus.async_fire.mock_calls) == 0
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
 async def test_hass_start_starts_the_timer(loop):
     """Test when hass starts, it starts the timer."""
     hass = ha.HomeAssistant()
@@ -1270,6 +1463,31 @@ def test_context():
     assert c.parent_id == 100
     assert c.id is not None
 
+    assert ha.Context(id=None).id is None
+    assert ha.Context(23, 100, "abc") == ha.Context(23, 100, "abc")
+    assert ha.Context(23, 100, "abc") != ha.Context(23, None, "abc")
+    assert hash(ha.Context(23, 100, "abc")) == hash(ha.Context(23, 100, "abc"))
+    assert ha.Context().id != ha.Context().id
+
+    with pytest.raises(AttributeError):
+        c.id = "abc"
+
+
+def test_context_copy_and_pickle():
+    """Test a context can be copied and pickled."""
+    context = ha.Context(23, 100, "abc")
+
+    for copied in (
+        copy.copy(context),
+        copy.deepcopy(context),
+        pickle.loads(pickle.dumps(context)),
+    ):
+        assert copied == context
+        assert (copied.user_id, copied.parent_id, copied.id) == (23, 100, "abc")
+
+    event = ha.Event("test_event", {"some": "data"}, context=context)
+    assert copy.deepcopy(event).context == context
+
 
 async def test_async_functions_with_callback(hass):
     """Test we deal with async functions accidentally marked as callback."""
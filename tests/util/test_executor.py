@@ -1,6 +1,7 @@
 """Test Home Assistant executor util."""
 
 import concurrent.futures
+import threading
 import time
 from unittest.mock import patch
 
@@ -89,3 +90,27 @@ async def test_overall_timeout_reached(caplog):
     assert finish - start < 1
 
     iexecutor.shutdown()
+
+
+async def test_metered_executor_counts_jobs():
+    """Test the metered executor counts the jobs it is given."""
+    mexecutor = executor.MeteredThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+
+    futures = [mexecutor.submit(release.wait) for _ in range(3)]
+    assert mexecutor.submitted == 3
+    assert mexecutor.max_queued >= 1
+
+    release.set()
+    for future in futures:
+        future.result()
+
+    assert mexecutor.as_dict() == {
+        "max_workers": 1,
+        "submitted": 3,
+        "running": 0,
+        "queued": 0,
+        "max_queued": mexecutor.max_queued,
+        "completed": 3,
+    }
+    mexecutor.shutdown()
@@ -53,6 +53,14 @@ def test_save_and_load():
     assert data == TEST_JSON_A
 
 
+def test_save_and_load_nan():
+    """Test saving and loading back data with NaN."""
+    fname = _path_for("test_nan")
+    save_json(fname, {"value": float("NaN")})
+    data = load_json(fname)
+    assert math.isnan(data["value"])
+
+
 # Skipped on Windows
 @unittest.skipIf(
     sys.platform.startswith("win"), "private permissions not supported on Windows"